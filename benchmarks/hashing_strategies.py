@@ -0,0 +1,122 @@
+"""Micro-benchmark the strategies used for hashing files.
+
+Creates temporary files matching the sizes found in a typical package and
+prints the throughput of each strategy in hathi_validate.hashing next to the
+original 8 KiB read loop.
+
+    python benchmarks/hashing_strategies.py --sizes 4K 64K 4M 300M
+
+Files are read from the page cache after the first round so the numbers
+measure the cost of hashing, not the storage.
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+from hathi_validate import hashing
+
+DEFAULT_SIZES = [
+    "4K",  # ocr text
+    "64K",  # alto xml
+    "4M",  # access jp2
+    "40M",  # large jp2
+    "300M",  # masters
+]
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+class LegacyReadStrategy(hashing.AbsHashingStrategy):
+    """The loop calculate_md5 used before the hashing module existed."""
+
+    def update(self, file_handle, hash_object):
+        while True:
+            data = file_handle.read(8192)
+            if not data:
+                break
+            hash_object.update(data)
+
+
+def get_strategies():
+    strategies = {
+        "automatic": None,
+        "read 8KiB (legacy)": LegacyReadStrategy(),
+        "readinto 1MiB": hashing.ReadIntoStrategy(),
+        "mmap": hashing.MmapStrategy(),
+    }
+    if hasattr(hashlib, "file_digest"):
+        strategies["hashlib.file_digest"] = hashing.FileDigestStrategy()
+    return strategies
+
+
+def parse_size(value):
+    value = value.strip().upper()
+    if value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+
+def get_arg_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="File sizes to benchmark, such as 64K or 300M"
+    )
+    parser.add_argument(
+        "--total",
+        default="512M",
+        help="Approximate amount of data to hash per size and strategy"
+    )
+    parser.add_argument(
+        "--directory",
+        default=None,
+        help="Where to create the sample files. Use a network share to "
+             "include its latency"
+    )
+    return parser
+
+
+def create_sample_file(directory, size):
+    path = os.path.join(directory, f"sample_{size}.bin")
+    with open(path, "wb") as file_handle:
+        remaining = size
+        while remaining:
+            chunk = os.urandom(min(remaining, 1024 * 1024))
+            file_handle.write(chunk)
+            remaining -= len(chunk)
+    return path
+
+
+def time_strategy(strategy, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        hashing.calculate_hash(path, "md5", strategy)
+    return time.perf_counter() - start
+
+
+def main():
+    args = get_arg_parser().parse_args()
+    total = parse_size(args.total)
+    strategies = get_strategies()
+    print(f"{'size':>8}  {'strategy':<22}{'MB/s':>10}")
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        for size_name in args.sizes:
+            size = parse_size(size_name)
+            path = create_sample_file(directory, size)
+            repeat = max(1, total // max(size, 1))
+            for strategy_name, strategy in strategies.items():
+                # warm up the page cache
+                hashing.calculate_hash(path, "md5", strategy)
+                seconds = time_strategy(strategy, path, repeat)
+                throughput = size * repeat / seconds / 1024 ** 2
+                print(f"{size_name:>8}  {strategy_name:<22}{throughput:>10.1f}")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""Generate synthetic HathiTrust packages for benchmarking.
+
+Each package gets a page image, OCR text and ALTO xml file per page, along
+with a checksum.md5, marc.xml and meta.yml that validate. A share of the
+pages can be damaged on purpose so the cost of reporting errors is measured
+as well.
+
+    python benchmarks/synthetic_package.py OUTPUT --packages 10 --pages 300
+"""
+
+import argparse
+import hashlib
+import os
+import random
+
+MARC_XML = """<record xmlns="http://www.loc.gov/MARC21/slim">
+  <leader>00000nam a2200000 a 4500</leader>
+  <controlfield tag="001">{identifier}</controlfield>
+  <datafield ind1="1" ind2="0" tag="245">
+    <subfield code="a">Synthetic package {identifier}</subfield>
+  </datafield>
+</record>
+"""
+
+ALTO_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<alto xmlns="http://www.loc.gov/standards/alto/ns-v2#">
+  <Description>
+    <MeasurementUnit>pixel</MeasurementUnit>
+    <sourceImageInformation>
+      <fileName>{image}</fileName>
+    </sourceImageInformation>
+  </Description>
+  <Styles></Styles>
+  <Layout>
+    <Page ID="P{page}" PHYSICAL_IMG_NR="{page}" HEIGHT="4000" WIDTH="3000">
+      <PrintSpace HEIGHT="4000" WIDTH="3000" HPOS="0" VPOS="0">
+        <TextBlock ID="P{page}_TB1" HEIGHT="4000" WIDTH="3000" HPOS="0" \
+VPOS="0">
+"""
+
+ALTO_LINE = """\
+          <TextLine HEIGHT="40" WIDTH="3000" HPOS="0" VPOS="{vpos}">
+            <String CONTENT="{word}" HEIGHT="40" WIDTH="200" HPOS="0" \
+VPOS="{vpos}"/>
+          </TextLine>
+"""
+
+ALTO_FOOTER = """        </TextBlock>
+      </PrintSpace>
+    </Page>
+  </Layout>
+</alto>
+"""
+
+INVALID_ALTO = """<?xml version="1.0" encoding="UTF-8"?>
+<alto xmlns="http://www.loc.gov/standards/alto/ns-v2#">
+  <Description>
+    <MeasurementUnit>pixel</MeasurementUnit>
+  </Description>
+</alto>
+"""
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur",
+         "adipiscing", "elit", "sed", "do", "eiusmod", "tempor"]
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+ERROR_TYPES = ("checksum", "missing_component", "invalid_alto")
+
+
+def parse_size(value):
+    value = value.strip().upper()
+    if value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+
+def build_alto(page, image, size):
+    parts = [ALTO_HEADER.format(page=page, image=image)]
+    length = len(parts[0]) + len(ALTO_FOOTER)
+    line_number = 0
+    while length < size:
+        line = ALTO_LINE.format(
+            vpos=line_number * 40,
+            word=WORDS[line_number % len(WORDS)]
+        )
+        parts.append(line)
+        length += len(line)
+        line_number += 1
+    parts.append(ALTO_FOOTER)
+    return "".join(parts)
+
+
+def write_random_file(path, size, rng):
+    with open(path, "wb") as file_handle:
+        remaining = size
+        while remaining:
+            chunk = rng.randbytes(min(remaining, 1024 * 1024))
+            file_handle.write(chunk)
+            remaining -= len(chunk)
+
+
+def md5_of(path):
+    with open(path, "rb") as file_handle:
+        return hashlib.md5(file_handle.read()).hexdigest()
+
+
+def create_package(path,
+                   pages=100,
+                   jp2_size=512 * 1024,
+                   alto_size=16 * 1024,
+                   error_rate=0.0,
+                   seed=None):
+    """Write a synthetic package.
+
+    Args:
+        path: Directory to create the package in. The name of the directory
+            is used as the identifier of the package.
+        pages: Number of pages.
+        jp2_size: Size of each page image in bytes.
+        alto_size: Approximate size of each ALTO xml file in bytes.
+        error_rate: Share of pages, from 0 to 1, given one of the problems
+            in ERROR_TYPES.
+        seed: Seed for the random number generator.
+
+    Returns:
+        Returns a dictionary with the number of pages damaged per type of
+            problem.
+
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    identifier = os.path.basename(os.path.normpath(path))
+    injected = dict.fromkeys(ERROR_TYPES, 0)
+    checksums = {}
+    damaged_images = []
+
+    for page in range(1, pages + 1):
+        base_name = str(page).zfill(8)
+        image = f"{base_name}.jp2"
+        write_random_file(os.path.join(path, image), jp2_size, rng)
+
+        with open(os.path.join(path, f"{base_name}.txt"), "w",
+                  encoding="utf-8") as file_handle:
+            file_handle.write(" ".join(rng.choices(WORDS, k=200)))
+
+        error_type = None
+        if rng.random() < error_rate:
+            error_type = rng.choice(ERROR_TYPES)
+            injected[error_type] += 1
+
+        with open(os.path.join(path, f"{base_name}.xml"), "w",
+                  encoding="utf-8") as file_handle:
+            if error_type == "invalid_alto":
+                file_handle.write(INVALID_ALTO)
+            else:
+                file_handle.write(build_alto(page, image, alto_size))
+
+        for file_name in (image, f"{base_name}.txt", f"{base_name}.xml"):
+            checksums[file_name] = md5_of(os.path.join(path, file_name))
+
+        if error_type == "checksum":
+            damaged_images.append(image)
+        elif error_type == "missing_component":
+            os.remove(os.path.join(path, f"{base_name}.txt"))
+            del checksums[f"{base_name}.txt"]
+
+    with open(os.path.join(path, "marc.xml"), "w",
+              encoding="utf-8") as file_handle:
+        file_handle.write(MARC_XML.format(identifier=identifier))
+
+    with open(os.path.join(path, "meta.yml"), "w",
+              encoding="utf-8") as file_handle:
+        file_handle.write("capture_date: 2016-06-21T08:00:00Z\n")
+        file_handle.write("capture_agent: IU\n")
+        file_handle.write("scanner_user: Synthetic\n")
+        file_handle.write("pagedata:\n")
+        for page in range(1, pages + 1):
+            file_handle.write(f"    {str(page).zfill(8)}.jp2: {{ }}\n")
+
+    for file_name in ("marc.xml", "meta.yml"):
+        checksums[file_name] = md5_of(os.path.join(path, file_name))
+
+    with open(os.path.join(path, "checksum.md5"), "w",
+              encoding="utf-8") as file_handle:
+        for file_name, md5_hash in checksums.items():
+            file_handle.write(f"{md5_hash} *{file_name}\n")
+
+    # Damage the images after the checksums are recorded
+    for image in damaged_images:
+        with open(os.path.join(path, image), "r+b") as file_handle:
+            first_byte = file_handle.read(1)
+            file_handle.seek(0)
+            file_handle.write(bytes([first_byte[0] ^ 0xFF]))
+
+    return injected
+
+
+def create_batch(root, packages=10, seed=0, **package_options):
+    """Write a batch of synthetic packages into a directory.
+
+    Args:
+        root: Directory to create the packages in.
+        packages: Number of packages.
+        seed: Seed for the random number generator.
+        **package_options: Passed on to create_package().
+
+    Returns:
+        Returns the paths of the packages created.
+
+    """
+    created = []
+    for number in range(packages):
+        package_path = os.path.join(root, str(number + 1).zfill(8))
+        create_package(package_path, seed=seed + number, **package_options)
+        created.append(package_path)
+    return created
+
+
+def get_arg_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("output", help="Directory to create the batch in")
+    add_package_arguments(parser)
+    return parser
+
+
+def add_package_arguments(parser):
+    parser.add_argument("--pages", type=int, default=100,
+                        help="Pages per package")
+    parser.add_argument("--jp2-size", default="512K",
+                        help="Size of each page image, such as 4M")
+    parser.add_argument("--alto-size", default="16K",
+                        help="Approximate size of each ALTO xml file")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of pages given a problem, from 0 to 1")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def get_package_options(args):
+    return {
+        "pages": args.pages,
+        "jp2_size": parse_size(args.jp2_size),
+        "alto_size": parse_size(args.alto_size),
+        "error_rate": args.error_rate,
+    }
+
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument("--packages", type=int, default=10,
+                        help="Number of packages to create")
+    args = parser.parse_args()
+    create_batch(args.output, packages=args.packages, seed=args.seed,
+                 **get_package_options(args))
+
+
+if __name__ == '__main__':
+    main()
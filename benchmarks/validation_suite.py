@@ -0,0 +1,150 @@
+"""Benchmark the validation checks against synthetic packages.
+
+Generates batches of packages with synthetic_package.py, then times each
+check class in hathi_validate.cli on its own and the full ReportGenerator
+run at several batch sizes. Wall time, throughput and peak memory are
+printed for each.
+
+    python benchmarks/validation_suite.py --batch-sizes 1 10 50 --pages 100
+
+Peak memory is the peak of the Python heap as traced by tracemalloc, so
+work done by worker processes when --workers is above 1 is not included.
+The fixity cache is disabled so every run calculates the checksums.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from hathi_validate import cli, package
+
+import synthetic_package
+
+CHECK_CLASSES = [
+    cli.ValidateMissingFiles,
+    cli.ValidateMissingComponents,
+    cli.ValidateExtraSubdirectories,
+    cli.ValidateChecksums,
+    cli.ValidateMarc,
+    cli.ValidateYAML,
+    cli.ValidateOcrFiles,
+    cli.ValidateUTF8TextFiles,
+]
+
+
+class Measurement:
+
+    def __init__(self, name, packages, total_bytes):
+        self.name = name
+        self.packages = packages
+        self.total_bytes = total_bytes
+        self.seconds = 0.0
+        self.peak_memory = 0
+
+    def __enter__(self):
+        tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def row(self):
+        seconds = max(self.seconds, 1e-9)
+        return (
+            f"{self.name:<30}{self.packages:>9}"
+            f"{self.seconds:>10.3f}"
+            f"{self.packages / seconds:>11.2f}"
+            f"{self.total_bytes / seconds / 1024 ** 2:>10.1f}"
+            f"{self.peak_memory / 1024 ** 2:>10.1f}"
+        )
+
+
+HEADER = (
+    f"{'benchmark':<30}{'packages':>9}{'seconds':>10}"
+    f"{'pkg/s':>11}{'MB/s':>10}{'peak MB':>10}"
+)
+
+
+def get_arg_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+",
+                        default=[1, 10, 50],
+                        help="Number of packages in each batch")
+    synthetic_package.add_package_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Passed on to the full ReportGenerator run")
+    parser.add_argument("--checksum-threads", type=int, default=1,
+                        help="Threads used for calculating checksums")
+    parser.add_argument("--skip-checks", action="store_true",
+                        help="Only benchmark the full ReportGenerator run")
+    parser.add_argument("--directory", default=None,
+                        help="Where to create the packages. Use a network "
+                             "share to include its latency")
+    return parser
+
+
+def get_batch_size_in_bytes(root):
+    total = 0
+    for directory, _, files in os.walk(root):
+        for file_name in files:
+            total += os.path.getsize(os.path.join(directory, file_name))
+    return total
+
+
+def benchmark_checks(args, batch_root, total_bytes):
+    logger = logging.getLogger(__name__)
+    packages = list(package.get_dirs(batch_root))
+    for check_class in CHECK_CLASSES:
+        check = check_class(args, logger)
+        with Measurement(check_class.__name__, len(packages),
+                         total_bytes) as measurement:
+            for pkg in packages:
+                inventory = package.PackageInventory.scan(pkg)
+                check.get_errors(pkg, inventory=inventory)
+        print(measurement.row())
+
+
+def benchmark_report_generator(args, batch_root, total_bytes, packages):
+    logger = logging.getLogger(__name__)
+    report_generator = cli.ReportGenerator(args, logger)
+    with Measurement("ReportGenerator", packages,
+                     total_bytes) as measurement:
+        report_generator.generate_report()
+    print(measurement.row())
+
+
+def main():
+    args = get_arg_parser().parse_args()
+    package_options = synthetic_package.get_package_options(args)
+    print(HEADER)
+    for batch_size in args.batch_sizes:
+        with tempfile.TemporaryDirectory(dir=args.directory) as batch_root:
+            synthetic_package.create_batch(
+                batch_root, packages=batch_size, seed=args.seed,
+                **package_options
+            )
+            total_bytes = get_batch_size_in_bytes(batch_root)
+            validation_args = argparse.Namespace(
+                path=batch_root,
+                check_ocr=True,
+                check_utf8=True,
+                workers=args.workers,
+                checksum_threads=args.checksum_threads,
+                fixity_cache=None,
+            )
+            if not args.skip_checks:
+                benchmark_checks(validation_args, batch_root, total_bytes)
+            benchmark_report_generator(
+                validation_args, batch_root, total_bytes, batch_size
+            )
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Validate packages from asyncio code.
+
+The checks themselves are blocking, so they are run in an executor and the
+event loop is free to do other work in the meantime.
+
+    async for package_results in aio.iter_batch(root, concurrency=8):
+        ...
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+from typing import AsyncIterator, List, Optional, Set
+
+from hathi_validate import cli, package
+
+DEFAULT_CONCURRENCY = 4
+"""Number of packages validated at the same time by iter_batch()."""
+
+
+def get_default_args(path: str) -> argparse.Namespace:
+    """Get the same options the command line would use by default.
+
+    Args:
+        path: Path to the package or batch
+
+    Returns:
+        Returns options to be used by the checks.
+
+    """
+    return cli.get_parser().parse_args([path])
+
+
+async def validate_package(
+        path: str,
+        checks: Optional[List[cli.AbsValidation]] = None,
+        *,
+        args: Optional[argparse.Namespace] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        logger: Optional[logging.Logger] = None
+) -> cli.PackageResults:
+    """Validate a single package without blocking the event loop.
+
+    If the task awaiting this is cancelled, a package validated in a thread
+    stops at the next check or error found. In a process pool, a package
+    that has not started yet is not started at all.
+
+    Args:
+        path: Path to the package
+        checks: Validations to run on the package. Defaults to the checks
+            the command line runs.
+        args: Options for the checks, such as check_ocr. Defaults to the
+            defaults of the command line.
+        executor: Where to run the checks. Defaults to the thread pool of
+            the event loop. A ProcessPoolExecutor can be used for spreading
+            the work over more than one CPU.
+        logger: Python logger.
+
+    Returns:
+        Results and manifest of the package.
+
+    """
+    logger = logger or logging.getLogger(__name__)
+    if checks is None:
+        checks = cli.get_default_checks(
+            args or get_default_args(path), logger
+        )
+
+    cancel_event = None
+    if not isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        # Events cannot be sent to another process
+        cancel_event = threading.Event()
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        executor,
+        functools.partial(
+            cli.validate_package, path, checks, logger,
+            cancel_event=cancel_event
+        )
+    )
+    try:
+        return await future
+    except asyncio.CancelledError:
+        if cancel_event is not None:
+            cancel_event.set()
+        raise
+
+
+async def iter_batch(
+        root: str,
+        checks: Optional[List[cli.AbsValidation]] = None,
+        *,
+        args: Optional[argparse.Namespace] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[concurrent.futures.Executor] = None,
+        logger: Optional[logging.Logger] = None
+) -> AsyncIterator[cli.PackageResults]:
+    """Validate every package in a directory.
+
+    At most concurrency packages are validated at the same time. Results
+    are yielded as soon as a package is done, so they are not always in
+    the same order as the packages are found. A package that fails with an
+    exception is reported as a single error, the same as the command line
+    does.
+
+    Closing the iterator, or cancelling the task using it, cancels the
+    packages still being validated.
+
+    Args:
+        root: Path to the directory containing the packages
+        checks: Validations to run on each package. Defaults to the checks
+            the command line runs.
+        args: Options for the checks, such as check_ocr. Defaults to the
+            defaults of the command line.
+        concurrency: Number of packages validated at the same time.
+        executor: Where to run the checks. Defaults to the thread pool of
+            the event loop.
+        logger: Python logger.
+
+    Yields:
+        Yields the results and manifest of each package.
+
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    logger = logger or logging.getLogger(__name__)
+    if checks is None:
+        checks = cli.get_default_checks(
+            args or get_default_args(root), logger
+        )
+
+    loop = asyncio.get_running_loop()
+    packages = await loop.run_in_executor(
+        executor, _list_packages, root
+    )
+
+    remaining = iter(packages)
+    running: Set["asyncio.Task[cli.PackageResults]"] = set()
+    task_packages = {}
+    try:
+        while True:
+            for pkg in remaining:
+                task = asyncio.ensure_future(
+                    validate_package(pkg, checks, executor=executor,
+                                     logger=logger)
+                )
+                task_packages[task] = pkg
+                running.add(task)
+                if len(running) >= concurrency:
+                    break
+
+            if not running:
+                return
+
+            done, running = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                pkg = task_packages.pop(task)
+                error = task.exception()
+                if error is not None:
+                    logger.error(
+                        "Unable to validate %s. Reason: %s", pkg, error
+                    )
+                    yield await loop.run_in_executor(
+                        None, cli.get_crashed_package_results, pkg, error
+                    )
+                else:
+                    yield task.result()
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+def _list_packages(root: str) -> List[str]:
+    return list(package.get_dirs(root))
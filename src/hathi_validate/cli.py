@@ -4,13 +4,74 @@ import logging
 import argparse
 
 import abc
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
+import itertools
+from concurrent.futures.process import BrokenProcessPool
 from importlib import metadata
 import sys
 import os
-from typing import List, Optional
+import threading
+import time
+from typing import IO, Any, Dict, Generator, Iterable, Iterator, List, \
+    Optional
 
 from hathi_validate import package, process, configure_logging, report, \
-    validator, manifest, result
+    validator, manifest, result, fixity_cache, timing, incremental, \
+    sharding, journal, watch, scheduling
+
+PackageResults = collections.namedtuple(
+    "PackageResults",
+    ("package", "results", "manifest", "timings", "fingerprint", "complete",
+     "cached_files", "crashed"),
+    defaults=(None, None, True, 0, False)
+)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            "{} is not a positive integer".format(value)
+        )
+    return number
+
+
+def _megabytes(value: str) -> int:
+    return _positive_int(value) * 1024 * 1024
+
+
+def _digest_algorithms(value: str) -> List[str]:
+    algorithms = [
+        algorithm.strip().lower() for algorithm in value.split(",")
+        if algorithm.strip()
+    ]
+    for algorithm in algorithms:
+        if algorithm not in hashlib.algorithms_available:
+            raise argparse.ArgumentTypeError(
+                "unknown hash algorithm {}".format(algorithm)
+            )
+    return algorithms
+
+
+def _package_names(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _shard(value: str) -> sharding.Shard:
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "{} is not a shard such as 1/4".format(value)
+        ) from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            "shard {} is not between 1 and {}".format(index, count)
+        )
+    return sharding.Shard(index, count)
 
 
 def get_parser() -> argparse.ArgumentParser:
@@ -30,6 +91,10 @@ def get_parser() -> argparse.ArgumentParser:
                         action="store_true",
                         help="Check for ocr xml files"
                         )
+    parser.add_argument("--check_utf8",
+                        action="store_true",
+                        help="Check that the ocr txt files are utf-8 encoded"
+                        )
 
     parser.add_argument(
         "--save-report",
@@ -38,6 +103,220 @@ def get_parser() -> argparse.ArgumentParser:
         help="Save report to a file"
     )
 
+    parser.add_argument(
+        "--format",
+        dest="report_format",
+        choices=["text", *report.PACKAGE_REPORT_FORMATS],
+        default="text",
+        help="Format of the saved report. jsonl and csv write a line per "
+             "error as each package is done. Without --save-report, they "
+             "are written to stdout instead of the text reports and the "
+             "log is printed to stderr (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--state-file",
+        dest="state_file",
+        metavar="FILE",
+        help="Remember the results of each package in a file and only "
+             "validate packages again if they changed since the last run"
+    )
+
+    parser.add_argument(
+        "--read-once",
+        dest="read_once",
+        action="store_true",
+        help="Read each file once, sharing its content between the "
+             "checksum, MARC, YAML, OCR and utf-8 checks instead of each "
+             "check reading the files again"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Number of packages to validate in parallel, each in a separate "
+             "process"
+    )
+
+    scheduling_group = parser.add_argument_group("Scheduling")
+
+    scheduling_group.add_argument(
+        "--schedule",
+        dest="schedule",
+        choices=["largest-first", "found"],
+        default="largest-first",
+        help="Order the workers start the packages in. largest-first "
+             "estimates the work of each package from the size of its "
+             "files, so a huge package is not left running alone at the "
+             "end. found keeps the order of the directory. The reports "
+             "list the packages in the same order either way (default: "
+             "%(default)s)"
+    )
+
+    scheduling_group.add_argument(
+        "--priority",
+        type=_package_names,
+        default=[],
+        dest="priority",
+        metavar="PACKAGES",
+        help="Comma separated names of packages to validate and report "
+             "before any other, in the order given"
+    )
+
+    sharding_group = parser.add_argument_group("Sharding")
+
+    sharding_group.add_argument(
+        "--shard",
+        type=_shard,
+        dest="shard",
+        metavar="I/N",
+        help="Only validate the packages of shard I out of N, so a batch "
+             "can be split between N nodes. Every node puts the same "
+             "packages in the same shard"
+    )
+
+    sharding_group.add_argument(
+        "--partial-results",
+        dest="partial_results",
+        metavar="FILE",
+        help="Save the manifest and results of the packages validated to a "
+             "file, to be combined with those of the other shards by "
+             "hathivalidate merge"
+    )
+
+    resuming_group = parser.add_argument_group("Resuming")
+
+    journal_options = resuming_group.add_mutually_exclusive_group()
+
+    journal_options.add_argument(
+        "--journal",
+        dest="journal",
+        metavar="FILE",
+        help="Record the manifest and results of each package in a journal "
+             "as soon as it is validated, so an interrupted run can be "
+             "resumed with --resume. Packages cut short by --max-errors or "
+             "--max-errors-per-package and packages that could not be "
+             "validated are not recorded"
+    )
+
+    journal_options.add_argument(
+        "--resume",
+        dest="resume",
+        metavar="JOURNAL",
+        help="Skip the packages already recorded in a journal and keep "
+             "recording the others in it. The reports are the same as a run "
+             "that was never interrupted. A journal that does not exist yet "
+             "is started"
+    )
+
+    stopping_group = parser.add_argument_group("Stopping early")
+
+    stopping_group.add_argument(
+        "--fail-fast",
+        dest="fail_fast",
+        action="store_true",
+        help="Stop after the first package with errors"
+    )
+
+    stopping_group.add_argument(
+        "--max-errors",
+        type=_positive_int,
+        dest="max_errors",
+        metavar="N",
+        help="Stop once N errors have been found in the batch"
+    )
+
+    stopping_group.add_argument(
+        "--max-errors-per-package",
+        type=_positive_int,
+        dest="max_errors_per_package",
+        metavar="N",
+        help="Stop checking a package once N errors have been found in it"
+    )
+
+    checksum_group = parser.add_argument_group("Checksums")
+
+    checksum_group.add_argument(
+        "--checksum-threads",
+        type=_positive_int,
+        default=1,
+        dest="checksum_threads",
+        help="Number of files in a package to checksum, or to check for "
+             "utf-8 with --check_utf8, at the same time"
+    )
+
+    checksum_group.add_argument(
+        "--checksum-max-in-flight",
+        type=_megabytes,
+        default=process.DEFAULT_MAX_BYTES_IN_FLIGHT,
+        dest="checksum_max_in_flight",
+        metavar="MB",
+        help="Maximum combined size in megabytes of the files being "
+             "checksummed at the same time"
+    )
+
+    checksum_group.add_argument(
+        "--extra-digests",
+        type=_digest_algorithms,
+        default=[],
+        dest="extra_digests",
+        metavar="ALGORITHMS",
+        help="Comma separated hash algorithms, such as sha1,sha256, to "
+             "calculate while reading the files for the md5 checksums. The "
+             "hash values of the files that pass are written to a manifest "
+             "per package and algorithm, such as 00000001.sha256, in "
+             "--digest-manifest-dir"
+    )
+
+    checksum_group.add_argument(
+        "--digest-manifest-dir",
+        dest="digest_manifest_dir",
+        metavar="DIR",
+        help="Existing directory to write the manifests of --extra-digests "
+             "to. Required with --extra-digests. Packages unchanged since "
+             "--state-file are validated again if their manifests are "
+             "missing from it"
+    )
+
+    checksum_group.add_argument(
+        "--fixity-cache",
+        dest="fixity_cache",
+        nargs="?",
+        const=fixity_cache.get_default_cache_path(),
+        metavar="FILE",
+        help="Remember the checksums of files already calculated so that "
+             "files with the same size, modification time and inode are "
+             "not read again. A file changed in place without changing "
+             "those is then not detected. The report says how many "
+             "checksums were taken from the cache. Stored in FILE, or in "
+             "%(const)s if not given"
+    )
+
+    checksum_group.add_argument(
+        "--no-fixity-cache",
+        dest="fixity_cache",
+        action="store_const",
+        const=None,
+        help="Calculate the checksum of every file. This is the default"
+    )
+
+    timings_group = parser.add_argument_group("Timings")
+
+    timings_group.add_argument(
+        "--show-timings",
+        dest="show_timings",
+        action="store_true",
+        help="Print the time spent by each check at the end of the run"
+    )
+
+    timings_group.add_argument(
+        "--timings",
+        dest="timings",
+        metavar="FILE",
+        help="Save the time spent by each check, per package, as JSON"
+    )
+
     debug_group = parser.add_argument_group("Debug")
 
     debug_group.add_argument(
@@ -54,32 +333,287 @@ def get_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def get_merge_parser() -> argparse.ArgumentParser:
+    """Get argument parser for the merge command."""
+    parser = argparse.ArgumentParser(
+        prog="hathivalidate merge",
+        description="Combine the partial results of the shards of a batch "
+                    "into a single report"
+    )
+    parser.add_argument(
+        "partial_results",
+        nargs="+",
+        metavar="FILE",
+        help="Partial results files saved with --partial-results"
+    )
+    parser.add_argument(
+        "--save-report",
+        type=str,
+        dest="report_name",
+        help="Save report to a file"
+    )
+    return parser
+
+
+def merge_main(cli_args: Optional[List[str]] = None) -> None:
+    """Combine the partial results of shards into the usual reports."""
+    parser = get_merge_parser()
+    args = parser.parse_args(cli_args)
+    try:
+        merged = sharding.merge(
+            sharding.PartialResults.load(filename)
+            for filename in args.partial_results
+        )
+    except (OSError, ValueError, KeyError) as error:
+        parser.error("Unable to merge partial results. Reason: {}".format(
+            str(error) or type(error).__name__
+        ))
+
+    def write_manifest_report(sink: IO[str]) -> None:
+        manifest.write_report(merged.manifest, sink, width=80)
+
+    def write_validation_report(sink: IO[str]) -> None:
+        report.ReportStringBuilder(merged.results, merged.notes).write(sink)
+
+    console_reporter = report.Reporter(report.ConsoleReporter())
+    console_reporter.report_stream(write_manifest_report)
+    console_reporter.report_stream(write_validation_report)
+    if isinstance(args.report_name, str):
+        report.Reporter(
+            report.FileOutputReporter(args.report_name)
+        ).report_stream(write_validation_report)
+
+
+_BATCH_ONLY_OPTIONS = {
+    "report_name": "--save-report",
+    "state_file": "--state-file",
+    "workers": "--workers",
+    "schedule": "--schedule",
+    "priority": "--priority",
+    "shard": "--shard",
+    "partial_results": "--partial-results",
+    "journal": "--journal",
+    "resume": "--resume",
+    "fail_fast": "--fail-fast",
+    "max_errors": "--max-errors",
+    "max_errors_per_package": "--max-errors-per-package",
+    "show_timings": "--show-timings",
+    "timings": "--timings",
+}
+"""Options of a batch run, by dest, that do not apply to the watch command."""
+
+
+def get_watch_parser() -> argparse.ArgumentParser:
+    """Get argument parser for the watch command."""
+    parser = argparse.ArgumentParser(
+        prog="hathivalidate watch",
+        description="Validate the packages added to a staging directory as "
+                    "they arrive, until interrupted. The options of the "
+                    "checks, such as --check_ocr, are the same as when "
+                    "validating a batch. Options about running a whole "
+                    "batch, such as --workers or --resume, cannot be used"
+    )
+    parser.add_argument(
+        "root",
+        help="Directory the packages are added to"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=watch.DEFAULT_INTERVAL,
+        metavar="SECONDS",
+        help="Time between two looks at the directory (default: "
+             "%(default)s)"
+    )
+    parser.add_argument(
+        "--quiet-period",
+        type=float,
+        dest="quiet_period",
+        default=watch.DEFAULT_QUIET_PERIOD,
+        metavar="SECONDS",
+        help="Only validate a package once it has not changed for this long, "
+             "so packages still being copied are left alone (default: "
+             "%(default)s)"
+    )
+    parser.add_argument(
+        "--skip-existing",
+        dest="skip_existing",
+        action="store_true",
+        help="Only validate packages added or changed after starting"
+    )
+    parser.add_argument(
+        "--report",
+        dest="report_name",
+        metavar="FILE",
+        help="Add the results of each package to the end of this file "
+             "instead of writing them to stdout"
+    )
+    parser.add_argument(
+        "--format",
+        dest="report_format",
+        choices=list(report.PACKAGE_REPORT_FORMATS),
+        default="jsonl",
+        help="Format of the results (default: %(default)s)"
+    )
+    return parser
+
+
+def watch_main(cli_args: Optional[List[str]] = None,
+               stop_event: Optional[threading.Event] = None) -> None:
+    """Validate the packages added to a directory until interrupted.
+
+    Args:
+        cli_args: Command line arguments, without the watch command
+        stop_event: Stop watching once the packages found by the current
+            look at the directory are validated. Ctrl-C stops as well.
+
+    """
+    parser = get_watch_parser()
+    args, validation_args = parser.parse_known_args(cli_args)
+    if not os.path.isdir(args.root):
+        parser.error("{} is not a directory".format(args.root))
+    batch_parser = get_parser()
+    batch_args = batch_parser.parse_args([args.root, *validation_args])
+    batch_defaults = batch_parser.parse_args([args.root])
+    for dest, option in _BATCH_ONLY_OPTIONS.items():
+        if getattr(batch_args, dest) != getattr(batch_defaults, dest):
+            parser.error("{} cannot be used with watch".format(option))
+
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.DEBUG)
+    console = sys.stderr if args.report_name is None else sys.stdout
+    configure_logging.configure_logger(debug_mode=batch_args.debug,
+                                       log_file=batch_args.log_debug,
+                                       stream=console)
+
+    checks = get_default_checks(batch_args, logger)
+    watcher = watch.PackageWatcher(args.root, args.quiet_period)
+    if args.skip_existing:
+        watcher.skip_existing()
+    stop_event = stop_event or threading.Event()
+
+    with contextlib.ExitStack() as stack:
+        sink: IO[str] = sys.stdout
+        new_report = True
+        if args.report_name is not None:
+            new_report = not os.path.exists(args.report_name) or \
+                os.path.getsize(args.report_name) == 0
+            sink = stack.enter_context(
+                open(args.report_name, "a", encoding="utf8", newline="")
+            )
+        package_reporter = report.get_package_reporter(
+            args.report_format, sink
+        )
+        if new_report:
+            package_reporter.start()
+        stack.callback(package_reporter.finish)
+
+        logger.info("Watching %s for packages", args.root)
+        try:
+            while True:
+                for pkg in watcher.poll():
+                    try:
+                        package_results = validate_package(
+                            pkg, checks, logger, track_changes=True
+                        )
+                    except Exception as error:  # pylint: disable=broad-except
+                        logger.error(
+                            "Unable to validate %s. Reason: %s", pkg, error
+                        )
+                        package_results = \
+                            get_crashed_package_results(pkg, error)
+                    package_reporter.report_package(
+                        pkg, package_results.results
+                    )
+                    watcher.set_validated(pkg, package_results.fingerprint)
+                    logger.info("Validated %s, %d errors found", pkg,
+                                len(package_results.results))
+                if stop_event.wait(args.interval):
+                    break
+        except KeyboardInterrupt:
+            logger.info("Stopped watching %s", args.root)
+
+
 def main(cli_args: Optional[List[str]] = None) -> None:
     """Start main entry point for command line interface."""
+    if cli_args is None:
+        cli_args = sys.argv[1:]
+    if cli_args and cli_args[0] == "merge":
+        merge_main(cli_args[1:])
+        return
+    if cli_args and cli_args[0] == "watch":
+        watch_main(cli_args[1:])
+        return
+
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.DEBUG)
     parser = get_parser()
     args = parser.parse_args(cli_args)
+    if args.extra_digests:
+        # The batch is often a read-only staging area, so the manifests are
+        # never written next to the packages
+        if args.digest_manifest_dir is None:
+            parser.error("--extra-digests requires --digest-manifest-dir")
+        if not os.path.isdir(args.digest_manifest_dir):
+            parser.error("{} is not a directory".format(
+                args.digest_manifest_dir))
+
+    report_name = args.report_name
+    streaming = args.report_format != "text"
+    # Keep stdout for the results alone when they are streamed there
+    console = sys.stderr if streaming and report_name is None else sys.stdout
 
     configure_logging.configure_logger(debug_mode=args.debug,
-                                       log_file=args.log_debug)
-
-    report_generator = ReportGenerator(
-        args=args,
-        logger=logger
-    )
+                                       log_file=args.log_debug,
+                                       stream=console)
+
+    with contextlib.ExitStack() as stack:
+        package_reporters = []
+        if streaming:
+            sink: IO[str] = sys.stdout
+            if isinstance(report_name, str):
+                sink = stack.enter_context(
+                    open(report_name, "w", encoding="utf8", newline="")
+                )
+            package_reporters.append(
+                report.get_package_reporter(args.report_format, sink)
+            )
+
+        report_generator = ReportGenerator(
+            args=args,
+            logger=logger,
+            package_reporters=package_reporters,
+            keep_results=console is sys.stdout
+        )
+        try:
+            report_generator.generate_report()
+        except journal.JournalError as error:
+            parser.error("Unable to resume. Reason: {}".format(error))
 
-    report_generator.generate_report()
-    if report_generator.validation_report is not None and \
-            report_generator.manifest_report is not None:
+    if report_generator.results is not None and \
+            report_generator.manifest is not None:
         console_reporter2 = report.Reporter(report.ConsoleReporter())
-        console_reporter2.report(report_generator.manifest_report)
-        console_reporter2.report(report_generator.validation_report)
-        report_name = args.report_name
-        if isinstance(report_name, str):
+        console_reporter2.report_stream(
+            report_generator.write_manifest_report
+        )
+        console_reporter2.report_stream(
+            report_generator.write_validation_report
+        )
+        if isinstance(report_name, str) and not streaming:
             file_reporter = report.Reporter(
                 report.FileOutputReporter(report_name))
-            file_reporter.report(report_generator.validation_report)
+            file_reporter.report_stream(
+                report_generator.write_validation_report
+            )
+
+    if report_generator.timings is not None:
+        if args.show_timings:
+            report.Reporter(report.ConsoleReporter(console)).report_stream(
+                report_generator.timings.write_report
+            )
+        if args.timings:
+            with open(args.timings, "w", encoding="utf-8") as timings_file:
+                report_generator.timings.write_json(timings_file)
 
 
 class AbsValidation(abc.ABC):
@@ -98,14 +632,75 @@ class AbsValidation(abc.ABC):
         self._args = args
         self.logger = logger
 
-    @abc.abstractmethod
-    def get_errors(self, pkg: str) -> List[result.Result]:
+    def get_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> List[result.Result]:
         """Get the results of the validations.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Returns:
+            Any errors found in the validation.
+
+        """
+        return list(self.iter_errors(pkg, inventory))
+
+    def get_files_read(self,
+                       pkg: str,
+                       inventory: package.PackageInventory) -> List[str]:
+        """Get the files in a package that the validations read.
+
+        Only used for timing the validations, so it does not need to be
+        exact. Validations that only look at the names of files read none.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
+
+        Returns:
+            Names of the files, relative to the package.
+
+        """
+        return []
+
+    def get_content_check(
+            self,
+            pkg: str,
+            inventory: package.PackageInventory
+    ) -> Optional[process.AbsContentCheck]:
+        """Get the validations that can share the reads of another check.
+
+        Validations that only look at the names of files have none.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
 
         Returns:
+            Returns a check on the content of files, or None.
+
+        """
+        return None
+
+    @abc.abstractmethod
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Yields:
             Any errors found in the validation.
 
         """
@@ -128,233 +723,1134 @@ class ValidateMissingComponents(AbsValidation):
         if args.check_ocr:
             self.extensions.append(".xml")
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
 
-        Returns:
+        Yields:
             Any errors found in the validation.
 
         """
         self.logger.debug(
             "Looking for missing component files in {}".format(pkg))
-        errors = process.run_validation(
-            validator.ValidateComponents(pkg, r"^\d{8}$", *self.extensions))
-        for error in errors:
+        found_errors = False
+        for error in process.run_validation(
+                validator.ValidateComponents(pkg, r"^\d{8}$", *self.extensions,
+                                             inventory=inventory)):
+            found_errors = True
             self.logger.info(error.message)
-        if not errors:
+            yield error
+        if not found_errors:
             self.logger.info(
                 "Found no missing component files in {}".format(pkg))
-        return errors
 
 
 class ValidateMissingFiles(AbsValidation):
     """Validate missing files."""
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
 
-        Returns:
+        Yields:
             Any errors found in the validation.
 
         """
-        errors = []
-
         self.logger.debug("Looking for missing package files in %s", pkg)
-        missing_files_errors = process.run_validation(
-            validator.ValidateMissingFiles(path=pkg)
-        )
+        found_errors = False
+        for error in process.run_validation(
+                validator.ValidateMissingFiles(path=pkg, inventory=inventory)):
+            found_errors = True
+            self.logger.info(error.message)
+            yield error
 
-        if not missing_files_errors:
+        if not found_errors:
             self.logger.info("Found no missing package files in %s", pkg)
-        else:
-            for error in missing_files_errors:
-                self.logger.info(error.message)
-                errors.append(error)
-        return errors
 
 
 class ValidateExtraSubdirectories(AbsValidation):
     """Validate extra subdirectories."""
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
 
-        Returns:
+        Yields:
             Any errors found in the validation.
 
         """
-        errors = []
         self.logger.debug("Looking for extra subdirectories in {}".format(pkg))
-        extra_subdirectories_errors = process.run_validation(
-            validator.ValidateExtraSubdirectories(path=pkg))
-        if extra_subdirectories_errors:
-            for error in extra_subdirectories_errors:
-                errors.append(error)
-        return errors
+        yield from process.run_validation(
+            validator.ValidateExtraSubdirectories(path=pkg,
+                                                  inventory=inventory))
 
 
 class ValidateChecksums(AbsValidation):
     """Validate Checksums."""
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def __init__(self,
+                 args: argparse.Namespace,
+                 logger: logging.Logger,
+                 content_validations: Optional[List[AbsValidation]] = None
+                 ) -> None:
+        """Create a new validation object.
+
+        Args:
+            args:
+            logger: Python logger.
+            content_validations: Validations run on the content of the files
+                read for the checksums, instead of reading the files again.
+        """
+        super().__init__(args, logger)
+        self.content_validations = content_validations or []
+
+    def get_files_read(self,
+                       pkg: str,
+                       inventory: package.PackageInventory) -> List[str]:
+        """Get the files in a package that the validations read.
+
+        Files with a checksum in the fixity cache are counted too.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package.
 
         Returns:
+            Names of the files, relative to the package.
+
+        """
+        return list(inventory.files)
+
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Yields:
             Any errors found in the validation.
 
         """
-        errors = []
         checksum_report = os.path.join(pkg, "checksum.md5")
-        checksum_report_errors = process.run_validation(
-            validator.ValidateChecksumReport(pkg, checksum_report))
-        if not checksum_report_errors:
+        cache_file = getattr(self._args, "fixity_cache", None)
+        content_checks = []
+        if self.content_validations:
+            inventory = inventory or package.PackageInventory.scan(pkg)
+            for validation in self.content_validations:
+                content_check = validation.get_content_check(pkg, inventory)
+                if content_check is not None:
+                    content_checks.append(content_check)
+        found_errors = False
+        for error in process.run_validation(
+            validator.ValidateChecksumReport(
+                pkg,
+                checksum_report,
+                workers=getattr(self._args, "checksum_threads", 1),
+                max_bytes_in_flight=getattr(
+                    self._args,
+                    "checksum_max_in_flight",
+                    process.DEFAULT_MAX_BYTES_IN_FLIGHT
+                ),
+                cache=fixity_cache.get_cache(cache_file)
+                if cache_file else None,
+                inventory=inventory,
+                extra_algorithms=getattr(self._args, "extra_digests", []),
+                digest_manifest_dir=getattr(
+                    self._args, "digest_manifest_dir", None
+                ),
+                content_checks=content_checks
+            )
+        ):
+            found_errors = True
+            yield error
+
+        if not found_errors:
             self.logger.info(
                 "All checksums in {} successfully validated".format(
                     checksum_report))
-        else:
-            for error in checksum_report_errors:
-                errors.append(error)
-        return errors
 
 
 class ValidateMarc(AbsValidation):
     """Validate Marc."""
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def get_files_read(self,
+                       pkg: str,
+                       inventory: package.PackageInventory) -> List[str]:
+        """Get the files in a package that the validations read.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package.
 
         Returns:
+            Names of the files, relative to the package.
+
+        """
+        return ["marc.xml"]
+
+    def get_content_check(
+            self,
+            pkg: str,
+            inventory: package.PackageInventory
+    ) -> Optional[process.AbsContentCheck]:
+        """Get the validations that can share the reads of another check.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
+
+        Returns:
+            Returns a check on the content of marc.xml.
+
+        """
+        return process.MarcContentCheck(pkg)
+
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Yields:
             Any errors found in the validation.
 
         """
-        errors = []
         marc_file = os.path.join(pkg, "marc.xml")
-        marc_errors = process.run_validation(validator.ValidateMarc(marc_file))
-        if not marc_errors:
+        found_errors = False
+        for error in process.run_validation(validator.ValidateMarc(marc_file)):
+            found_errors = True
+            yield error
+
+        if not found_errors:
             self.logger.info("{} successfully validated".format(marc_file))
-        else:
-            for error in marc_errors:
-                errors.append(error)
-        return errors
 
 
 class ValidateYAML(AbsValidation):
     """Validate YML."""
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def get_files_read(self,
+                       pkg: str,
+                       inventory: package.PackageInventory) -> List[str]:
+        """Get the files in a package that the validations read.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package.
 
         Returns:
+            Names of the files, relative to the package.
+
+        """
+        return ["meta.yml"]
+
+    def get_content_check(
+            self,
+            pkg: str,
+            inventory: package.PackageInventory
+    ) -> Optional[process.AbsContentCheck]:
+        """Get the validations that can share the reads of another check.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
+
+        Returns:
+            Returns a check on the content of meta.yml.
+
+        """
+        return process.MetadataContentCheck(
+            pkg, require_page_data=True, inventory=inventory
+        )
+
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Yields:
             Any errors found in the validation.
 
         """
-        errors = []
         yml_file = os.path.join(pkg, "meta.yml")
-        meta_yml_errors = process.run_validation(
-            validator.ValidateMetaYML(yaml_file=yml_file, path=pkg,
-                                      required_page_data=True))
-        if not meta_yml_errors:
+        found_errors = False
+        for error in process.run_validation(
+                validator.ValidateMetaYML(yaml_file=yml_file, path=pkg,
+                                          required_page_data=True,
+                                          inventory=inventory)):
+            found_errors = True
+            yield error
+
+        if not found_errors:
             self.logger.info("{} successfully validated".format(yml_file))
-        else:
-            for error in meta_yml_errors:
-                errors.append(error)
-        return errors
 
 
 class ValidateOcrFiles(AbsValidation):
     """Validate ocr files."""
 
-    def get_errors(self, pkg: str) -> List[result.Result]:
-        """Get the results of the validations.
+    def get_files_read(self,
+                       pkg: str,
+                       inventory: package.PackageInventory) -> List[str]:
+        """Get the files in a package that the validations read.
 
         Args:
             pkg: Path to the directory containing the files.
+            inventory: Content of the package.
 
         Returns:
+            Names of the files, relative to the package.
+
+        """
+        if not self._args.check_ocr:
+            return []
+        return list(filter(process.is_ocr_file, inventory.files))
+
+    def get_content_check(
+            self,
+            pkg: str,
+            inventory: package.PackageInventory
+    ) -> Optional[process.AbsContentCheck]:
+        """Get the validations that can share the reads of another check.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
+
+        Returns:
+            Returns a check on the content of the OCR files, or None if
+                they are not checked.
+
+        """
+        if not self._args.check_ocr:
+            return None
+        return process.OcrContentCheck(pkg, inventory=inventory)
+
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Yields:
+            Any errors found in the validation.
+
+        """
+        if not self._args.check_ocr:
+            return
+
+        found_errors = False
+        for error in process.run_validation(
+                validator.ValidateOCRFiles(path=pkg, inventory=inventory)):
+            found_errors = True
+            yield error
+
+        if not found_errors:
+            self.logger.info("No validation errors found in %s", pkg)
+
+
+class ValidateUTF8TextFiles(AbsValidation):
+    """Validate the encoding of the text files."""
+
+    def get_files_read(self,
+                       pkg: str,
+                       inventory: package.PackageInventory) -> List[str]:
+        """Get the files in a package that the validations read.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
+
+        Returns:
+            Names of the files, relative to the package.
+
+        """
+        if not getattr(self._args, "check_utf8", False):
+            return []
+        return list(filter(process.is_text_file, inventory.files))
+
+    def get_content_check(
+            self,
+            pkg: str,
+            inventory: package.PackageInventory
+    ) -> Optional[process.AbsContentCheck]:
+        """Get the validations that can share the reads of another check.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package.
+
+        Returns:
+            Returns a check on the encoding of the text files, or None if
+                they are not checked.
+
+        """
+        if not getattr(self._args, "check_utf8", False):
+            return None
+        return process.Utf8ContentCheck(pkg, inventory=inventory)
+
+    def iter_errors(
+            self,
+            pkg: str,
+            inventory: Optional[package.PackageInventory] = None
+    ) -> Iterator[result.Result]:
+        """Run the validations, yielding errors as they are found.
+
+        Args:
+            pkg: Path to the directory containing the files.
+            inventory: Content of the package, scanned once and shared by
+                all the validations.
+
+        Yields:
             Any errors found in the validation.
 
         """
-        errors = []
-        if self._args.check_ocr:
-            ocr_errors = process.run_validation(
-                validator.ValidateOCRFiles(path=pkg))
-            if not ocr_errors:
-                self.logger.info("No validation errors found in %s", pkg)
-            else:
-                for error in ocr_errors:
-                    errors.append(error)
-        return errors
+        if not getattr(self._args, "check_utf8", False):
+            return
+
+        found_errors = False
+        for error in process.run_validation(
+                validator.ValidateUTF8TextFiles(
+                    path=pkg,
+                    inventory=inventory,
+                    workers=getattr(self._args, "checksum_threads", 1)
+                )):
+            found_errors = True
+            yield error
+
+        if not found_errors:
+            self.logger.info("All text files in %s are utf-8 encoded", pkg)
 
 
 class ReportGenerator:
     """Create a report for cli."""
 
-    def __init__(self,
-                 args: argparse.Namespace,
-                 logger: logging.Logger,
-                 checks: Optional[List[AbsValidation]] = None) -> None:
+    def __init__(
+            self,
+            args: argparse.Namespace,
+            logger: logging.Logger,
+            checks: Optional[List[AbsValidation]] = None,
+            package_reporters: Optional[
+                List[report.AbsPackageReporter]
+            ] = None,
+            keep_results: bool = True
+    ) -> None:
         """Create a new report generator object.
 
         Args:
             args:
             logger:
             checks:
+            package_reporters: Receive the results of each package as soon
+                as the package has been validated.
+            keep_results: Keep the results of the whole batch for the
+                validation report. Turn this off when the package reporters
+                are the only output, so memory use does not grow with the
+                size of the batch.
         """
         self._args = args
         self.logger = logger
-        self.validation_report: Optional[str] = None
-        self.manifest_report: Optional[str] = None
-        self.checks: List[AbsValidation] = checks or [
-            ValidateMissingFiles(args, logger),
-            ValidateMissingComponents(args, logger),
-            ValidateExtraSubdirectories(args, logger),
-            ValidateChecksums(args, logger),
-            ValidateMarc(args, logger),
-            ValidateYAML(args, logger),
-            ValidateOcrFiles(args, logger),
-        ]
+        self.package_reporters = package_reporters or []
+        self.keep_results = keep_results
+        self.results: Optional[List[result.Result]] = None
+        self.manifest: Optional[List[manifest.PackageManifestBuilder]] = None
+        self.timings: Optional[timing.TimingSummary] = None
+        self.collect_timings = bool(
+            getattr(args, "show_timings", False) or
+            getattr(args, "timings", None)
+        )
+        self.state_file: Optional[str] = getattr(args, "state_file", None)
+        self._previous_state: Optional[incremental.ValidationState] = None
+        self.fail_fast: bool = getattr(args, "fail_fast", False)
+        self.max_errors: Optional[int] = getattr(args, "max_errors", None)
+        self.max_errors_per_package: Optional[int] = \
+            getattr(args, "max_errors_per_package", None)
+        self.shard: Optional[sharding.Shard] = getattr(args, "shard", None)
+        self.priority: List[str] = getattr(args, "priority", None) or []
+        self.schedule: str = getattr(args, "schedule", "largest-first")
+        self.partial_results_file: Optional[str] = \
+            getattr(args, "partial_results", None)
+        self.resume = getattr(args, "resume", None) is not None
+        self.journal_file: Optional[str] = \
+            getattr(args, "resume", None) or getattr(args, "journal", None)
+        self._journaled: Dict[str, journal.JournalEntry] = {}
+        self.notes: List[str] = []
+        self._error_count = 0
+        self.checks: List[AbsValidation] = \
+            checks or get_default_checks(args, logger)
 
     def generate_report(self) -> None:
         """Output the report to stdout."""
-        errors = []
+        errors: Optional[List[result.Result]] = \
+            [] if self.keep_results else None
         batch_manifest_builder = manifest.PackageManifestDirector()
+        timings = timing.TimingSummary() if self.collect_timings else None
+        state = None
+        if self.state_file is not None:
+            settings = self.get_state_settings()
+            self._previous_state = \
+                incremental.ValidationState.load(self.state_file, settings)
+            state = incremental.ValidationState(settings)
+        partial_results = None
+        if self.partial_results_file is not None:
+            partial_results = sharding.PartialResults(
+                self.shard, self.get_state_settings()
+            )
+        self.notes = []
+        self._error_count = 0
+        cached_files = 0
+        self._journaled = {}
+        journal_writer = None
+        if self.journal_file is not None:
+            if self.resume:
+                self._journaled = journal.load_journal(
+                    self.journal_file, self._args.path,
+                    self.get_state_settings()
+                )
+                self.logger.info(
+                    "Resuming from %s, skipping %d packages already "
+                    "validated", self.journal_file, len(self._journaled)
+                )
+            journal_writer = journal.JournalWriter(
+                self.journal_file, self._args.path,
+                self.get_state_settings(), resume=self.resume
+            )
+        for reporter in self.package_reporters:
+            reporter.start()
+        try:
+            for package_results in self._iter_within_error_budget():
+                batch_manifest_builder.add_package_manifest(
+                    package_results.manifest
+                )
+                for reporter in self.package_reporters:
+                    reporter.report_package(
+                        package_results.package, package_results.results
+                    )
+                if errors is not None:
+                    errors += package_results.results
+                cached_files += package_results.cached_files
+                if timings is not None and package_results.timings:
+                    timings.add_timings(package_results.timings)
+                if state is not None and package_results.fingerprint and \
+                        package_results.complete:
+                    state.update(package_results.package,
+                                 package_results.fingerprint,
+                                 package_results.results)
+                if partial_results is not None:
+                    partial_results.add_package(
+                        package_results.package, package_results.manifest,
+                        package_results.results, package_results.complete
+                    )
+                # A package cut short by an error limit is validated again
+                # on resuming, in case the limits are not the same, and so is
+                # a package that crashed, in case the cause was transient
+                if journal_writer is not None and \
+                        package_results.complete and \
+                        not package_results.crashed and \
+                        not self._is_journaled(package_results.package):
+                    journal_writer.add_package(
+                        package_results.package, package_results.manifest,
+                        package_results.results, package_results.complete,
+                        package_results.fingerprint,
+                        package_results.cached_files
+                    )
+        finally:
+            for reporter in self.package_reporters:
+                reporter.finish()
+            if journal_writer is not None:
+                journal_writer.close()
+
+        if cached_files:
+            self.notes.append(
+                "The checksums of {} file(s) were taken from the fixity cache "
+                "instead of being calculated. A file changed without "
+                "changing its size, modification time or inode would not be "
+                "detected.".format(cached_files)
+            )
+        self.manifest = batch_manifest_builder.build_manifest()
+        self.results = errors
+        self.timings = timings
+        if state is not None and self.state_file is not None:
+            state.save(self.state_file)
+        if partial_results is not None and \
+                self.partial_results_file is not None:
+            partial_results.notes = list(self.notes)
+            partial_results.save(self.partial_results_file)
+
+    def _iter_within_error_budget(self) -> Iterator[PackageResults]:
+        with contextlib.closing(self.iter_package_results()) as package_iter:
+            for finished, package_results in enumerate(package_iter, 1):
+                if self.max_errors is not None:
+                    allowed = self.max_errors - self._error_count
+                    if len(package_results.results) > allowed:
+                        package_results = package_results._replace(
+                            results=package_results.results[:allowed],
+                            complete=False
+                        )
+                self._error_count += len(package_results.results)
+                if not package_results.complete:
+                    self.notes.append(
+                        "Stopped checking {} after {} errors.".format(
+                            package_results.package,
+                            len(package_results.results)
+                        )
+                    )
+                yield package_results
+
+                stop_reason = self._get_stop_reason(package_results)
+                if stop_reason is not None:
+                    self.logger.warning(stop_reason)
+                    if self._count_packages() > finished:
+                        self.notes.insert(
+                            0,
+                            "This report is partial. {} Any remaining "
+                            "packages were not validated.".format(stop_reason)
+                        )
+                    break
+
+    def _get_stop_reason(self,
+                         package_results: PackageResults) -> Optional[str]:
+        if self.fail_fast and package_results.results:
+            return "Validation stopped at the first package with errors, " \
+                   "{}.".format(package_results.package)
+        if self.max_errors is not None and \
+                self._error_count >= self.max_errors:
+            return "Validation stopped after reaching the limit of {} " \
+                   "errors.".format(self.max_errors)
+        return None
+
+    def get_state_settings(self) -> Dict[str, Any]:
+        """Get the options that affect the results saved to the state file.
+
+        Returns:
+            Returns a dictionary that can be saved as JSON.
+
+        """
+        return {
+            "check_ocr": bool(getattr(self._args, "check_ocr", False)),
+            "check_utf8": bool(getattr(self._args, "check_utf8", False)),
+            "checks": [type(check).__name__ for check in self.checks],
+            # Unchanged packages are skipped, so their manifests have to
+            # already be there from the last run
+            "extra_digests": list(getattr(self._args, "extra_digests", [])),
+            "digest_manifest_dir":
+                getattr(self._args, "digest_manifest_dir", None),
+        }
+
+    @property
+    def manifest_report(self) -> Optional[str]:
+        """Manifest report as a string, once the report is generated."""
+        if self.manifest is None:
+            return None
+        return manifest.get_report_as_str(self.manifest, width=80)
+
+    @property
+    def validation_report(self) -> Optional[str]:
+        """Validation report as a string, once the report is generated."""
+        if self.results is None:
+            return None
+        return report.ReportStringBuilder(
+            self.results, self.notes
+        ).build_string()
+
+    def write_manifest_report(self, sink: IO[str]) -> None:
+        """Write the manifest report to a text stream.
+
+        Args:
+            sink: Text stream such as a file or sys.stdout
+
+        """
+        manifest.write_report(self.manifest or [], sink, width=80)
+
+    def write_validation_report(self, sink: IO[str]) -> None:
+        """Write the validation report to a text stream.
+
+        Args:
+            sink: Text stream such as a file or sys.stdout
+
+        """
+        report.ReportStringBuilder(self.results or [], self.notes).write(sink)
+
+    def iter_package_results(
+            self
+    ) -> Generator[PackageResults, None, None]:
+        """Validate every package located in the path.
+
+        Packages are validated in a process pool if more than one worker is
+        requested. Either way, the results are yielded in the same order as
+        the packages were found. When resuming, the packages recorded in the
+        journal are not validated again but yielded from the journal in
+        their place.
+
+        Yields:
+            Yields the results and manifest of each package.
+
+        """
+        if not self._journaled:
+            yield from self._validate_packages(self.get_packages())
+            return
+
+        packages = list(self.get_packages())
+        with contextlib.closing(self._validate_packages(
+            pkg for pkg in packages if not self._is_journaled(pkg)
+        )) as validated:
+            for pkg in packages:
+                if self._is_journaled(pkg):
+                    entry = self._journaled[os.path.abspath(pkg)]
+                    yield PackageResults(
+                        pkg, entry.results, entry.manifest,
+                        fingerprint=entry.fingerprint,
+                        complete=entry.complete,
+                        cached_files=entry.cached_files
+                    )
+                else:
+                    yield next(validated)
+
+    def _validate_packages(
+            self,
+            packages: Iterable[str]
+    ) -> Generator[PackageResults, None, None]:
+        workers = getattr(self._args, "workers", 1) or 1
+        if workers == 1:
+            for pkg in packages:
+                try:
+                    package_results = validate_package(
+                        **self._get_validate_arguments(pkg)
+                    )
+                except Exception as error:  # pylint: disable=broad-except
+                    package_results = self._crashed_package(pkg, error)
+                yield package_results
+        else:
+            yield from self._run_in_process_pool(list(packages), workers)
+
+    def _is_journaled(self, pkg: str) -> bool:
+        return os.path.abspath(pkg) in self._journaled
+
+    def get_packages(self) -> Iterator[str]:
+        """Find the packages to validate.
+
+        Yields:
+            Yields the path to each package in the path, or only those of
+                the shard being validated. The priority packages come
+                first.
+
+        """
+        found = self._find_packages()
+        if not self.priority:
+            yield from found
+            return
+
+        packages = scheduling.prioritize(found, self.priority)
+        for name in self.priority:
+            if not any(scheduling.is_named(pkg, [name]) for pkg in packages):
+                self.logger.warning(
+                    "Priority package %s is not among the packages to "
+                    "validate", name
+                )
+        yield from packages
+
+    def _find_packages(self) -> Iterator[str]:
         for pkg in package.get_dirs(self._args.path):
-            self.logger.info("Creating a manifest for {}".format(pkg))
-            package_builder = batch_manifest_builder.add_package(pkg)
+            if self.shard is None or sharding.is_in_shard(pkg, self.shard):
+                yield pkg
+
+    def _count_packages(self) -> int:
+        return sum(1 for _ in self._find_packages())
+
+    def _run_in_process_pool(self,
+                             packages: List[str],
+                             workers: int) -> Iterator[PackageResults]:
+        costs: Dict[str, int] = {}
+        if self.schedule == "largest-first" and len(packages) > workers:
+            costs = scheduling.estimate_costs(packages)
+        not_started = collections.deque(
+            self._get_start_order(packages, costs)
+        )
+        finished: Dict[str, PackageResults] = {}
+        not_reported = collections.deque(packages)
+
+        def iter_reportable() -> Iterator[PackageResults]:
+            # The packages start in the scheduled order, but the results are
+            # still yielded in the order of the packages
+            while not_reported and not_reported[0] in finished:
+                yield finished.pop(not_reported.popleft())
+
+        while not_started:
+            interrupted: List[str] = []
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(workers, len(not_started))
+            )
+            try:
+                # Only as many packages as there are workers are submitted,
+                # so the packages in progress are known if a worker dies
+                running: Dict[
+                    "concurrent.futures.Future[PackageResults]", str
+                ] = {}
+                while not_started or running:
+                    while not_started and len(running) < workers:
+                        pkg = not_started.popleft()
+                        running[executor.submit(
+                            validate_package,
+                            **self._get_validate_arguments(pkg)
+                        )] = pkg
+                    done, _ = concurrent.futures.wait(
+                        running,
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        pkg = running.pop(future)
+                        package_results = self._get_pool_results(pkg, future)
+                        if package_results is None:
+                            interrupted.append(pkg)
+                        else:
+                            finished[pkg] = package_results
+                    if interrupted:
+                        break
+                    yield from iter_reportable()
+                if interrupted:
+                    # Keep the packages that finished before the pool broke
+                    concurrent.futures.wait(running)
+                    for future, pkg in running.items():
+                        package_results = self._get_pool_results(pkg, future)
+                        if package_results is None:
+                            interrupted.append(pkg)
+                        else:
+                            finished[pkg] = package_results
+            finally:
+                # Don't start any more packages if the caller stopped early
+                executor.shutdown(cancel_futures=True)
+
+            # A worker died and took the pool down with it. Any of the
+            # packages in progress could be responsible, so each is run on
+            # its own before the rest go to a new pool.
+            for pkg in sorted(interrupted, key=packages.index):
+                finished[pkg] = self._run_isolated(pkg)
+                yield from iter_reportable()
+        yield from iter_reportable()
+
+    def _get_pool_results(
+            self,
+            pkg: str,
+            future: "concurrent.futures.Future[PackageResults]"
+    ) -> Optional[PackageResults]:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            return None
+        except Exception as error:  # pylint: disable=broad-except
+            return self._crashed_package(pkg, error)
+
+    def _get_start_order(self,
+                         packages: List[str],
+                         costs: Dict[str, int]) -> List[str]:
+        if not costs:
+            return packages
+        return scheduling.order_largest_first(
+            packages, costs,
+            first=[
+                pkg for pkg in packages
+                if scheduling.is_named(pkg, self.priority)
+            ]
+        )
+
+    def _run_isolated(self, pkg: str) -> PackageResults:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                return executor.submit(
+                    validate_package, **self._get_validate_arguments(pkg)
+                ).result()
+            except Exception as error:  # pylint: disable=broad-except
+                return self._crashed_package(pkg, error)
+
+    def _get_validate_arguments(self, pkg: str) -> Dict[str, Any]:
+        return {
+            "pkg": pkg,
+            "checks": self.checks,
+            "logger": self.logger,
+            "collect_timings": self.collect_timings,
+            "track_changes": self.state_file is not None,
+            "previous_state": self._get_previous_state(pkg),
+            "max_errors": self._get_package_error_limit(),
+        }
+
+    def _get_previous_state(
+            self, pkg: str) -> Optional[incremental.PackageState]:
+        if self._previous_state is None:
+            return None
+        previous_state = self._previous_state.get(pkg)
+        if previous_state is None:
+            return None
+        # Reusing the results would skip writing the manifests again
+        extra_digests = getattr(self._args, "extra_digests", [])
+        manifest_dir = getattr(self._args, "digest_manifest_dir", None)
+        for algorithm in extra_digests:
+            if algorithm == "md5":
+                continue
+            if not os.path.exists(process.get_digest_manifest_path(
+                    pkg, algorithm, manifest_dir)):
+                return None
+        return previous_state
+
+    def _get_package_error_limit(self) -> Optional[int]:
+        limits = []
+        if self.max_errors_per_package is not None:
+            limits.append(self.max_errors_per_package)
+        if self.max_errors is not None:
+            limits.append(max(self.max_errors - self._error_count, 1))
+        return min(limits) if limits else None
+
+    def _crashed_package(self,
+                         pkg: str,
+                         error: BaseException) -> PackageResults:
+        self.logger.error("Unable to validate %s. Reason: %s", pkg, error)
+        return get_crashed_package_results(pkg, error)
+
+
+def get_default_checks(args: argparse.Namespace,
+                       logger: logging.Logger) -> List[AbsValidation]:
+    """Get the checks run on every package.
+
+    Args:
+        args: Command line arguments, such as returned by get_parser()
+        logger: Python logger.
+
+    Returns:
+        Returns a new instance of each check. With the read_once option, the
+            checks on the content of files are run by ValidateChecksums.
+
+    """
+    checks: List[AbsValidation] = [
+        ValidateMissingFiles(args, logger),
+        ValidateMissingComponents(args, logger),
+        ValidateExtraSubdirectories(args, logger),
+    ]
+    content_validations: List[AbsValidation] = [
+        ValidateMarc(args, logger),
+        ValidateYAML(args, logger),
+        ValidateOcrFiles(args, logger),
+        ValidateUTF8TextFiles(args, logger),
+    ]
+    if getattr(args, "read_once", False):
+        checks.append(ValidateChecksums(args, logger, content_validations))
+    else:
+        checks.append(ValidateChecksums(args, logger))
+        checks += content_validations
+    return checks
 
-            for _, __, files in os.walk(pkg):
-                for file_name in files:
-                    package_builder.add_file(file_name)
 
-            self.logger.info("Checking {}".format(pkg))
-            for validation in self.checks:
-                errors += validation.get_errors(pkg)
+def get_crashed_package_results(pkg: str,
+                                error: BaseException) -> PackageResults:
+    """Report a package that could not be validated as a single error.
 
-        batch_manifest = batch_manifest_builder.build_manifest()
+    Args:
+        pkg: Path to the directory containing the files.
+        error: Exception raised while validating the package.
 
-        self.manifest_report = manifest.get_report_as_str(
-            batch_manifest, width=80
+    Returns:
+        Results and manifest of the package.
+
+    """
+    summary_builder = result.SummaryDirector(source=pkg)
+    summary_builder.add_error(
+        "Unable to validate package. Reason: {}".format(
+            str(error) or type(error).__name__
         )
+    )
+    return PackageResults(
+        pkg,
+        list(summary_builder.construct()),
+        build_package_manifest(pkg),
+        crashed=True
+    )
 
-        self.validation_report = report.get_report_as_str(errors)
+
+def build_package_manifest(
+        pkg: str,
+        inventory: Optional[package.PackageInventory] = None
+) -> manifest.PackageManifestBuilder:
+    """Create a manifest of the files located in a package.
+
+    Args:
+        pkg: Path to the directory containing the files.
+        inventory: Content of the package. Scanned from the path if not
+            provided.
+
+    Returns:
+        Manifest of the package, with the number and size of its files but
+            not their names.
+
+    """
+    if inventory is None:
+        inventory = package.PackageInventory.scan(pkg)
+
+    package_builder = manifest.PackageManifestBuilder(pkg, counts_only=True)
+    for file_name, file_stat in inventory.files.items():
+        package_builder.add_file(file_name, file_stat.st_size)
+    for file_name in inventory.nested_files:
+        package_builder.add_file(file_name)
+    return package_builder
+
+
+def validate_package(pkg: str,
+                     checks: List[AbsValidation],
+                     logger: logging.Logger,
+                     collect_timings: bool = False,
+                     track_changes: bool = False,
+                     previous_state: Optional[incremental.PackageState] = None,
+                     max_errors: Optional[int] = None,
+                     cancel_event: Optional[threading.Event] = None
+                     ) -> PackageResults:
+    """Run all the checks on a single package.
+
+    This is a module level function so that it can be sent to a worker
+    process.
+
+    Args:
+        pkg: Path to the directory containing the files.
+        checks: Validations to run on the package.
+        logger: Python logger.
+        collect_timings: Time each check and count the files it reads.
+        track_changes: Include a fingerprint of the package in the results.
+        previous_state: Fingerprint and results of the package from the
+            last run. If the package has not changed since, the results are
+            reused instead of running the checks.
+        max_errors: Stop checking the package once this many errors are
+            found.
+        cancel_event: Stop checking the package once this is set by another
+            thread. The event is looked at before each check and after each
+            error found.
+
+    Raises:
+        concurrent.futures.CancelledError: The cancel_event was set.
+
+    Returns:
+        Results and manifest of the package, along with the timings and
+            fingerprint if requested and the number of files whose checksum
+            was taken from the fixity cache.
+
+    """
+    files_from_cache = fixity_cache.get_files_from_cache()
+    inventory = package.PackageInventory.scan(pkg)
+    logger.info("Creating a manifest for {}".format(pkg))
+    package_manifest = build_package_manifest(pkg, inventory)
+
+    fingerprint = None
+    if track_changes:
+        fingerprint = incremental.get_fingerprint(inventory)
+        if previous_state is not None and \
+                previous_state.fingerprint == fingerprint:
+            logger.info(
+                "No changes to {} since the last run. "
+                "Using the previous results".format(pkg)
+            )
+            return PackageResults(pkg, list(previous_state.results),
+                                  package_manifest, None, fingerprint)
+
+    logger.info("Checking {}".format(pkg))
+    errors: List[result.Result] = []
+    timings: Optional[List[timing.CheckTiming]] = \
+        [] if collect_timings else None
+    complete = True
+    for validation in checks:
+        started = time.perf_counter()
+        found = validation.iter_errors(pkg, inventory=inventory)
+        if cancel_event is not None:
+            found = _until_cancelled(found, cancel_event)
+        if max_errors is not None:
+            # Ask for one more error than allowed to know if any were left
+            found = itertools.islice(found, max_errors + 1 - len(errors))
+        errors += found
+        if timings is not None:
+            timings.append(
+                _time_check(validation, pkg, inventory,
+                            time.perf_counter() - started)
+            )
+        if max_errors is not None and len(errors) > max_errors:
+            logger.warning("Stopped checking %s after %d errors",
+                           pkg, max_errors)
+            del errors[max_errors:]
+            complete = False
+            break
+    return PackageResults(
+        pkg, errors, package_manifest, timings, fingerprint, complete,
+        fixity_cache.get_files_from_cache() - files_from_cache
+    )
+
+
+def _until_cancelled(
+        results: Iterator[result.Result],
+        cancel_event: threading.Event
+) -> Iterator[result.Result]:
+    if cancel_event.is_set():
+        raise concurrent.futures.CancelledError()
+    for validation_result in results:
+        yield validation_result
+        if cancel_event.is_set():
+            raise concurrent.futures.CancelledError()
+
+
+def _time_check(validation: AbsValidation,
+                pkg: str,
+                inventory: package.PackageInventory,
+                seconds: float) -> timing.CheckTiming:
+    files_read = validation.get_files_read(pkg, inventory)
+    return timing.CheckTiming(
+        check=type(validation).__name__,
+        package=pkg,
+        seconds=seconds,
+        files=len(files_read),
+        bytes=sum(
+            file_stat.st_size for file_stat in map(inventory.stat, files_read)
+            if file_stat is not None
+        )
+    )
 
 
 if __name__ == '__main__':
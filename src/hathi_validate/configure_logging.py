@@ -2,18 +2,20 @@
 
 import logging
 import sys
-from typing import Optional
+from typing import IO, Optional
 
 
 def configure_logger(
         debug_mode: bool = False,
-        log_file: Optional[str] = None
+        log_file: Optional[str] = None,
+        stream: Optional[IO[str]] = None
 ) -> logging.Logger:
     """Configure the logger.
 
     Args:
         debug_mode:
         log_file:
+        stream: Where to print the log messages. Defaults to sys.stdout.
 
     Returns:
         Python logger
@@ -26,7 +28,7 @@ def configure_logger(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    std_handler = logging.StreamHandler(sys.stdout)
+    std_handler = logging.StreamHandler(stream or sys.stdout)
     if log_file:
         file_handler = logging.FileHandler(filename=log_file)
         file_handler.setLevel(logging.DEBUG)
@@ -34,7 +36,7 @@ def configure_logger(
         logger.addHandler(file_handler)
 
     if debug_mode:
-        print("Debug mode")
+        print("Debug mode", file=stream or sys.stdout)
         std_handler.setLevel(logging.DEBUG)
         std_handler.setFormatter(debug_formatter)
     else:
@@ -0,0 +1,271 @@
+"""Persistent cache of hash values calculated for files.
+
+Hash values are stored in a SQLite database along with the size,
+modification time and inode of the file when it was hashed. A value is only
+returned if none of those have changed since.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 500_000
+"""Number of hash values kept before the least recently used are evicted."""
+
+WRITE_BATCH_SIZE = 100
+"""Number of changes kept in memory before they are written."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixity (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+CREATE INDEX IF NOT EXISTS fixity_last_used ON fixity (last_used);
+"""
+
+
+def get_default_cache_path() -> str:
+    """Get the location of the cache in the user's cache directory."""
+    if sys.platform == "win32":
+        cache_root = os.environ.get("LOCALAPPDATA") or \
+            os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        cache_root = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        cache_root = os.environ.get("XDG_CACHE_HOME") or \
+            os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_root, "hathi_validate", "fixity.sqlite")
+
+
+class FixityCache:
+    """Hash values of files, stored in a SQLite database.
+
+    Changes are kept in memory and written in batches, each in a short
+    transaction of its own, so other processes sharing the database are
+    never kept waiting for long. Looking up a value never writes. flush()
+    writes any remaining changes.
+    """
+
+    def __init__(self,
+                 database: str,
+                 max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Open or create a cache.
+
+        Args:
+            database: Path to the SQLite file.
+            max_entries: Number of hash values to keep.
+
+        """
+        self.database = database
+        self.max_entries = max_entries
+        self._pending_inserts: Dict[
+            Tuple[str, str], Tuple[str, str, int, int, int, str, float]
+        ] = {}
+        self._pending_last_used: Dict[Tuple[str, str], float] = {}
+        self._evict_needed = False
+        if database != ":memory:":
+            os.makedirs(
+                os.path.dirname(os.path.abspath(database)), exist_ok=True
+            )
+        self._connection = sqlite3.connect(database, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+
+    def get(self,
+            file_path: str,
+            file_stat: os.stat_result,
+            algorithm: str = "md5") -> Optional[str]:
+        """Look up the hash value of a file.
+
+        Args:
+            file_path: Path to the file.
+            file_stat: Current result of os.stat for the file.
+            algorithm: Name of the hash algorithm.
+
+        Returns:
+            Returns the hash value if the file has not changed since it was
+                stored, else returns None.
+
+        """
+        key = os.path.abspath(file_path)
+        pending = self._pending_inserts.get((key, algorithm))
+        if pending is not None:
+            row: Optional[Tuple[int, int, int, str]] = pending[2:6]
+        else:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, inode, digest FROM fixity "
+                "WHERE path = ? AND algorithm = ?",
+                (key, algorithm)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        size, mtime_ns, inode, digest = row
+        if (size, mtime_ns, inode) != (file_stat.st_size,
+                                       file_stat.st_mtime_ns,
+                                       file_stat.st_ino):
+            return None
+
+        self._pending_last_used[(key, algorithm)] = time.time()
+        if len(self._pending_last_used) >= WRITE_BATCH_SIZE:
+            self._write_pending()
+        return str(digest)
+
+    def get_digests(self,
+                    file_path: str,
+                    file_stat: os.stat_result,
+                    algorithms: Iterable[str]) -> Optional[Dict[str, str]]:
+        """Look up the hash values of a file for several algorithms.
+
+        Files found are counted by get_files_from_cache().
+
+        Args:
+            file_path: Path to the file.
+            file_stat: Current result of os.stat for the file.
+            algorithms: Names of the hash algorithms.
+
+        Returns:
+            Returns the hash value of each algorithm, or None if any of them
+                is not stored or the file has changed. The file has to be
+                read anyway then, so every hash value is calculated again.
+
+        """
+        digests = {}
+        for algorithm in algorithms:
+            digest = self.get(file_path, file_stat, algorithm)
+            if digest is None:
+                return None
+            digests[algorithm] = digest
+        _local.files_from_cache = get_files_from_cache() + 1
+        return digests
+
+    def set(self,
+            file_path: str,
+            file_stat: os.stat_result,
+            digest: str,
+            algorithm: str = "md5") -> None:
+        """Store the hash value of a file.
+
+        Args:
+            file_path: Path to the file.
+            file_stat: Result of os.stat for the file from before it was
+                hashed.
+            digest: Hash value of the file.
+            algorithm: Name of the hash algorithm.
+
+        """
+        key = os.path.abspath(file_path)
+        self._pending_inserts[(key, algorithm)] = (
+            key, algorithm, file_stat.st_size, file_stat.st_mtime_ns,
+            file_stat.st_ino, digest, time.time()
+        )
+        if len(self._pending_inserts) >= WRITE_BATCH_SIZE:
+            self._write_pending()
+
+    def flush(self) -> None:
+        """Write any changes to the database, evicting old entries."""
+        self._write_pending()
+        if self._evict_needed:
+            self._evict_needed = False
+            with self._connection:
+                self.evict()
+
+    def _write_pending(self) -> None:
+        if not self._pending_inserts and not self._pending_last_used:
+            return
+        # The connection commits at the end of the block, so the database
+        # is only locked for the duration of the batch.
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fixity "
+                "(path, algorithm, size, mtime_ns, inode, digest, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                list(self._pending_inserts.values())
+            )
+            self._connection.executemany(
+                "UPDATE fixity SET last_used = ? "
+                "WHERE path = ? AND algorithm = ?",
+                [(last_used, key, algorithm) for (key, algorithm), last_used
+                 in self._pending_last_used.items()]
+            )
+        self._evict_needed = self._evict_needed or bool(self._pending_inserts)
+        self._pending_inserts = {}
+        self._pending_last_used = {}
+
+    def evict(self) -> None:
+        """Remove the least recently used entries over the size limit."""
+        count, = self._connection.execute(
+            "SELECT COUNT(*) FROM fixity"
+        ).fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM fixity WHERE rowid IN "
+                "(SELECT rowid FROM fixity ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+
+    def __len__(self) -> int:
+        """Get the number of hash values stored."""
+        count, = self._connection.execute(
+            "SELECT COUNT(*) FROM fixity"
+        ).fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """Write any changes and close the database."""
+        self.flush()
+        self._connection.close()
+
+
+_local = threading.local()
+
+
+def get_files_from_cache() -> int:
+    """Count the files whose hash values were taken from a cache.
+
+    Only the files looked up by the current thread are counted, so the
+    difference between two calls counts the files of the work done in
+    between, even if other threads use the caches too.
+
+    Returns:
+        Returns the number of files found by FixityCache.get_digests() in
+            this thread so far.
+
+    """
+    return int(getattr(_local, "files_from_cache", 0))
+
+
+def get_cache(database: str) -> FixityCache:
+    """Get an open cache for the current thread and process.
+
+    SQLite connections cannot be shared between threads or be carried over
+    into a forked process, so each gets its own.
+
+    Args:
+        database: Path to the SQLite file.
+
+    Returns:
+        Returns an open cache.
+
+    """
+    caches: Dict[str, FixityCache] = _local.__dict__.setdefault("caches", {})
+    if _local.__dict__.get("pid") != os.getpid():
+        caches.clear()
+        _local.pid = os.getpid()
+    cache = caches.get(database)
+    if cache is None:
+        cache = FixityCache(database)
+        caches[database] = cache
+    return cache
@@ -0,0 +1,208 @@
+"""Calculate hash values of files.
+
+The fastest way to feed a file to a hash object depends on the Python
+version and the size of the file so the strategy is chosen per file.
+"""
+
+import abc
+import hashlib
+import io
+import mmap
+import os
+from typing import Any, Dict, Iterable, Optional
+
+HASH_BLOCK_SIZE = 1024 * 1024
+"""Size of the buffer used when reading a file in blocks."""
+
+MMAP_THRESHOLD = 64 * 1024 * 1024
+"""Files of at least this size are memory mapped instead of read."""
+
+
+class AbsHashingStrategy(abc.ABC):
+    """Base class for feeding the contents of a file to a hash object."""
+
+    @abc.abstractmethod
+    def update(self, file_handle: io.BufferedIOBase, hash_object: Any) -> None:
+        """Feed the entire file to the hash object.
+
+        Args:
+            file_handle: File opened in binary mode.
+            hash_object: Object from hashlib, such as hashlib.md5().
+
+        """
+
+
+class FileDigestStrategy(AbsHashingStrategy):
+    """Use hashlib.file_digest, available since Python 3.11."""
+
+    def update(self, file_handle: io.BufferedIOBase, hash_object: Any) -> None:
+        """Feed the entire file to the hash object.
+
+        Args:
+            file_handle: File opened in binary mode.
+            hash_object: Object from hashlib, such as hashlib.md5().
+
+        """
+        hashlib.file_digest(  # type: ignore[attr-defined]
+            file_handle, lambda: hash_object
+        )
+
+
+class ReadIntoStrategy(AbsHashingStrategy):
+    """Read the file in blocks into a single reused buffer."""
+
+    def __init__(self, block_size: int = HASH_BLOCK_SIZE) -> None:
+        """Create a new ReadIntoStrategy object.
+
+        Args:
+            block_size: Size of the buffer in bytes.
+
+        """
+        self.block_size = block_size
+
+    def update(self, file_handle: io.BufferedIOBase, hash_object: Any) -> None:
+        """Feed the entire file to the hash object.
+
+        Args:
+            file_handle: File opened in binary mode.
+            hash_object: Object from hashlib, such as hashlib.md5().
+
+        """
+        buffer = bytearray(self.block_size)
+        view = memoryview(buffer)
+        while True:
+            size = file_handle.readinto(buffer)
+            if not size:
+                break
+            hash_object.update(view[:size])
+
+
+class MmapStrategy(AbsHashingStrategy):
+    """Memory map the file and hash it with a single update."""
+
+    def update(self, file_handle: io.BufferedIOBase, hash_object: Any) -> None:
+        """Feed the entire file to the hash object.
+
+        Args:
+            file_handle: File opened in binary mode.
+            hash_object: Object from hashlib, such as hashlib.md5().
+
+        """
+        try:
+            mapped = mmap.mmap(
+                file_handle.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except (ValueError, OSError):
+            # Empty files and some file systems cannot be memory mapped
+            ReadIntoStrategy().update(file_handle, hash_object)
+            return
+
+        with mapped:
+            hash_object.update(mapped)
+
+
+class MultiHash:
+    """Feed the same data to several hash objects at once.
+
+    Can be used by any hashing strategy in place of a single hash object, so
+    a file is only read once no matter how many hash values are needed.
+    """
+
+    def __init__(self, algorithms: Iterable[str]) -> None:
+        """Create a new MultiHash object.
+
+        Args:
+            algorithms: Names of hashlib algorithms, such as md5 or sha256.
+
+        """
+        self.hash_objects = {
+            algorithm: hashlib.new(algorithm, usedforsecurity=False)
+            for algorithm in algorithms
+        }
+
+    def update(self, data: Any) -> None:
+        """Add data to every hash object.
+
+        Args:
+            data: Bytes-like object
+
+        """
+        for hash_object in self.hash_objects.values():
+            hash_object.update(data)
+
+    def hexdigests(self) -> Dict[str, str]:
+        """Get the hex digest of each algorithm."""
+        return {
+            algorithm: hash_object.hexdigest()
+            for algorithm, hash_object in self.hash_objects.items()
+        }
+
+
+def choose_strategy(file_size: int) -> AbsHashingStrategy:
+    """Pick the best way to hash a file of a given size.
+
+    Args:
+        file_size: Size of the file in bytes.
+
+    Returns:
+        Strategy for feeding the file to a hash object.
+
+    """
+    if file_size >= MMAP_THRESHOLD:
+        return MmapStrategy()
+    if file_size < HASH_BLOCK_SIZE:
+        # Don't allocate a large buffer for a small file
+        return ReadIntoStrategy(block_size=file_size + 1)
+    if hasattr(hashlib, "file_digest"):
+        return FileDigestStrategy()
+    return ReadIntoStrategy()
+
+
+def calculate_hash(
+        filename: str,
+        algorithm: str = "md5",
+        strategy: Optional[AbsHashingStrategy] = None
+) -> str:
+    """Calculate the hash value of a file.
+
+    Args:
+        filename: Path to the file.
+        algorithm: Name of a hashlib algorithm, such as md5 or sha256.
+        strategy: How to read the file. Chosen based on the file size if
+            not given.
+
+    Returns:
+        Hex digest of the file.
+
+    """
+    hash_object = hashlib.new(algorithm, usedforsecurity=False)
+    with open(filename, "rb") as file_handle:
+        if strategy is None:
+            strategy = choose_strategy(os.fstat(file_handle.fileno()).st_size)
+        strategy.update(file_handle, hash_object)
+    return hash_object.hexdigest()
+
+
+def calculate_hashes(
+        filename: str,
+        algorithms: Iterable[str],
+        strategy: Optional[AbsHashingStrategy] = None
+) -> Dict[str, str]:
+    """Calculate several hash values of a file while reading it once.
+
+    Args:
+        filename: Path to the file.
+        algorithms: Names of hashlib algorithms, such as md5 or sha256.
+        strategy: How to read the file. Chosen based on the file size if
+            not given.
+
+    Returns:
+        Hex digest of the file for each algorithm.
+
+    """
+    multi_hash = MultiHash(algorithms)
+    with open(filename, "rb") as file_handle:
+        if strategy is None:
+            strategy = choose_strategy(os.fstat(file_handle.fileno()).st_size)
+        strategy.update(file_handle, multi_hash)
+    return multi_hash.hexdigests()
@@ -0,0 +1,177 @@
+"""Remember the results of packages between runs.
+
+A fingerprint of each package, built from the names, sizes and modification
+times of its content, is saved to a state file along with the results found
+in the package. On the next run, packages with the same fingerprint do not
+need to be validated again.
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+
+from hathi_validate import package, result
+
+STATE_FILE_VERSION = 1
+
+PackageState = collections.namedtuple(
+    "PackageState",
+    ("fingerprint", "results")
+)
+"""Fingerprint of a package and the results found the last time."""
+
+
+def get_fingerprint(inventory: package.PackageInventory) -> str:
+    """Create a fingerprint of the content of a package.
+
+    Args:
+        inventory: Content of the package.
+
+    Returns:
+        Returns a hex digest that changes when a file is added, removed,
+            renamed or modified.
+
+    """
+    fingerprint = hashlib.sha256()
+    for file_name in sorted(inventory.files):
+        file_stat = inventory.files[file_name]
+        fingerprint.update(
+            "f\0{}\0{}\0{}\n".format(
+                file_name, file_stat.st_size, file_stat.st_mtime_ns
+            ).encode("utf-8", "surrogateescape")
+        )
+    for directory in sorted(inventory.directories):
+        fingerprint.update(
+            "d\0{}\n".format(directory).encode("utf-8", "surrogateescape")
+        )
+    for file_name in sorted(inventory.nested_files):
+        fingerprint.update(
+            "n\0{}\n".format(file_name).encode("utf-8", "surrogateescape")
+        )
+    return fingerprint.hexdigest()
+
+
+class ValidationState:
+    """Fingerprints and results of the packages validated in a run."""
+
+    def __init__(self, settings: Dict[str, Any]) -> None:
+        """Create a new empty ValidationState object.
+
+        Args:
+            settings: Options affecting the results, such as whether ocr
+                files are checked. Results saved with different settings are
+                not reused.
+
+        """
+        self.settings = settings
+        self.packages: Dict[str, PackageState] = {}
+
+    def get(self, pkg: str) -> Optional[PackageState]:
+        """Get the saved state of a package.
+
+        Args:
+            pkg: Path to the package
+
+        Returns:
+            Returns the state from the last run or None if the package was
+                not validated then.
+
+        """
+        return self.packages.get(os.path.abspath(pkg))
+
+    def update(self,
+               pkg: str,
+               fingerprint: str,
+               results: Iterable[result.Result]) -> None:
+        """Set the state of a package.
+
+        Args:
+            pkg: Path to the package
+            fingerprint: Fingerprint of the package when it was validated
+            results: Results found in the package
+
+        """
+        self.packages[os.path.abspath(pkg)] = \
+            PackageState(fingerprint, list(results))
+
+    @classmethod
+    def load(cls,
+             filename: str,
+             settings: Dict[str, Any]) -> "ValidationState":
+        """Read the state saved by the last run.
+
+        Args:
+            filename: Path to the state file
+            settings: Options used for this run
+
+        Returns:
+            Returns the saved state. If the file does not exist, cannot be
+                read or was saved with different settings, an empty state is
+                returned instead so every package is validated.
+
+        """
+        state = cls(settings)
+        logger = logging.getLogger(__name__)
+        try:
+            with open(filename, "r", encoding="utf-8") as state_file:
+                data = json.load(state_file)
+        except FileNotFoundError:
+            return state
+        except (OSError, ValueError) as error:
+            logger.warning("Unable to read %s. Reason: %s", filename, error)
+            return state
+
+        if data.get("version") != STATE_FILE_VERSION or \
+                data.get("settings") != settings:
+            logger.info(
+                "%s was saved with different settings. Validating every "
+                "package again", filename
+            )
+            return state
+
+        for pkg, package_state in data.get("packages", {}).items():
+            state.packages[pkg] = PackageState(
+                package_state["fingerprint"],
+                [result.Result.from_dict(item)
+                 for item in package_state["results"]]
+            )
+        return state
+
+    def save(self, filename: str) -> None:
+        """Write the state to a file.
+
+        The file is replaced in one step, so an interrupted run does not
+        leave a partly written file behind.
+
+        Args:
+            filename: Path to the state file
+
+        """
+        data = {
+            "version": STATE_FILE_VERSION,
+            "settings": self.settings,
+            "packages": {
+                pkg: {
+                    "fingerprint": package_state.fingerprint,
+                    "results": [
+                        item.to_dict() for item in package_state.results
+                    ],
+                }
+                for pkg, package_state in self.packages.items()
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(filename))
+        file_handle, temp_name = tempfile.mkstemp(
+            dir=directory, prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_handle, "w", encoding="utf-8") as state_file:
+                json.dump(data, state_file)
+            os.replace(temp_name, filename)
+        except BaseException:
+            os.remove(temp_name)
+            raise
@@ -0,0 +1,184 @@
+"""Record the packages finished by a run so it can be resumed.
+
+The journal is a JSON Lines file. The first line describes the run and each
+following line holds the manifest and results of a finished package. Lines
+are appended as soon as each package is done, so a run that is killed
+loses at most the package being written.
+"""
+
+import collections
+import json
+import logging
+import os
+from typing import IO, Any, Dict, Iterable, Optional
+
+from hathi_validate import manifest, result
+
+JOURNAL_VERSION = 1
+
+JournalEntry = collections.namedtuple(
+    "JournalEntry",
+    ("package", "manifest", "results", "complete", "fingerprint",
+     "cached_files")
+)
+"""Manifest and results of a package recorded in a journal."""
+
+
+class JournalError(Exception):
+    """The journal cannot be used for this run."""
+
+
+def load_journal(filename: str,
+                 path: str,
+                 settings: Dict[str, Any]) -> Dict[str, JournalEntry]:
+    """Read the packages recorded in a journal.
+
+    A line that cannot be read, such as the last one of a run killed while
+    writing it, is skipped. That package is validated again.
+
+    Args:
+        filename: Path to the journal
+        path: Path to the batch being validated
+        settings: Options used for this run
+
+    Raises:
+        JournalError: The journal is for another batch or was written with
+            different settings.
+
+    Returns:
+        Returns the recorded packages by their absolute path. The journal
+            does not need to exist, in which case there are none.
+
+    """
+    logger = logging.getLogger(__name__)
+    entries: Dict[str, JournalEntry] = {}
+    try:
+        journal_file = open(filename, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return entries
+
+    with journal_file:
+        header = _read_line(journal_file.readline())
+        if header is None:
+            return entries
+        if header.get("version") != JOURNAL_VERSION:
+            raise JournalError(
+                "{} is not a journal this version can read".format(filename)
+            )
+        if header.get("path") != os.path.abspath(path):
+            raise JournalError(
+                "{} is the journal of {}".format(filename, header.get("path"))
+            )
+        if header.get("settings") != settings:
+            raise JournalError(
+                "{} was written with different settings".format(filename)
+            )
+
+        for line_number, line in enumerate(journal_file, start=2):
+            data = _read_line(line)
+            if data is None:
+                logger.warning(
+                    "Skipping line %d of %s, which was not completely "
+                    "written", line_number, filename
+                )
+                continue
+            entry = JournalEntry(
+                data["package"],
+                manifest.PackageManifestBuilder.from_dict(data["manifest"]),
+                [result.Result.from_dict(item) for item in data["results"]],
+                data["complete"],
+                data.get("fingerprint"),
+                data.get("cached_files", 0)
+            )
+            entries[os.path.abspath(entry.package)] = entry
+    return entries
+
+
+def _read_line(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class JournalWriter:
+    """Append finished packages to a journal."""
+
+    def __init__(self,
+                 filename: str,
+                 path: str,
+                 settings: Dict[str, Any],
+                 resume: bool = False) -> None:
+        """Open a journal for writing.
+
+        Args:
+            filename: Path to the journal
+            path: Path to the batch being validated
+            settings: Options used for this run
+            resume: Add to the packages already in the journal instead of
+                starting a new journal.
+
+        """
+        self.filename = filename
+        new_journal = not resume or not os.path.exists(filename) or \
+            os.path.getsize(filename) == 0
+        self._file: IO[str] = open(
+            filename, "w" if new_journal else "a+", encoding="utf-8"
+        )
+        if new_journal:
+            self._write({
+                "version": JOURNAL_VERSION,
+                "path": os.path.abspath(path),
+                "settings": settings,
+            })
+        else:
+            # Don't append to a line left unfinished by the last run
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def add_package(self,
+                    pkg: str,
+                    package_manifest: manifest.PackageManifestBuilder,
+                    results: Iterable[result.Result],
+                    complete: bool = True,
+                    fingerprint: Optional[str] = None,
+                    cached_files: int = 0) -> None:
+        """Record a finished package.
+
+        Args:
+            pkg: Path to the package
+            package_manifest: Manifest of the package
+            results: Results found in the package
+            complete: False if the package was not completely validated
+            fingerprint: Fingerprint of the package, if tracking changes
+            cached_files: Number of files whose checksum was taken from the
+                fixity cache
+
+        """
+        self._write({
+            "package": pkg,
+            "manifest": package_manifest.to_dict(),
+            "results": [item.to_dict() for item in results],
+            "complete": complete,
+            "fingerprint": fingerprint,
+            "cached_files": cached_files,
+        })
+
+    def close(self) -> None:
+        """Close the journal."""
+        self._file.close()
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(data) + "\n")
+        # Get the line out of the process, in case it is killed
+        self._file.flush()
+
+    def __enter__(self) -> "JournalWriter":
+        """Use the journal as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the journal when leaving the context."""
+        self.close()
@@ -1,9 +1,10 @@
 """Manage file manifests."""
 
 import collections
+import io
 import os
 import typing
-from typing import Set, List
+from typing import Set, List, IO, Iterable, Optional
 
 PackageManifest = \
     collections.namedtuple("PackageManifest", ("source", "item_types"))
@@ -31,63 +32,192 @@ class PackageManifestDirector:
         self._packages.append(package)
         return package
 
+    def add_package_manifest(self,
+                             package: "PackageManifestBuilder") -> None:
+        """Add an already populated package to the manifest.
+
+        Args:
+            package: manifest of a package, such as one built by another
+                process
+
+        """
+        self._packages.append(package)
+
 
 class PackageManifestBuilder:
     """Builder class for package manifests."""
 
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, counts_only: bool = False) -> None:
         """Create new PackageManifestBuilder object.
 
         Args:
             source:
+            counts_only: Only keep the number and total size of the files of
+                each extension, not their names, so the memory used does
+                not grow with the number of files. Every file added is
+                counted, even if a file of the same name was already added.
         """
-        self._files: typing.Dict[str, Set[str]] = collections.defaultdict(set)
+        self._files: Optional[typing.Dict[str, Set[str]]] = \
+            None if counts_only else collections.defaultdict(set)
+        self._counts: typing.Dict[str, int] = collections.defaultdict(int)
+        # None once a file of unknown size is added
+        self._sizes: typing.Dict[str, Optional[int]] = \
+            collections.defaultdict(int)
         self.source = source
 
-    def add_file(self, file: str) -> None:
+    @property
+    def counts_only(self) -> bool:
+        """True if the names of the files are not kept."""
+        return self._files is None
+
+    def add_file(self, file: str, size: Optional[int] = None) -> None:
         """Add file to the manifest.
 
         Args:
             file: File name
+            size: Size of the file in bytes, if known
 
         """
         base_name = os.path.basename(file)
         _, ext = os.path.splitext(base_name)
-        self._files[ext].add(file)
+        if self._files is not None:
+            if file in self._files[ext]:
+                return
+            self._files[ext].add(file)
+        self._counts[ext] += 1
+        total = self._sizes[ext]
+        self._sizes[ext] = None if total is None or size is None \
+            else total + size
 
     @property
     def files(self) -> typing.Dict[str, Set[str]]:
-        """Files located inside the package."""
+        """Files located inside the package.
+
+        Raises:
+            ValueError: The manifest is counts only.
+
+        """
+        if self._files is None:
+            raise ValueError(
+                "The manifest of {} only has the number of files".format(
+                    self.source
+                )
+            )
         return dict(self._files)
 
+    @property
+    def counts(self) -> typing.Dict[str, int]:
+        """Number of files located inside the package, by extension."""
+        return dict(self._counts)
+
+    @property
+    def sizes(self) -> typing.Dict[str, Optional[int]]:
+        """Total size in bytes of the files, by extension.
+
+        The size of an extension is None if the size of any of its files was
+        not given.
+        """
+        return dict(self._sizes)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """Get the manifest as a dictionary that can be saved as JSON."""
+        data: typing.Dict[str, typing.Any] = {
+            "source": self.source,
+            "counts": self.counts,
+            "sizes": self.sizes,
+        }
+        if self._files is not None:
+            data["files"] = {
+                ext: sorted(files) for ext, files in self._files.items()
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls,
+                  data: typing.Dict[str, typing.Any]
+                  ) -> "PackageManifestBuilder":
+        """Create a manifest from a dictionary made by to_dict().
+
+        Args:
+            data: Dictionary with the source and files of the manifest
+
+        Returns:
+            Returns a new PackageManifestBuilder object, counts only if the
+                dictionary has no file names.
+
+        """
+        package = cls(data["source"], counts_only="files" not in data)
+        if package._files is not None:
+            for ext, files in data["files"].items():
+                package._files[ext].update(files)
+        counts = data.get("counts")
+        if counts is None:
+            # Written before the manifests kept the number of files
+            counts = {ext: len(files) for ext, files in data["files"].items()}
+        sizes = data.get("sizes", {})
+        for ext, count in counts.items():
+            package._counts[ext] = count
+            package._sizes[ext] = sizes.get(ext)
+        return package
+
+
+def format_size(size: int) -> str:
+    """Format a number of bytes for a report, such as 1.5 MB."""
+    if size < 1024:
+        return f"{size} bytes"
+    value = float(size)
+    for unit in ("KB", "MB", "GB"):
+        value /= 1024
+        if value < 1024:
+            break
+    else:
+        unit = "TB"
+        value /= 1024
+    return f"{value:.1f} {unit}"
+
 
 def get_report_as_str(manifest: List[PackageManifestBuilder],
                       width: int) -> str:
     """Convert the manifest object into a report string."""
+    buffer = io.StringIO()
+    write_report(manifest, buffer, width)
+    return buffer.getvalue()
+
+
+def write_report(manifest: Iterable[PackageManifestBuilder],
+                 sink: IO[str],
+                 width: int) -> None:
+    """Write the manifest report to a text stream, one package at a time.
+
+    Args:
+        manifest: Package manifests to include in the report
+        sink: Text stream such as a file or sys.stdout
+        width: Width of the separator lines
+
+    """
     line_sep = "=" * width
     title = "Manifest"
-    header = f"{line_sep}" \
-             f"\n{title}" \
-             f"\n{line_sep}"
-
-    item_messages = []
-
-    for item in manifest:
-        item_source = item.source
-
-        component_messages = []
-        for ext, files in sorted(item.files.items()):
-            component_messages.append(f" * {ext}: {len(files)} file(s)")
-        component_messages_text = "\n".join(component_messages)
-        item_message = f"{item_source}" \
-                       f"\n{component_messages_text}" \
-                       f"\n"
-        item_messages.append(item_message)
-
-    item_messages_text = "\n".join(item_messages)
-
-    report = f"{header}" \
-             f"\n" \
-             f"\n{item_messages_text}" \
-             f"\n{line_sep}"
-    return report
+    sink.write(f"{line_sep}"
+               f"\n{title}"
+               f"\n{line_sep}"
+               f"\n\n")
+
+    for i, item in enumerate(manifest):
+        if i > 0:
+            sink.write("\n")
+        sizes = item.sizes
+        component_messages_text = "\n".join(
+            _format_component(ext, count, sizes.get(ext))
+            for ext, count in sorted(item.counts.items())
+        )
+        sink.write(f"{item.source}"
+                   f"\n{component_messages_text}"
+                   f"\n")
+
+    sink.write(f"\n{line_sep}")
+
+
+def _format_component(ext: str, count: int, size: Optional[int]) -> str:
+    if size is None:
+        return f" * {ext}: {count} file(s)"
+    return f" * {ext}: {count} file(s), {format_size(size)}"
@@ -1,7 +1,7 @@
 """Package related stuff."""
 
 import os
-from typing import Iterator
+from typing import Dict, Iterator, List, Optional
 
 
 def get_dirs(root: str) -> Iterator[str]:
@@ -9,3 +9,89 @@ def get_dirs(root: str) -> Iterator[str]:
     for item in os.scandir(root):
         if item.is_dir():
             yield item.path
+
+
+class PackageInventory:
+    """Index of the content of a package, built from a single directory scan.
+
+    Each file is only stat'ed once, so validations can check which files
+    exist and how large they are without going back to the file system.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Create a new empty PackageInventory object.
+
+        Use PackageInventory.scan() to build an inventory of a directory.
+
+        Args:
+            path: Path to the package
+        """
+        self.path = path
+        self.files: Dict[str, os.stat_result] = {}
+        self.directories: List[str] = []
+        self.nested_files: List[str] = []
+
+    @classmethod
+    def scan(cls, path: str) -> "PackageInventory":
+        """Build an inventory of a package directory.
+
+        Args:
+            path: Path to the package
+
+        Returns:
+            Returns a new inventory.
+
+        """
+        inventory = cls(path)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    inventory.directories.append(entry.name)
+                    if not entry.is_symlink():
+                        inventory.nested_files += _walk_files(entry.path)
+                elif entry.is_file():
+                    inventory.files[entry.name] = entry.stat()
+        return inventory
+
+    def exists(self, name: str) -> bool:
+        """Check if a file or a subdirectory exists in the package.
+
+        Args:
+            name: Name of the file or subdirectory
+
+        """
+        return name in self.files or name in self.directories
+
+    def stat(self, name: str) -> Optional[os.stat_result]:
+        """Get the cached stat result of a file in the package.
+
+        Args:
+            name: Name of the file, relative to the package
+
+        Returns:
+            Returns the result of os.stat or None if there is no such file.
+
+        """
+        if os.path.basename(name) != name:
+            # Not something located at the top of the package
+            try:
+                return os.stat(self.get_path(name))
+            except OSError:
+                return None
+        return self.files.get(name)
+
+    def get_path(self, name: str) -> str:
+        """Get the full path of a file in the package.
+
+        Args:
+            name: Name of the file, relative to the package
+
+        """
+        return os.path.join(self.path, name)
+
+
+def _walk_files(path: str) -> List[str]:
+    found = []
+    for _, __, files in os.walk(path):
+        found += files
+    return found
@@ -1,22 +1,27 @@
 """Process that validations."""
 
 import abc
+import codecs
+import collections
+import concurrent.futures
 import datetime
-import hashlib
+import functools
+import io
 import logging
 import os
 import itertools
 import typing
 import re
-from typing import Tuple, Iterator, List, Dict, Any, Generator, Optional
+from typing import Tuple, Iterator, List, Dict, Any, Generator, Optional, \
+    Iterable, Sequence, Callable, Mapping
 import yaml
 from lxml import etree
 
-from importlib.resources import files, as_file
-
-import hathi_validate
+from hathi_validate import fixity_cache
+from hathi_validate import hashing
+from hathi_validate import package
 from hathi_validate import result
-from hathi_validate import xsd as hathi_xsd
+from hathi_validate import schema
 from . import validator
 
 DIRECTORY_REGEX = \
@@ -27,6 +32,15 @@ DATE_REGEX = re.compile(
 )
 
 
+DEFAULT_MAX_BYTES_IN_FLIGHT = 256 * 1024 * 1024
+
+UTF8_BLOCK_SIZE = 1024 * 1024
+"""Number of bytes decoded at a time when checking the encoding of a file."""
+
+_Digests = Optional[Dict[str, str]]
+_ContentHandlers = Mapping[str, Callable[[bytes], None]]
+
+
 class ValidationError(Exception):
     """Validation failed."""
 
@@ -35,11 +49,16 @@ class InvalidChecksum(ValidationError):
     """Checksum is invalid."""
 
 
-def find_missing_files(path: str) -> result.ResultSummary:
+def find_missing_files(
+        path: str,
+        inventory: Optional[package.PackageInventory] = None
+) -> result.ResultSummary:
     """Check for expected files exist on the path.
 
     Args:
         path:
+        inventory: Content of the package. Scanned from the path if not
+            provided.
 
     Yields: Any files missing
 
@@ -51,29 +70,37 @@ def find_missing_files(path: str) -> result.ResultSummary:
     ]
 
     summery_builder = result.SummaryDirector(source=path)
+    if inventory is None:
+        inventory = package.PackageInventory.scan(path)
 
     for file in expected_files:
-        if not os.path.exists(os.path.join(path, file)):
+        if not inventory.exists(file):
             summery_builder.add_error("Missing file: {}".format(file))
     return summery_builder.construct()
 
 
-def find_extra_subdirectory(path: str) -> result.ResultSummary:
+def find_extra_subdirectory(
+        path: str,
+        inventory: Optional[package.PackageInventory] = None
+) -> result.ResultSummary:
     """Check path for any subdirectories.
 
     Args:
         path:
+        inventory: Content of the package. Scanned from the path if not
+            provided.
 
     Yields: Any subdirectory
 
     """
     summary_builder = result.SummaryDirector(source=path)
-    for item in os.scandir(path):
-        if item.is_dir():
+    if inventory is None:
+        inventory = package.PackageInventory.scan(path)
 
-            summary_builder.add_error(
-                "Extra subdirectory {}".format(item.name)
-            )
+    for directory_name in inventory.directories:
+        summary_builder.add_error(
+            "Extra subdirectory {}".format(directory_name)
+        )
 
     return summary_builder.construct()
 
@@ -101,17 +128,21 @@ def parse_checksum(line: str) -> Tuple[str, str]:
     return md5_hash, filename
 
 
-def calculate_md5(filename: str, chunk_size: int = 8192) -> str:
-    """Calculate the md5 hash value of a file."""
-    md5 = hashlib.md5(usedforsecurity=False)
+def calculate_md5(filename: str, chunk_size: Optional[int] = None) -> str:
+    """Calculate the md5 hash value of a file.
 
-    with open(filename, "rb") as file_handle:
-        while True:
-            data = file_handle.read(chunk_size)
-            if not data:
-                break
-            md5.update(data)
-        return md5.hexdigest()
+    Args:
+        filename: Path to the file.
+        chunk_size: Read the file in chunks of this size. By default, the
+            fastest way to read the file is chosen based on its size.
+
+    Returns:
+        Hex digest of the file.
+
+    """
+    strategy = None if chunk_size is None else \
+        hashing.ReadIntoStrategy(block_size=chunk_size)
+    return hashing.calculate_hash(filename, "md5", strategy)
 
 
 def is_same_hash(*hashes: str) -> bool:
@@ -122,51 +153,375 @@ def is_same_hash(*hashes: str) -> bool:
     )
 
 
-def find_failing_checksums(path: str, report: str) -> result.ResultSummary:
+def find_failing_checksums(
+        path: str,
+        report: str,
+        workers: int = 1,
+        max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT,
+        cache: Optional[fixity_cache.FixityCache] = None,
+        inventory: Optional[package.PackageInventory] = None,
+        extra_algorithms: Sequence[str] = (),
+        digest_manifest_dir: Optional[str] = None
+) -> result.ResultSummary:
     """Validate that the checksums in the .fil file match.
 
     Args:
         path:
         report:
+        workers: Number of threads used to calculate checksums. Files on a
+            network share are mostly waiting on latency so a few files can be
+            read at the same time.
+        max_bytes_in_flight: Limits the total size of the files being hashed
+            at the same time when using more than one worker.
+        cache: Previously calculated hash values. Files that have not changed
+            since they were added to the cache are not read again.
+        inventory: Content of the package, used instead of asking the file
+            system for the size of each file.
+        extra_algorithms: Names of other hashlib algorithms, such as sha256,
+            to calculate while reading the files for the md5 checksums.
+        digest_manifest_dir: Where to write a manifest of the extra hash
+            values. Defaults to the directory containing the package.
 
     Returns: Error report
 
     """
-    logger = logging.getLogger(__name__)
     report_builder = result.SummaryDirector(source=path)
+    for error in iter_failing_checksums(path, report, workers,
+                                        max_bytes_in_flight, cache,
+                                        inventory, extra_algorithms,
+                                        digest_manifest_dir):
+        report_builder.add_result(error)
+    return report_builder.construct()
+
+
+def iter_failing_checksums(
+        path: str,
+        report: str,
+        workers: int = 1,
+        max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT,
+        cache: Optional[fixity_cache.FixityCache] = None,
+        inventory: Optional[package.PackageInventory] = None,
+        extra_algorithms: Sequence[str] = (),
+        digest_manifest_dir: Optional[str] = None,
+        content_handlers: Optional[_ContentHandlers] = None
+) -> Iterator[result.Result]:
+    """Validate that the checksums in the .fil file match.
+
+    Same as find_failing_checksums() but errors are yielded as soon as they
+    are found. The manifests of the extra hash values are only written once
+    every file has been checked. A manifest that cannot be written is
+    reported as an error of the package.
+
+    The content of the files named in content_handlers is passed to their
+    handler after being read for the checksum, so other checks don't have
+    to read them again. See calculate_checksums().
+
+    Yields:
+        Yields an error result for each file that does not match.
+
+    """
+    logger = logging.getLogger(__name__)
+    algorithms = ["md5"] + [
+        algorithm for algorithm in extra_algorithms if algorithm != "md5"
+    ]
+    extra_digests: List[Tuple[str, Dict[str, str]]] = []
     try:
-        for report_md5_hash, filename in extracts_checksums(report):
-            logger.debug(
-                "Calculating the md5 checksum hash for %s", filename
-            )
-            file_path = os.path.join(path, filename)
-            try:
-                file_md5_hash = calculate_md5(filename=file_path)
-                if not is_same_hash(file_md5_hash, report_md5_hash):
-                    logger.debug(
-                        'Hash mismatch for "%s". (Actual (%s): expected (%s))',
-                        file_path, file_md5_hash, report_md5_hash
-                    )
-                    report_builder.add_error(
-                        f"Checksum listed in {os.path.basename(report)} "
-                        f"doesn't match for \"{filename}\""
-                    )
-                else:
-                    logger.info(
-                        "%s successfully matches md5 hash in %s",
-                        filename, os.path.basename(report)
-                    )
-            except FileNotFoundError:
+        for report_md5_hash, filename, file_digests in calculate_checksums(
+                path, extracts_checksums(report),
+                workers, max_bytes_in_flight, cache, inventory,
+                algorithms, content_handlers):
+
+            if file_digests is None:
                 logger.info(
                     "Unable to run checksum for missing file, %s", filename
                 )
-                report_builder.add_error(
+                yield result.create_error(
+                    path,
                     f"Unable to run checksum for missing file, {filename}"
                 )
+                continue
+
+            file_md5_hash = file_digests["md5"]
+            if not is_same_hash(file_md5_hash, report_md5_hash):
+                logger.debug(
+                    'Hash mismatch for "%s". (Actual (%s): expected (%s))',
+                    os.path.join(path, filename),
+                    file_md5_hash,
+                    report_md5_hash
+                )
+                yield result.create_error(
+                    path,
+                    f"Checksum listed in {os.path.basename(report)} "
+                    f"doesn't match for \"{filename}\""
+                )
+            else:
+                logger.info(
+                    "%s successfully matches md5 hash in %s",
+                    filename, os.path.basename(report)
+                )
+                # Only files that passed are vouched for in the manifests
+                extra_digests.append((filename, file_digests))
 
     except FileNotFoundError:
-        report_builder.add_error("File missing")
-    return report_builder.construct()
+        yield result.create_error(path, "File missing")
+        return
+
+    for algorithm in algorithms[1:]:
+        try:
+            manifest_file = write_digest_manifest(
+                path, algorithm, extra_digests, digest_manifest_dir
+            )
+        except OSError as error:
+            yield result.create_error(
+                path,
+                f"Unable to write the {algorithm} manifest. "
+                f"Reason: {error}"
+            )
+            continue
+        logger.info("Wrote %s hash values to %s", algorithm, manifest_file)
+
+
+def write_digest_manifest(
+        path: str,
+        algorithm: str,
+        digests: Iterable[Tuple[str, Dict[str, str]]],
+        directory: Optional[str] = None
+) -> str:
+    """Write the hash values of a package's files in the checksum.md5 format.
+
+    The manifest is written next to the package, not inside it, so the
+    package itself is left untouched. For a package at batch/00000001 the
+    sha256 manifest is batch/00000001.sha256.
+
+    Args:
+        path: Path to the package
+        algorithm: Name of the hash algorithm to write
+        digests: Pairs of file name and hex digest of each algorithm
+        directory: Where to write the manifest instead of the directory
+            containing the package
+
+    Returns:
+        Returns the path to the manifest.
+
+    """
+    manifest_file = get_digest_manifest_path(path, algorithm, directory)
+    with open(manifest_file, "w", encoding="utf-8") as file_handle:
+        for filename, file_digests in digests:
+            file_handle.write(f"{file_digests[algorithm]} *{filename}\n")
+    return manifest_file
+
+
+def get_digest_manifest_path(
+        path: str,
+        algorithm: str,
+        directory: Optional[str] = None
+) -> str:
+    """Get where write_digest_manifest() writes a package's manifest.
+
+    Args:
+        path: Path to the package
+        algorithm: Name of the hash algorithm
+        directory: Directory of the manifests, if not the directory
+            containing the package
+
+    Returns:
+        Returns the path to the manifest.
+
+    """
+    package_path = os.path.normpath(path)
+    if directory is None:
+        directory = os.path.dirname(package_path)
+    return os.path.join(
+        directory, f"{os.path.basename(package_path)}.{algorithm}"
+    )
+
+
+def _calculate_hashes_if_exists(
+        file_path: str,
+        algorithms: Sequence[str]
+) -> Optional[Dict[str, str]]:
+    try:
+        if list(algorithms) == ["md5"]:
+            return {"md5": calculate_md5(filename=file_path)}
+        return hashing.calculate_hashes(file_path, algorithms)
+    except FileNotFoundError:
+        return None
+
+
+def _read_and_hash_if_exists(
+        file_path: str,
+        algorithms: Sequence[str],
+        content_handler: Callable[[bytes], None],
+        cached_digests: _Digests = None
+) -> Optional[Dict[str, str]]:
+    try:
+        with open(file_path, "rb") as file_handle:
+            content = file_handle.read()
+    except FileNotFoundError:
+        return None
+
+    digests = cached_digests
+    if digests is None:
+        hasher = hashing.MultiHash(algorithms)
+        hasher.update(content)
+        digests = hasher.hexdigests()
+    content_handler(content)
+    return digests
+
+
+def calculate_checksums(
+        path: str,
+        checksums: Iterable[Tuple[str, str]],
+        workers: int = 1,
+        max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT,
+        cache: Optional[fixity_cache.FixityCache] = None,
+        inventory: Optional[package.PackageInventory] = None,
+        algorithms: Sequence[str] = ("md5",),
+        content_handlers: Optional[_ContentHandlers] = None
+) -> Iterator[Tuple[str, str, Optional[Dict[str, str]]]]:
+    """Calculate the hash values of the files listed in a checksum report.
+
+    Args:
+        path: Directory containing the files
+        checksums: Pairs of expected hash value and file name
+        workers: Number of threads used to calculate checksums.
+        max_bytes_in_flight: Limits the total size of the files being hashed
+            at the same time when using more than one worker.
+        cache: Previously calculated hash values. Files that have not changed
+            since they were added to the cache are not read again.
+        inventory: Content of the package, used instead of asking the file
+            system for the size of each file.
+        algorithms: Names of the hashlib algorithms to calculate. Every
+            algorithm is calculated from the same read of the file.
+        content_handlers: Callbacks by file name. These files are read
+            whole, even if their hash values are cached, and the callback is
+            given the content once hashed. Callbacks run in the worker
+            threads, so they must be safe to call from any thread. Missing
+            files are not passed on.
+
+    Yields:
+        Yields a tuple, (expected hash value, file name, actual hash values),
+            in the same order as the checksums were given. The actual hash
+            values are a dictionary of hex digest by algorithm, or None if
+            the file is missing.
+
+    """
+    logger = logging.getLogger(__name__)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers) \
+        if workers > 1 else None
+
+    def start(filename: str,
+              cached_digests: _Digests = None
+              ) -> "concurrent.futures.Future[_Digests]":
+        file_path = os.path.join(path, filename)
+        task: Callable[[], _Digests]
+        if content_handlers is not None and filename in content_handlers:
+            task = functools.partial(
+                _read_and_hash_if_exists, file_path, algorithms,
+                content_handlers[filename], cached_digests
+            )
+        else:
+            task = functools.partial(
+                _calculate_hashes_if_exists, file_path, algorithms
+            )
+        if pool is not None:
+            return pool.submit(task)
+        return _completed(task())
+
+    in_flight: typing.Deque[
+        Tuple[str, str, Optional[os.stat_result],
+              "concurrent.futures.Future[_Digests]"]
+    ] = collections.deque()
+
+    def finish_oldest() -> Tuple[str, str, _Digests]:
+        md5_hash, filename, file_stat, future = in_flight.popleft()
+        file_digests = future.result()
+        if cache is not None and file_stat is not None and \
+                file_digests is not None:
+            for algorithm, digest in file_digests.items():
+                cache.set(os.path.join(path, filename), file_stat, digest,
+                          algorithm)
+        return md5_hash, filename, file_digests
+
+    max_queued = workers * 2 if pool is not None else 1
+    bytes_in_flight = 0
+    try:
+        for md5_hash, filename in checksums:
+            file_path = os.path.join(path, filename)
+            file_stat = _stat_file(path, filename, inventory)
+            read_content = content_handlers is not None and \
+                filename in content_handlers
+
+            cached_digests = None
+            if cache is not None and file_stat is not None:
+                cached_digests = cache.get_digests(
+                    file_path, file_stat, algorithms
+                )
+
+            file_size = 0 if cached_digests is not None and \
+                not read_content else _stat_size(file_stat)
+
+            # Keep the work queue short and wait for the oldest file before
+            # going over the byte limit so results come out in order.
+            while in_flight and (
+                    len(in_flight) >= max_queued or
+                    bytes_in_flight + file_size > max_bytes_in_flight):
+                bytes_in_flight -= _stat_size(in_flight[0][2])
+                yield finish_oldest()
+
+            if cached_digests is not None and not read_content:
+                logger.debug("Using cached md5 checksum for %s", filename)
+                in_flight.append(
+                    (md5_hash, filename, None, _completed(cached_digests))
+                )
+            elif inventory is not None and file_stat is None:
+                in_flight.append((md5_hash, filename, None, _completed(None)))
+            else:
+                if cached_digests is not None:
+                    logger.debug("Using cached md5 checksum for %s", filename)
+                else:
+                    logger.debug(
+                        "Calculating the md5 checksum hash for %s", filename
+                    )
+                in_flight.append(
+                    (md5_hash, filename, file_stat,
+                     start(filename, cached_digests))
+                )
+                bytes_in_flight += file_size
+
+        while in_flight:
+            yield finish_oldest()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.flush()
+
+
+def _stat_file(
+        path: str,
+        filename: str,
+        inventory: Optional[package.PackageInventory]
+) -> Optional[os.stat_result]:
+    if inventory is not None:
+        return inventory.stat(filename)
+    try:
+        return os.stat(os.path.join(path, filename))
+    except OSError:
+        return None
+
+
+def _stat_size(file_stat: Optional[os.stat_result]) -> int:
+    return file_stat.st_size if file_stat is not None else 0
+
+
+def _completed(
+        value: _Digests
+) -> "concurrent.futures.Future[_Digests]":
+    future: "concurrent.futures.Future[_Digests]" = \
+        concurrent.futures.Future()
+    future.set_result(value)
+    return future
 
 
 def extracts_checksums(report: str) -> Iterator[Tuple[str, str]]:
@@ -177,30 +532,61 @@ def extracts_checksums(report: str) -> Iterator[Tuple[str, str]]:
             yield md5, filename
 
 
-def find_errors_marc(filename: str) -> result.ResultSummary:
+def parse_xml_file(filename: str) -> etree._ElementTree:
+    """Parse a xml file.
+
+    The parser reads the bytes of the file as they are, so the content is
+    not decoded and copied before lxml sees it. The parser is reused for
+    every file parsed by the thread.
+
+    Args:
+        filename: Path to the xml file
+
+    Returns:
+        Returns the parsed document.
+
+    """
+    with open(filename, "rb") as file_handle:
+        return etree.parse(file_handle, schema.get_parser())
+
+
+def parse_xml_content(content: bytes, filename: str) -> etree._ElementTree:
+    """Parse the content of a xml file that has already been read.
+
+    Args:
+        content: Bytes of the xml file
+        filename: Path to the xml file, used in syntax error messages the
+            same way as parse_xml_file() does
+
+    Returns:
+        Returns the parsed document.
+
+    """
+    return etree.parse(
+        io.BytesIO(content), schema.get_parser(), base_url=filename
+    )
+
+
+def find_errors_marc(filename: str,
+                     content: Optional[bytes] = None) -> result.ResultSummary:
     """Validate the MARC file.
 
     Args:
         filename:
+        content: Bytes of the file if already read. The file is read if not
+            provided.
 
     Returns:
         Returns a ResultSummary
 
     """
     summary_builder = result.SummaryDirector(source=filename)
-    scheme = etree.XMLSchema(
-        etree.XML(
-            files(hathi_xsd)
-            .joinpath("MARC21slim.xsd")
-            .read_bytes()
-        )
-    )
+    scheme = schema.get_schema(schema.MARC_SCHEMA)
 
     try:
-        with open(filename, "r", encoding="utf8") as file_handle:
-            raw_data = file_handle.read()
-        doc = etree.fromstring(raw_data)
-        if not scheme.validate(doc):  # type: ignore
+        doc = parse_xml_file(filename) if content is None else \
+            parse_xml_content(content, filename)
+        if not scheme.validate(doc):
             summary_builder.add_error("Unable to validate")
     except FileNotFoundError:
         summary_builder.add_error("File missing")
@@ -242,17 +628,22 @@ class PageDataErrors(AbsErrorLocator):
     def __init__(self,
                  filename: str,
                  path: str,
-                 metadata: Dict[str, Any]) -> None:
+                 metadata: Dict[str, Any],
+                 inventory: Optional[package.PackageInventory] = None
+                 ) -> None:
         """Create new PageDataErrors object.
 
         Args:
             filename:
             path:
             metadata:
+            inventory: Content of the package. If provided, it is used
+                instead of checking the file system for each file.
         """
         super().__init__(metadata)
         self.filename = filename
         self.path = path
+        self.inventory = inventory
 
     def find_errors(self) -> Generator[str, None, None]:
         """Find errors as strings.
@@ -278,7 +669,12 @@ class PageDataErrors(AbsErrorLocator):
                 no errors found, returns None.
 
         """
-        if not os.path.exists(os.path.join(self.path, image_name)):
+        if self.inventory is not None:
+            exists = self.inventory.stat(image_name) is not None
+        else:
+            exists = os.path.exists(os.path.join(self.path, image_name))
+
+        if not exists:
             return f"The pagedata {self.filename} contains an " \
                    f"nonexistent file {image_name}"
 
@@ -348,7 +744,8 @@ class FindErrorsMetadata:
     def __init__(self,
                  filename: str,
                  path: str,
-                 require_page_data: bool = True
+                 require_page_data: bool = True,
+                 inventory: Optional[package.PackageInventory] = None
                  ) -> None:
         """Create new FindErrorsMetadata object.
 
@@ -356,16 +753,28 @@ class FindErrorsMetadata:
             filename:
             path:
             require_page_data:
+            inventory: Content of the package.
         """
         self.filename = filename
         self.path = path
         self.require_page_data = require_page_data
+        self.inventory = inventory
 
-    def find_errors(self) -> result.ResultSummary:
-        """Find all metadata errors."""
+    def find_errors(self,
+                    content: Optional[bytes] = None) -> result.ResultSummary:
+        """Find all metadata errors.
+
+        Args:
+            content: Bytes of the file if already read. The file is read if
+                not provided.
+
+        """
         summary_builder = result.SummaryDirector(source=self.filename)
         try:
-            yml_metadata = parse_yaml(filename=self.filename)
+            if content is None:
+                yml_metadata = parse_yaml(filename=self.filename)
+            else:
+                yml_metadata = yaml.load(content, Loader=yaml.SafeLoader)
 
             try:
                 capture_date_error_finder = CaptureDateErrors(yml_metadata)
@@ -378,7 +787,7 @@ class FindErrorsMetadata:
 
                 if self.require_page_data:
                     page_data_error_finder = PageDataErrors(
-                        self.filename, self.path, yml_metadata
+                        self.filename, self.path, yml_metadata, self.inventory
                     )
                     for error in page_data_error_finder.find_errors():
                         summary_builder.add_error(error)
@@ -399,7 +808,9 @@ class FindErrorsMetadata:
 def find_errors_meta(
         filename: str,
         path: str,
-        require_page_data: bool = True) -> result.ResultSummary:
+        require_page_data: bool = True,
+        inventory: Optional[package.PackageInventory] = None
+) -> result.ResultSummary:
     """Validate meta.yml file.
 
     Could also validate that the values are correct by comparing with the
@@ -409,109 +820,478 @@ def find_errors_meta(
         filename:
         path:
         require_page_data:
+        inventory: Content of the package.
 
     Yields: Error messages
 
     """
-    finder = FindErrorsMetadata(filename, path, require_page_data)
+    finder = FindErrorsMetadata(filename, path, require_page_data, inventory)
     return finder.find_errors()
 
 
-def find_errors_ocr(path: str) -> result.ResultSummary:
+def is_ocr_file(file_name: str) -> bool:
+    """Check if a file name is that of an ALTO OCR xml file."""
+    base, ext = os.path.splitext(file_name)
+    return ext.lower() == ".xml" and base.lower() != "marc"
+
+
+def find_errors_ocr(
+        path: str,
+        inventory: Optional[package.PackageInventory] = None
+) -> result.ResultSummary:
     """Validate all xml files located in the given path.
 
         Make sure they are valid to the alto scheme
 
     Args:
         path: Path to find the alto xml files
+        inventory: Content of the package. The path is scanned if not
+            provided.
 
     Returns:
         returns a ResultSummary of all the errors found in the alto ocr file.
 
     """
+    summary_builder = result.SummaryDirector(source=path)
+    for error in iter_errors_ocr(path, inventory):
+        summary_builder.add_result(error)
+    return summary_builder.construct()
 
-    def ocr_filter(entry: 'os.DirEntry[str]') -> bool:
-        if not entry.is_file():
-            return False
 
-        base, ext = os.path.splitext(entry.name)
-        if ext.lower() != ".xml":
-            return False
-        if base.lower() == "marc":
-            return False
+def iter_errors_ocr(
+        path: str,
+        inventory: Optional[package.PackageInventory] = None
+) -> Iterator[result.Result]:
+    """Validate all xml files located in the given path.
 
-        return True
+    Same as find_errors_ocr() but errors are yielded as soon as they are
+    found.
 
-    logger = logging.getLogger(__name__)
-    existing_xml_catalog_file: Optional[str] = None
+    Yields:
+        Yields an error result for each problem found in an alto ocr file.
 
+    """
+    xml_files: List[Tuple[str, str]]
+    if inventory is None:
+        xml_files = [
+            (entry.name, entry.path) for entry in os.scandir(path)
+            if entry.is_file() and is_ocr_file(entry.name)
+        ]
+    else:
+        xml_files = [
+            (file_name, inventory.get_path(file_name))
+            for file_name in inventory.files if is_ocr_file(file_name)
+        ]
+
+    for xml_file_name, xml_file_path in xml_files:
+        yield from _iter_errors_ocr_file(path, xml_file_name, xml_file_path)
+
+
+def _iter_errors_ocr_file(
+        path: str,
+        xml_file_name: str,
+        xml_file_path: str,
+        content: Optional[bytes] = None
+) -> Iterator[result.Result]:
+    logger = logging.getLogger(__name__)
+    alto_scheme = schema.get_schema(schema.ALTO_SCHEMA)
     try:
-        # This is because libxml2 no longer downloads xsd files automatically.
-        # This redirects it to use the xlink document included
-        with as_file(
-            files(hathi_validate).joinpath('catalog.xml')
-        ) as catalog_file:
-            os.environ['XML_CATALOG_FILES'] = str(catalog_file)
-            alto_scheme = etree.XMLSchema(
-                etree.XML(
-                    files(hathi_xsd).joinpath("alto.xsd").read_bytes()
+        doc = parse_xml_file(xml_file_path) if content is None else \
+            parse_xml_content(content, xml_file_path)
+
+        if not alto_scheme.validate(doc):
+            # Copy the log before yielding, in case the schema is used
+            # again before the errors are consumed
+            for error in list(alto_scheme.error_log):
+                yield result.create_error(
+                    path,
+                    f"{xml_file_name} does not validate to ALTO scheme. "
+                    f"Line: {error.line}, Column: {error.column}, "
+                    f"Reason: {error.message}"
                 )
-            )
-    finally:
-        if existing_xml_catalog_file is None:
-            os.environ.pop('XML_CATALOG_FILES', None)
         else:
-            os.environ['XML_CATALOG_FILES'] = existing_xml_catalog_file
+            logger.info("%s validates to the ALTO XML scheme", xml_file_name)
 
-    summary_builder = result.SummaryDirector(source=path)
-    for xml_file in filter(ocr_filter, os.scandir(path)):
-        try:
-            with open(xml_file.path, "r") as file_handle:
-                doc = etree.fromstring(file_handle.read().encode("utf-8"))
-
-            if not alto_scheme.validate(doc):
-                for error in alto_scheme.error_log:
-                    summary_builder.add_error(
-                        f"{xml_file.name} does not validate to ALTO scheme. "
-                        f"Line: {error.line}, Column: {error.column}, "
-                        f"Reason: {error.message}"
-                    )
+    except FileNotFoundError:
+        yield result.create_error(path, "File missing")
+    except etree.XMLSyntaxError as error:
+        yield result.create_error(path, "Syntax error: {}".format(error))
+
+
+class AbsContentCheck(abc.ABC):
+    """Check on the content of files that can share a single read.
+
+    Used by iter_errors_single_read() for checking files with the bytes
+    already read for their checksum, instead of reading them again.
+    """
+
+    @abc.abstractmethod
+    def get_files(self) -> List[str]:
+        """Get the files to check.
+
+        Returns:
+            Names of the files, relative to the package.
+
+        """
+
+    @abc.abstractmethod
+    def check_content(self,
+                      file_name: str,
+                      content: bytes) -> List[result.Result]:
+        """Check a file that has already been read.
+
+        Called from the threads calculating checksums, so it must be safe to
+        call from any thread.
+
+        Args:
+            file_name: Name of the file, relative to the package.
+            content: Bytes of the file.
+
+        Returns:
+            Any errors found in the file.
+
+        """
+
+    @abc.abstractmethod
+    def check_file(self, file_name: str) -> List[result.Result]:
+        """Check a file by reading it.
+
+        Used for the files that were not read for their checksum, such as
+        files missing from checksum.md5 or from the package.
+
+        Args:
+            file_name: Name of the file, relative to the package.
+
+        Returns:
+            Any errors found in the file.
+
+        """
+
+
+class MarcContentCheck(AbsContentCheck):
+    """Validate marc.xml against the MARC schema."""
+
+    def __init__(self, path: str) -> None:
+        """Create new MarcContentCheck object.
+
+        Args:
+            path: Path to the package
+        """
+        self.path = path
+
+    def get_files(self) -> List[str]:
+        """Get the files to check."""
+        return ["marc.xml"]
+
+    def check_content(self,
+                      file_name: str,
+                      content: bytes) -> List[result.Result]:
+        """Check a file that has already been read."""
+        return list(
+            find_errors_marc(os.path.join(self.path, file_name), content)
+        )
+
+    def check_file(self, file_name: str) -> List[result.Result]:
+        """Check a file by reading it."""
+        return list(find_errors_marc(os.path.join(self.path, file_name)))
+
+
+class MetadataContentCheck(AbsContentCheck):
+    """Validate the fields of meta.yml."""
+
+    def __init__(self,
+                 path: str,
+                 require_page_data: bool = True,
+                 inventory: Optional[package.PackageInventory] = None
+                 ) -> None:
+        """Create new MetadataContentCheck object.
+
+        Args:
+            path: Path to the package
+            require_page_data:
+            inventory: Content of the package.
+        """
+        self.path = path
+        self.require_page_data = require_page_data
+        self.inventory = inventory
+
+    def get_files(self) -> List[str]:
+        """Get the files to check."""
+        return ["meta.yml"]
+
+    def check_content(self,
+                      file_name: str,
+                      content: bytes) -> List[result.Result]:
+        """Check a file that has already been read."""
+        return list(self._get_finder(file_name).find_errors(content))
+
+    def check_file(self, file_name: str) -> List[result.Result]:
+        """Check a file by reading it."""
+        return list(self._get_finder(file_name).find_errors())
+
+    def _get_finder(self, file_name: str) -> "FindErrorsMetadata":
+        return FindErrorsMetadata(
+            os.path.join(self.path, file_name), self.path,
+            self.require_page_data, self.inventory
+        )
+
+
+class OcrContentCheck(AbsContentCheck):
+    """Validate the ALTO OCR xml files."""
+
+    def __init__(self,
+                 path: str,
+                 inventory: Optional[package.PackageInventory] = None
+                 ) -> None:
+        """Create new OcrContentCheck object.
+
+        Args:
+            path: Path to the package
+            inventory: Content of the package. The path is scanned if not
+                provided.
+        """
+        self.path = path
+        self.inventory = inventory
+
+    def get_files(self) -> List[str]:
+        """Get the files to check."""
+        if self.inventory is None:
+            return [
+                entry.name for entry in os.scandir(self.path)
+                if entry.is_file() and is_ocr_file(entry.name)
+            ]
+        return list(filter(is_ocr_file, self.inventory.files))
+
+    def check_content(self,
+                      file_name: str,
+                      content: bytes) -> List[result.Result]:
+        """Check a file that has already been read."""
+        return list(
+            _iter_errors_ocr_file(self.path, file_name,
+                                  self._get_path(file_name), content)
+        )
+
+    def check_file(self, file_name: str) -> List[result.Result]:
+        """Check a file by reading it."""
+        return list(
+            _iter_errors_ocr_file(self.path, file_name,
+                                  self._get_path(file_name))
+        )
+
+    def _get_path(self, file_name: str) -> str:
+        if self.inventory is not None:
+            return self.inventory.get_path(file_name)
+        return os.path.join(self.path, file_name)
+
+
+class Utf8ContentCheck(AbsContentCheck):
+    """Validate that the text files are utf-8 encoded."""
+
+    def __init__(self,
+                 path: str,
+                 inventory: Optional[package.PackageInventory] = None
+                 ) -> None:
+        """Create new Utf8ContentCheck object.
+
+        Args:
+            path: Path to the package
+            inventory: Content of the package. The path is scanned if not
+                provided.
+        """
+        self.path = path
+        self.inventory = inventory
+
+    def get_files(self) -> List[str]:
+        """Get the files to check."""
+        return [
+            file_name for file_name, _ in _list_text_files(
+                self.path, self.inventory
+            )
+        ]
+
+    def check_content(self,
+                      file_name: str,
+                      content: bytes) -> List[result.Result]:
+        """Check a file that has already been read."""
+        return list(
+            find_non_utf8_characters(os.path.join(self.path, file_name),
+                                     content)
+        )
+
+    def check_file(self, file_name: str) -> List[result.Result]:
+        """Check a file by reading it."""
+        return list(
+            find_non_utf8_characters(os.path.join(self.path, file_name))
+        )
+
+
+def iter_errors_single_read(
+        path: str,
+        report: str,
+        content_checks: Sequence[AbsContentCheck],
+        workers: int = 1,
+        max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT,
+        cache: Optional[fixity_cache.FixityCache] = None,
+        inventory: Optional[package.PackageInventory] = None,
+        extra_algorithms: Sequence[str] = (),
+        digest_manifest_dir: Optional[str] = None
+) -> Iterator[result.Result]:
+    """Validate the checksums and the content of files, reading each once.
+
+    Files listed in the checksum report are given to the content checks
+    with the bytes read for their checksum. Any other file the content
+    checks need is read afterwards.
+
+    The results are the same, and in the same order, as running
+    iter_failing_checksums() followed by each content check on its own. The
+    checksum errors are yielded as soon as they are found, the errors of
+    the content checks once every file has been read.
+
+    Args:
+        path: Path to the package
+        report: Path to the checksum report
+        content_checks: Checks to run on the content of the files
+        workers: Number of threads used to read the files.
+        max_bytes_in_flight: Limits the total size of the files being read
+            at the same time.
+        cache: Previously calculated hash values. Files needed by a content
+            check are read even if their hash values are cached.
+        inventory: Content of the package.
+        extra_algorithms: Other hash values to calculate, such as sha256.
+        digest_manifest_dir: Where to write the manifests of the extra
+            hash values.
+
+    Yields:
+        Yields an error result for each problem found.
+
+    """
+    check_files = [check.get_files() for check in content_checks]
+    checks_by_file: Dict[str, List[int]] = collections.defaultdict(list)
+    for index, file_names in enumerate(check_files):
+        for file_name in file_names:
+            checks_by_file[file_name].append(index)
+
+    found: Dict[Tuple[int, str], List[result.Result]] = {}
+
+    def check_content(file_name: str, content: bytes) -> None:
+        for index in checks_by_file[file_name]:
+            found[(index, file_name)] = \
+                content_checks[index].check_content(file_name, content)
+
+    yield from iter_failing_checksums(
+        path, report, workers, max_bytes_in_flight, cache, inventory,
+        extra_algorithms, digest_manifest_dir,
+        content_handlers={
+            file_name: functools.partial(check_content, file_name)
+            for file_name in checks_by_file
+        }
+    )
+
+    for index, (check, file_names) in enumerate(
+            zip(content_checks, check_files)):
+        for file_name in file_names:
+            if (index, file_name) in found:
+                yield from found[(index, file_name)]
             else:
-                logger.info(
-                    "%s validates to the ALTO XML scheme", xml_file.name
-                )
+                yield from check.check_file(file_name)
 
-        except FileNotFoundError:
-            summary_builder.add_error("File missing")
-        except etree.XMLSyntaxError as error:
-            summary_builder.add_error("Syntax error: {}".format(error))
-    return summary_builder.construct()
 
+def run_validations(validators: Iterable[validator.AbsValidator]) \
+        -> Iterator[result.Result]:
+    """Run validations.
 
-def run_validations(validators: typing.List[validator.AbsValidator]) \
-        -> List[result.Result]:
-    """Run validations."""
-    errors = []
-    for tester in validators:
-        tester.validate()
-        for error in tester.results:
-            errors.append(error)
+    Yields:
+        Yields the results of each validator as they are found.
 
-    return errors
+    """
+    for tester in validators:
+        yield from run_validation(tester)
 
 
 def run_validation(validation_test: validator.AbsValidator) \
-        -> List[result.Result]:
-    """Run validation."""
-    validation_test.validate()
-    return validation_test.results
+        -> Iterator[result.Result]:
+    """Run validation.
+
+    Yields:
+        Yields the results of the validator as they are found.
+
+    """
+    yield from validation_test.iter_results()
+
+
+def is_text_file(file_name: str) -> bool:
+    """Check if a file name is that of a plain text OCR file."""
+    return os.path.splitext(file_name)[1].lower() == ".txt"
+
+
+def is_utf8(content: bytes) -> bool:
+    """Check if the bytes given are valid utf-8."""
+    try:
+        codecs.utf_8_decode(content, "strict", True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def is_utf8_file(file_path: str,
+                 block_size: int = UTF8_BLOCK_SIZE) -> bool:
+    """Check if a file is valid utf-8.
 
+    The file is decoded a block at a time, so large files are not read into
+    memory all at once. A character split between two blocks is decoded
+    with the next block.
+
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes decoded at a time
+
+    Returns:
+        Returns True if the whole file is valid utf-8.
+
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="strict")
+    try:
+        with open(file_path, "rb") as file_handle:
+            for block in iter(
+                    functools.partial(file_handle.read, block_size), b""):
+                decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def find_non_utf8_characters(
+        file_path: str,
+        content: Optional[bytes] = None
+) -> result.ResultSummary:
+    """Locate any non utf-8 characters in a file.
+
+    Most files are valid, so the whole file is decoded in large blocks
+    first. The file is only read again line by line to locate the problems
+    if it is not valid.
+
+    Args:
+        file_path: Path to the file
+        content: Bytes of the file if already read. The file is read if not
+            provided.
+
+    Returns:
+        Returns a ResultSummary with an error for each line that is not
+            valid utf-8.
 
-def find_non_utf8_characters(file_path: str) -> result.ResultSummary:
-    """Locate any non utf-8 characters in a file."""
+    """
     result_builder = result.SummaryDirector(source=file_path)
-    with open(file_path, "rb") as file_handle:
+    if content is None:
+        valid = is_utf8_file(file_path)
+    else:
+        valid = is_utf8(content)
+    if valid:
+        return result_builder.construct()
 
+    file_handle: typing.BinaryIO = open(file_path, "rb") \
+        if content is None else io.BytesIO(content)
+    with file_handle:
         for line_num, line in enumerate(file_handle):
             try:
                 line.decode("utf-8", errors="strict")
@@ -522,3 +1302,65 @@ def find_non_utf8_characters(file_path: str) -> result.ResultSummary:
                 )
 
     return result_builder.construct()
+
+
+def iter_errors_utf8(
+        path: str,
+        inventory: Optional[package.PackageInventory] = None,
+        workers: int = 1
+) -> Iterator[result.Result]:
+    """Locate any non utf-8 characters in the text files of a package.
+
+    Args:
+        path: Path to the package
+        inventory: Content of the package. The path is scanned if not
+            provided.
+        workers: Number of files to check at the same time.
+
+    Yields:
+        Yields an error result for each line that is not valid utf-8, in the
+            same order as the files are listed, whatever the number of
+            workers.
+
+    """
+    file_paths = [
+        file_path for _, file_path in _list_text_files(path, inventory)
+    ]
+    if workers <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            yield from find_non_utf8_characters(file_path)
+        return
+
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    in_flight: typing.Deque[
+        "concurrent.futures.Future[result.ResultSummary]"
+    ] = collections.deque()
+    # Same limit as calculate_checksums() so a package with many text files
+    # doesn't have all of them queued at once.
+    max_queued = workers * 2
+    try:
+        for file_path in file_paths:
+            while len(in_flight) >= max_queued:
+                yield from in_flight.popleft().result()
+            in_flight.append(
+                pool.submit(find_non_utf8_characters, file_path)
+            )
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _list_text_files(
+        path: str,
+        inventory: Optional[package.PackageInventory]
+) -> List[Tuple[str, str]]:
+    if inventory is None:
+        return [
+            (entry.name, entry.path) for entry in os.scandir(path)
+            if entry.is_file() and is_text_file(entry.name)
+        ]
+    return [
+        (file_name, inventory.get_path(file_name))
+        for file_name in inventory.files if is_text_file(file_name)
+    ]
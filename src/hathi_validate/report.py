@@ -1,7 +1,11 @@
 """Report generations tools."""
 
 import abc
-from typing import Iterator, IO, List, Generator
+import csv
+import io
+import json
+from typing import Iterator, IO, List, Generator, Optional, Tuple, \
+    Iterable, Callable, Dict
 import itertools
 import sys
 import logging
@@ -60,13 +64,18 @@ def make_point(message: str, width: int) -> Iterator[str]:
 class ReportStringBuilder:
     """Builder for creating a string report."""
 
-    def __init__(self, results: List[result.Result]) -> None:
+    def __init__(self,
+                 results: List[result.Result],
+                 notes: Optional[List[str]] = None) -> None:
         """Create a new String ReportStringBuilder object.
 
         Args:
             results: Results of a validation
+            notes: Remarks about the validation itself, such as it being
+                stopped early, listed before the results.
         """
         self.results = results
+        self.notes = notes or []
         self.header = "Validation Results"
 
     def build_string(self, width: int = 0) -> str:
@@ -79,28 +88,51 @@ class ReportStringBuilder:
             Returns a multiline string based on the results given
 
         """
-        report_width = width if width > 0 else 80
+        buffer = io.StringIO()
+        self.write(buffer, width)
+        return buffer.getvalue()
 
-        sorted_results = sorted(
-            self.results,
-            key=lambda r: r.source if r.source is not None else ""
-        )
+    def write(self, sink: IO[str], width: int = 0) -> None:
+        """Write the report to a text stream.
 
-        grouped_results = []
-        for key, value in itertools.groupby(
-                sorted_results, key=lambda r: r.source):
+        Each group of results is written as soon as it is formatted, so the
+        complete report is never held in memory.
 
-            grouped_results.append((key, list(value)))
+        Args:
+            sink: Text stream such as a file or sys.stdout
+            width: length of each line in the report
 
-        warnings_section = self.get_warnings_section(grouped_results,
-                                                     report_width)
+        """
+        report_width = width if width > 0 else 80
 
         main_spacer = "=" * report_width
-        return f"{main_spacer}\n" \
-               f"{self.header}\n" \
-               f"{main_spacer}\n" \
-               f"{warnings_section}" \
-               f"{main_spacer}"
+        sink.write(f"{main_spacer}\n"
+                   f"{self.header}\n"
+                   f"{main_spacer}\n")
+        if self.notes:
+            for note in self.notes:
+                for line in make_point(note, report_width):
+                    sink.write("{}\n".format(line))
+            sink.write("\n{}\n".format("-" * report_width))
+        self.write_warnings_section(
+            self.iter_grouped_results(), report_width, sink
+        )
+        sink.write(main_spacer)
+
+    def iter_grouped_results(
+            self
+    ) -> Iterator[Tuple[Optional[str], Iterator[result.Result]]]:
+        """Iterate over the results, grouped by their source.
+
+        Yields:
+            Yields a tuple, (source, results of the source)
+
+        """
+        sorted_results = sorted(
+            self.results,
+            key=lambda r: r.source if r.source is not None else ""
+        )
+        yield from itertools.groupby(sorted_results, key=lambda r: r.source)
 
     def get_warnings_section(self, grouped_results, report_width: int) -> str:
         """Generate the section of the report containing the warnings.
@@ -114,21 +146,35 @@ class ReportStringBuilder:
             Returns the generated warnings section of the report as a string
 
         """
-        group_spacer = "-" * report_width
-        if len(grouped_results) == 0:
-            return "No validation errors detected.\n"
+        buffer = io.StringIO()
+        self.write_warnings_section(grouped_results, report_width, buffer)
+        return buffer.getvalue()
+
+    def write_warnings_section(self,
+                               grouped_results,
+                               report_width: int,
+                               sink: IO[str]) -> None:
+        """Write the section of the report containing the warnings.
+
+        Args:
+            grouped_results:
+            report_width:
+                Width of each line before a new line character is added.
+            sink: Text stream to write to
 
-        warning_groups = []
+        """
+        group_spacer = "-" * report_width
+        has_warnings = False
         for group_name, source_group in grouped_results:
-            warning_message = \
-                self.build_warning_message(
-                    group_name,
-                    source_group,
-                    report_width
-                )
-            warning_groups.append(warning_message)
+            if has_warnings:
+                sink.write("\n{}\n".format(group_spacer))
+            self.write_warning_message(
+                group_name, source_group, report_width, sink
+            )
+            has_warnings = True
 
-        return "\n{}\n".format(group_spacer).join(warning_groups)
+        if not has_warnings:
+            sink.write("No validation errors detected.\n")
 
     @staticmethod
     def build_warning_message(group_name: str,
@@ -146,13 +192,36 @@ class ReportStringBuilder:
             Returns a new warning message based on the results.
 
         """
-        msg_list = []
+        buffer = io.StringIO()
+        ReportStringBuilder.write_warning_message(
+            group_name, source_group, report_width, buffer
+        )
+        return buffer.getvalue()
+
+    @staticmethod
+    def write_warning_message(group_name: Optional[str],
+                              source_group: Iterable[result.Result],
+                              report_width: int,
+                              sink: IO[str]) -> None:
+        """Write the warning message for each result provided.
+
+        Args:
+            group_name:
+            source_group:
+            report_width:
+                Width of each line before a new line character is added.
+            sink: Text stream to write to
+
+        """
+        sink.write("{}\n\n".format(group_name))
+        first_line = True
         for msg in source_group:
-            # if width > 0:
             for line in make_point(msg.message, report_width):
-                msg_list.append(line)
-        group_warnings = "\n".join(msg_list)
-        return "{}\n\n{}\n".format(group_name, group_warnings)
+                if not first_line:
+                    sink.write("\n")
+                sink.write(line)
+                first_line = False
+        sink.write("\n")
 
 
 def get_report_as_str(results: List[result.Result], width: int = 0) -> str:
@@ -177,6 +246,150 @@ class AbsReporter(metaclass=abc.ABCMeta):
     def report(self, report: str) -> None:
         """Send report."""
 
+    def report_stream(self, writer: Callable[[IO[str]], None]) -> None:
+        """Send a report that is written piece by piece.
+
+        Reporters that can, write the report directly to their destination.
+        By default, the report is rendered as a string and sent to report().
+
+        Args:
+            writer: Writes the report to the text stream given to it.
+
+        """
+        buffer = io.StringIO()
+        writer(buffer)
+        self.report(buffer.getvalue())
+
+
+class AbsPackageReporter(metaclass=abc.ABCMeta):
+    """Base class for reporters receiving results one package at a time.
+
+    Unlike AbsReporter, nothing is rendered ahead of time. The results of a
+    package are sent as soon as the package has been validated.
+    """
+
+    def start(self) -> None:
+        """Prepare for receiving results."""
+
+    @abc.abstractmethod
+    def report_package(self,
+                       package: str,
+                       results: Iterable[result.Result]) -> None:
+        """Report the results of a single package.
+
+        Args:
+            package: Path to the package
+            results: Results found in the package
+
+        """
+
+    def finish(self) -> None:
+        """Finish the report after the last package."""
+
+
+class JsonLinesReporter(AbsPackageReporter):
+    """Write each result as a JSON object on its own line.
+
+    The objects have the package, type, source and message of the result.
+    Lines are written as each package is done, so the report can be read
+    while the batch is still being validated.
+    """
+
+    def __init__(self, sink: IO[str]) -> None:
+        """Create a new reporter object.
+
+        Args:
+            sink: Text stream such as a file or sys.stdout
+        """
+        self.sink = sink
+
+    def report_package(self,
+                       package: str,
+                       results: Iterable[result.Result]) -> None:
+        """Write the results of a single package.
+
+        Args:
+            package: Path to the package
+            results: Results found in the package
+
+        """
+        for package_result in results:
+            self.sink.write(
+                json.dumps({"package": package, **package_result.to_dict()})
+            )
+            self.sink.write("\n")
+        self.sink.flush()
+
+
+class CsvReporter(AbsPackageReporter):
+    """Write each result as a row of comma separated values.
+
+    The first row is a header naming the columns, package, source, type and
+    message. Rows are written as each package is done.
+    """
+
+    fields = ("package", "source", "type", "message")
+
+    def __init__(self, sink: IO[str]) -> None:
+        """Create a new reporter object.
+
+        Args:
+            sink: Text stream such as sys.stdout, or a file opened with
+                newline=""
+        """
+        self.sink = sink
+        self._writer = csv.DictWriter(sink, fieldnames=self.fields)
+
+    def start(self) -> None:
+        """Write the header row."""
+        self._writer.writeheader()
+
+    def report_package(self,
+                       package: str,
+                       results: Iterable[result.Result]) -> None:
+        """Write the results of a single package.
+
+        Args:
+            package: Path to the package
+            results: Results found in the package
+
+        """
+        for package_result in results:
+            self._writer.writerow(
+                {"package": package, **package_result.to_dict()}
+            )
+        self.sink.flush()
+
+
+PACKAGE_REPORT_FORMATS: Dict[
+    str, Callable[[IO[str]], AbsPackageReporter]
+] = {
+    "jsonl": JsonLinesReporter,
+    "csv": CsvReporter,
+}
+"""Reporters streaming each result, by the name of their format."""
+
+
+def get_package_reporter(report_format: str,
+                         sink: IO[str]) -> AbsPackageReporter:
+    """Get a reporter that streams the results in a format.
+
+    Args:
+        report_format: Name of the format, such as jsonl or csv
+        sink: Text stream to write to
+
+    Returns:
+        Returns a new reporter writing to the stream.
+
+    """
+    try:
+        reporter_type = PACKAGE_REPORT_FORMATS[report_format]
+    except KeyError:
+        raise ValueError(
+            "Unknown report format {}".format(report_format)
+        ) from None
+    return reporter_type(sink)
+
 
 class Reporter:
     """Reporter strategy context."""
@@ -198,6 +411,15 @@ class Reporter:
         """
         self._strategy.report(report)
 
+    def report_stream(self, writer: Callable[[IO[str]], None]) -> None:
+        """Report a report that is written piece by piece.
+
+        Args:
+            writer: Writes the report to the text stream given to it.
+
+        """
+        self._strategy.report_stream(writer)
+
 
 class ConsoleReporter(AbsReporter):
     """Report to console."""
@@ -220,6 +442,17 @@ class ConsoleReporter(AbsReporter):
         """
         print("\n\n{}".format(report), file=self.file)
 
+    def report_stream(self, writer: Callable[[IO[str]], None]) -> None:
+        """Write the report directly to the console.
+
+        Args:
+            writer: Writes the report to the text stream given to it.
+
+        """
+        self.file.write("\n\n")
+        writer(self.file)
+        self.file.write("\n")
+
 
 class FileOutputReporter(AbsReporter):
     """Report to file."""
@@ -243,6 +476,17 @@ class FileOutputReporter(AbsReporter):
         with open(self.filename, "w", encoding="utf8") as write_file:
             write_file.write("{}\n".format(report))
 
+    def report_stream(self, writer: Callable[[IO[str]], None]) -> None:
+        """Write the report directly to the file.
+
+        Args:
+            writer: Writes the report to the text stream given to it.
+
+        """
+        with open(self.filename, "w", encoding="utf8") as write_file:
+            writer(write_file)
+            write_file.write("\n")
+
 
 class LogReporter(AbsReporter):
     """Report to Python logger."""
@@ -1,15 +1,31 @@
 """Results of validations."""
 
 import abc
+import collections
+import enum
+import sys
 import typing
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List, Tuple, Union
 import collections.abc
 
 
+class ResultType(enum.Enum):
+    """Category of a result."""
+
+    ERROR = "error"
+
+
 class Result:
-    """Result of a validation."""
+    """Result of a validation.
+
+    A batch can have millions of results, so they are kept small. There is
+    no instance dictionary, the type is shared and the source, usually the
+    same path for many results, is interned.
+    """
+
+    __slots__ = ("_type", "_source", "message")
 
-    def __init__(self, result_type: str) -> None:
+    def __init__(self, result_type: Union[ResultType, str]) -> None:
         """Create a new result object.
 
         Result objects are not normally created directly.
@@ -18,10 +34,50 @@ class Result:
             result_type: Category of the result such as "error"
 
         """
-        self.result_type: str = result_type
-        self.source: Optional[str] = None
+        self._type: Union[ResultType, str] = ResultType.ERROR
+        self._source: Optional[str] = None
+        self.result_type = result_type  # type: ignore[assignment]
         self.message: str = ""
 
+    @property
+    def type(self) -> Union[ResultType, str]:
+        """Category of the result.
+
+        A ResultType, unless the result was created with a category that is
+        not one of them.
+        """
+        return self._type
+
+    @property
+    def result_type(self) -> str:
+        """Category of the result as a string, such as "error"."""
+        if isinstance(self._type, ResultType):
+            return self._type.value
+        return self._type
+
+    @result_type.setter
+    def result_type(self, value: Union[ResultType, str]) -> None:
+        if isinstance(value, ResultType):
+            self._type = value
+            return
+        try:
+            self._type = ResultType(value)
+        except ValueError:
+            self._type = _intern(value)
+
+    @property
+    def source(self) -> Optional[str]:
+        """Where the result was found, usually a file path."""
+        return self._source
+
+    @source.setter
+    def source(self, value: Optional[str]) -> None:
+        self._source = _intern(value)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, Optional[str], str]]:
+        """Pickle the result so the source is interned again on loading."""
+        return _restore_result, (self.result_type, self.source, self.message)
+
     def __str__(self) -> str:
         """Get validation string."""
         if self.source:
@@ -30,15 +86,152 @@ class Result:
             message = '"{}"'.format(self.message)
         return "{}[{}]{}".format(Result.__name__, self.result_type, message)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the result as a dictionary that can be saved as JSON."""
+        return {
+            "type": self.result_type,
+            "source": self.source,
+            "message": self.message,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Result":
+        """Create a result from a dictionary made by to_dict().
+
+        Args:
+            data: Dictionary with the type, source and message of the result
+
+        Returns:
+            Returns a new Result object.
+
+        """
+        new_result = cls(data["type"])
+        new_result.source = data["source"]
+        new_result.message = data["message"]
+        return new_result
+
+
+def _intern(value: Any) -> Any:
+    # Anything other than a plain string, such as a path object, is kept
+    # as it is
+    return sys.intern(value) if type(value) is str else value
+
+
+def _restore_result(result_type: str,
+                    source: Optional[str],
+                    message: str) -> Result:
+    restored = Result(result_type)
+    restored.source = source
+    restored.message = message
+    return restored
+
+
+class _ResultList(List[Result]):
+    """List of results that can tell quickly if it includes a result.
+
+    Every change to the list also updates a count of each result it holds,
+    so looking up a result does not scan the list. Results are compared by
+    identity, the same as a plain list does for them.
+    """
+
+    def __init__(self, results: Iterable[Result] = ()) -> None:
+        super().__init__(results)
+        self._counts: typing.Counter[Result] = collections.Counter(self)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[List[Result]]]:
+        return _ResultList, (list(self),)
+
+    def __contains__(self, item: object) -> bool:
+        try:
+            return item in self._counts
+        except TypeError:
+            # Not hashable, so not a result
+            return super().__contains__(item)
+
+    def _add(self, items: Iterable[Result]) -> None:
+        self._counts.update(items)
+
+    def _discard(self, items: Iterable[Result]) -> None:
+        for item in items:
+            self._counts[item] -= 1
+            if self._counts[item] <= 0:
+                del self._counts[item]
+
+    def append(self, item: Result) -> None:
+        super().append(item)
+        self._add([item])
+
+    def extend(self, items: Iterable[Result]) -> None:
+        items = list(items)
+        super().extend(items)
+        self._add(items)
+
+    def __iadd__(  # type: ignore[override,misc]
+            self, items: Iterable[Result], /
+    ) -> "_ResultList":
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: typing.SupportsIndex, /) -> "_ResultList":
+        super().__imul__(count)
+        self._counts = collections.Counter(self)
+        return self
+
+    def insert(self, index: typing.SupportsIndex, item: Result, /) -> None:
+        super().insert(index, item)
+        self._add([item])
+
+    def remove(self, item: Result) -> None:
+        super().remove(item)
+        self._discard([item])
+
+    def pop(self, index: typing.SupportsIndex = -1, /) -> Result:
+        item = super().pop(index)
+        self._discard([item])
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._counts.clear()
+
+    def __setitem__(self, index, value):  # type: ignore
+        if isinstance(index, slice):
+            removed = self[index]
+            value = list(value)
+        else:
+            removed = [self[index]]
+        super().__setitem__(index, value)
+        self._discard(removed)
+        self._add(value if isinstance(index, slice) else [value])
+
+    def __delitem__(self, index):  # type: ignore
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        self._discard(removed)
+
 
 class ResultSummary(collections.abc.Iterable):  # type: ignore
-    """Result summary."""
+    """Result summary.
+
+    The results are kept in a list, in the order added. The list keeps track
+    of the results it holds as it is changed, so checking if a result is
+    included does not scan it.
+    """
 
     def __init__(self) -> None:
         """Create a new ResultSummary object."""
-        self.results: List[Result] = []
+        self._results = _ResultList()
         self.source: Optional[str] = None
 
+    @property
+    def results(self) -> List[Result]:
+        """Results in the order they were added."""
+        return self._results
+
+    @results.setter
+    def results(self, value: Iterable[Result]) -> None:
+        self._results = _ResultList(value)
+
     def __iadd__(self, other: Result) -> "ResultSummary":
         """Add a result to the summary."""
         self.results.append(other)
@@ -54,7 +247,7 @@ class ResultSummary(collections.abc.Iterable):  # type: ignore
 
     def __contains__(self, item: Result) -> bool:
         """Check if existing Result is already included."""
-        return item in self.results
+        return item in self._results
 
 
 class AbsResultBuilder(metaclass=abc.ABCMeta):
@@ -149,11 +342,34 @@ class SummaryDirector:
             message: Contents of an error message.
 
         """
-        new_error = Result("error")
-        new_error.message = message
-        new_error.source = self.builder.source
-        self.builder.add_result(new_error)
+        self.builder.add_result(create_error(self.builder.source, message))
+
+    def add_result(self, new_result: Result) -> None:
+        """Add an existing result to the summary.
+
+        Args:
+            new_result: Result, such as one created by create_error()
+
+        """
+        self.builder.add_result(new_result)
 
     def construct(self) -> ResultSummary:
         """Construct and return a new ResultSummary."""
         return self.builder.get_summary()
+
+
+def create_error(source: Optional[str], message: str) -> Result:
+    """Create a new error result.
+
+    Args:
+        source: Usually a file path.
+        message: Contents of an error message.
+
+    Returns:
+        Returns a new Result object.
+
+    """
+    new_error = Result(ResultType.ERROR)
+    new_error.message = message
+    new_error.source = source
+    return new_error
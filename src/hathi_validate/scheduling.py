@@ -0,0 +1,130 @@
+"""Decide the order packages are started in when validated in parallel.
+
+Packages are started from the most to the least work, so a huge package is
+not left running alone at the end of the batch while the other workers sit
+idle. The work is estimated from a quick stat of each package: the bytes to
+hash, plus a fixed cost for each XML file to parse.
+"""
+
+import concurrent.futures
+import os
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+XML_FILE_COST = 256 * 1024
+"""Cost of parsing an XML file, counted as that many more bytes to hash."""
+
+ESTIMATE_THREADS = 8
+"""Number of packages stat'ed at the same time to estimate their cost."""
+
+
+def is_named(pkg: str, names: Iterable[str]) -> bool:
+    """Check if a package is one of the names given.
+
+    Args:
+        pkg: Path to the package
+        names: Names of package directories, such as 00000001, or paths
+
+    Returns:
+        Returns True if the name or path of the package is in names.
+
+    """
+    path = os.path.normpath(pkg)
+    return any(
+        os.path.normpath(name) in (path, os.path.basename(path))
+        for name in names
+    )
+
+
+def prioritize(packages: Iterable[str], names: Sequence[str]) -> List[str]:
+    """Move the named packages ahead of the others.
+
+    Args:
+        packages: Paths to the packages
+        names: Names of the packages to put first, in the order given
+
+    Returns:
+        Returns the named packages in the order of names, then the other
+            packages in their original order.
+
+    """
+    first: List[str] = []
+    rest: List[str] = []
+    for pkg in packages:
+        (first if is_named(pkg, names) else rest).append(pkg)
+    first.sort(key=lambda pkg: _get_name_index(pkg, names))
+    return first + rest
+
+
+def _get_name_index(pkg: str, names: Sequence[str]) -> int:
+    for index, name in enumerate(names):
+        if is_named(pkg, [name]):
+            return index
+    return len(names)
+
+
+def estimate_cost(pkg: str) -> int:
+    """Estimate the work of validating a package.
+
+    Args:
+        pkg: Path to the package
+
+    Returns:
+        Returns the bytes of the files at the top of the package, plus
+            XML_FILE_COST for each XML file. A package that cannot be read
+            counts as the files found before the error.
+
+    """
+    cost = 0
+    try:
+        with os.scandir(pkg) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                cost += entry.stat().st_size
+                if entry.name.lower().endswith(".xml"):
+                    cost += XML_FILE_COST
+    except OSError:
+        pass
+    return cost
+
+
+def estimate_costs(packages: Iterable[str],
+                   threads: int = ESTIMATE_THREADS) -> Dict[str, int]:
+    """Estimate the work of validating each package.
+
+    The packages are stat'ed from several threads, since on a network file
+    system most of the time is spent waiting for the server.
+
+    Args:
+        packages: Paths to the packages
+        threads: Number of packages stat'ed at the same time
+
+    Returns:
+        Returns the estimated cost of each package by its path.
+
+    """
+    packages = list(packages)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+        return dict(zip(packages, pool.map(estimate_cost, packages)))
+
+
+def order_largest_first(packages: Sequence[str],
+                        costs: Mapping[str, int],
+                        first: Sequence[str] = ()) -> List[str]:
+    """Order packages for starting them, the most work first.
+
+    Args:
+        packages: Paths to the packages
+        costs: Estimated cost of each package, such as from estimate_costs()
+        first: Packages to start before any other, in this order
+
+    Returns:
+        Returns the packages in the order to start them. Packages with the
+            same cost keep their original order.
+
+    """
+    first = [pkg for pkg in first if pkg in packages]
+    started = set(first)
+    rest = [pkg for pkg in packages if pkg not in started]
+    rest.sort(key=lambda pkg: costs.get(pkg, 0), reverse=True)
+    return first + rest
@@ -0,0 +1,156 @@
+"""Registry of the compiled XML schemas used for validating."""
+
+import threading
+from importlib.resources import files
+from typing import Dict, Optional
+
+from lxml import etree
+
+from hathi_validate import xsd as hathi_xsd
+
+MARC_SCHEMA = "MARC21slim.xsd"
+ALTO_SCHEMA = "alto.xsd"
+
+_compile_lock = threading.Lock()
+"""libxml2 cannot compile more than one schema at a time safely."""
+
+
+class BundledSchemaResolver(etree.Resolver):
+    """Resolve xsd imports to the copies bundled with this package.
+
+    libxml2 no longer downloads xsd files automatically, so any schema
+    imported by a bundled xsd, such as xlink.xsd, is served from the package
+    resources instead. The files are read once and kept in memory.
+    """
+
+    _lock = threading.Lock()
+    _cache: Dict[str, Optional[bytes]] = {}
+
+    def resolve(self, system_url, public_id, context):  # type: ignore
+        """Locate a xsd file bundled with this package.
+
+        Args:
+            system_url: Url or file name of the requested document.
+            public_id: Public id of the requested document.
+            context: lxml resolver context.
+
+        Returns:
+            Returns the bundled xsd if there is one, else returns None so that
+                lxml can fall back on the default behavior.
+
+        """
+        data = self.read_bundled_xsd(system_url.rsplit("/", 1)[-1])
+        if data is None:
+            return None
+        return self.resolve_string(data, context, base_url=system_url)
+
+    @classmethod
+    def read_bundled_xsd(cls, name: str) -> Optional[bytes]:
+        """Read the contents of a xsd file included in hathi_validate.xsd.
+
+        Args:
+            name: File name of the xsd file
+
+        Returns:
+            Returns the content of the file or None if there is no xsd file
+                with that name.
+
+        """
+        with cls._lock:
+            if name not in cls._cache:
+                resource = files(hathi_xsd).joinpath(name)
+                cls._cache[name] = \
+                    resource.read_bytes() \
+                    if name.endswith(".xsd") and resource.is_file() else None
+            return cls._cache[name]
+
+
+class SchemaRegistry:
+    """Compile the bundled xsd files on demand and keep them for reuse.
+
+    lxml XMLSchema and XMLParser objects are not safe to share between
+    threads, so each thread gets its own compiled copy of a schema and its
+    own parser. A schema is compiled the first time a thread asks for it,
+    one thread at a time.
+    """
+
+    def __init__(self) -> None:
+        """Create a new SchemaRegistry object."""
+        self._local = threading.local()
+
+    def get_schema(self, name: str) -> etree.XMLSchema:
+        """Get a compiled schema.
+
+        Args:
+            name: File name of a xsd file included in hathi_validate.xsd
+
+        Returns:
+            Compiled schema for use by the current thread.
+
+        """
+        schemas: Dict[str, etree.XMLSchema] = \
+            self._local.__dict__.setdefault("schemas", {})
+
+        schema = schemas.get(name)
+        if schema is None:
+            schema = self.compile_schema(name)
+            schemas[name] = schema
+        return schema
+
+    def get_parser(self) -> etree.XMLParser:
+        """Get a parser for reading the files to be validated.
+
+        Returns:
+            Parser for use by the current thread.
+
+        """
+        parser = self._local.__dict__.get("parser")
+        if parser is None:
+            parser = etree.XMLParser()
+            self._local.parser = parser
+        return parser
+
+    @staticmethod
+    def compile_schema(name: str) -> etree.XMLSchema:
+        """Compile a xsd file bundled with this package.
+
+        Args:
+            name: File name of a xsd file included in hathi_validate.xsd
+
+        Returns:
+            A newly compiled schema.
+
+        """
+        data = BundledSchemaResolver.read_bundled_xsd(name)
+        if data is None:
+            raise FileNotFoundError("No bundled schema named {}".format(name))
+        parser = etree.XMLParser()
+        parser.resolvers.add(BundledSchemaResolver())
+        with _compile_lock:
+            return etree.XMLSchema(etree.XML(data, parser, base_url=name))
+
+
+_registry = SchemaRegistry()
+
+
+def get_schema(name: str) -> etree.XMLSchema:
+    """Get a compiled schema from the registry shared by the process.
+
+    Args:
+        name: File name of a xsd file included in hathi_validate.xsd
+
+    Returns:
+        Compiled schema for use by the current thread.
+
+    """
+    return _registry.get_schema(name)
+
+
+def get_parser() -> etree.XMLParser:
+    """Get a parser from the registry shared by the process.
+
+    Returns:
+        Parser for use by the current thread.
+
+    """
+    return _registry.get_parser()
@@ -0,0 +1,286 @@
+"""Split a batch between several nodes and merge their results.
+
+Each package is given to a shard by a hash of its directory name, so every
+node agrees on the split without talking to the others, whatever order the
+file system lists the packages in. A node validating a shard saves a
+partial results file, and the partial files of every shard are merged into
+the usual manifest and validation reports.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from hathi_validate import manifest, result
+
+PARTIAL_RESULTS_VERSION = 1
+
+Shard = collections.namedtuple("Shard", ("index", "count"))
+"""Shard number, starting at 1, out of a number of shards."""
+
+PackageResult = collections.namedtuple(
+    "PackageResult",
+    ("package", "manifest", "results", "complete")
+)
+"""Manifest and results of a package saved in a partial results file."""
+
+MergedResults = collections.namedtuple(
+    "MergedResults",
+    ("manifest", "results", "notes")
+)
+"""Manifests, results and notes of every shard, merged."""
+
+
+def get_shard_index(pkg: str, count: int) -> int:
+    """Get the shard a package belongs to.
+
+    Only the name of the package directory is used, so nodes mounting the
+    batch at different paths still agree.
+
+    Args:
+        pkg: Path to the package
+        count: Number of shards
+
+    Returns:
+        Returns the shard number, from 1 to count.
+
+    """
+    name = os.path.basename(os.path.normpath(pkg))
+    digest = hashlib.sha256(
+        name.encode("utf-8", "surrogateescape")
+    ).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def is_in_shard(pkg: str, shard: Shard) -> bool:
+    """Check if a package is validated by a shard.
+
+    Args:
+        pkg: Path to the package
+        shard: Shard being validated
+
+    Returns:
+        Returns True if the package belongs to the shard.
+
+    """
+    return get_shard_index(pkg, shard.count) == shard.index
+
+
+def format_shard(shard: Shard) -> str:
+    """Format a shard the same way as the --shard option, such as 2/4."""
+    return "{}/{}".format(shard.index, shard.count)
+
+
+class PartialResults:
+    """Results of the packages validated by a single shard."""
+
+    def __init__(self,
+                 shard: Optional[Shard],
+                 settings: Dict[str, Any]) -> None:
+        """Create a new empty PartialResults object.
+
+        Args:
+            shard: Shard validated, or None if the whole batch was
+            settings: Options affecting the results, such as whether ocr
+                files are checked. Only results validated with the same
+                settings can be merged.
+
+        """
+        self.shard = shard
+        self.settings = settings
+        self.notes: List[str] = []
+        self.packages: List[PackageResult] = []
+
+    def add_package(self,
+                    pkg: str,
+                    package_manifest: manifest.PackageManifestBuilder,
+                    results: Iterable[result.Result],
+                    complete: bool = True) -> None:
+        """Add the results of a package.
+
+        Args:
+            pkg: Path to the package
+            package_manifest: Manifest of the package
+            results: Results found in the package
+            complete: False if the package was not completely validated
+
+        """
+        self.packages.append(
+            PackageResult(pkg, package_manifest, list(results), complete)
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "PartialResults":
+        """Read a partial results file.
+
+        Args:
+            filename: Path to the file
+
+        Raises:
+            ValueError: The file is not a partial results file this version
+                can read.
+
+        Returns:
+            Returns the results saved in the file.
+
+        """
+        with open(filename, "r", encoding="utf-8") as partial_file:
+            data = json.load(partial_file)
+
+        if not isinstance(data, dict) or \
+                data.get("version") != PARTIAL_RESULTS_VERSION:
+            raise ValueError(
+                "{} is not a partial results file, or was written by a "
+                "different version".format(filename)
+            )
+
+        shard = data.get("shard")
+        partial = cls(
+            Shard(shard["index"], shard["count"]) if shard else None,
+            data["settings"]
+        )
+        partial.notes = list(data.get("notes", []))
+        for package_data in data["packages"]:
+            partial.add_package(
+                package_data["package"],
+                manifest.PackageManifestBuilder.from_dict(
+                    package_data["manifest"]
+                ),
+                [result.Result.from_dict(item)
+                 for item in package_data["results"]],
+                package_data.get("complete", True)
+            )
+        return partial
+
+    def save(self, filename: str) -> None:
+        """Write the results to a file.
+
+        The file is replaced in one step, so an interrupted run does not
+        leave a partly written file behind.
+
+        Args:
+            filename: Path to the partial results file
+
+        """
+        data = {
+            "version": PARTIAL_RESULTS_VERSION,
+            "shard": self.shard._asdict() if self.shard else None,
+            "settings": self.settings,
+            "notes": self.notes,
+            "packages": [
+                {
+                    "package": package_result.package,
+                    "manifest": package_result.manifest.to_dict(),
+                    "results": [
+                        item.to_dict() for item in package_result.results
+                    ],
+                    "complete": package_result.complete,
+                }
+                for package_result in self.packages
+            ],
+        }
+        directory = os.path.dirname(os.path.abspath(filename))
+        file_handle, temp_name = tempfile.mkstemp(
+            dir=directory, prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_handle, "w", encoding="utf-8") as partial_file:
+                json.dump(data, partial_file)
+            os.replace(temp_name, filename)
+        except BaseException:
+            os.remove(temp_name)
+            raise
+
+
+def merge(partials: Iterable[PartialResults]) -> MergedResults:
+    """Merge the partial results of the shards of a batch.
+
+    The packages are listed in the order of their path. A shard without a
+    partial results file is noted in the merged report.
+
+    Args:
+        partials: Partial results of each shard
+
+    Raises:
+        ValueError: The partial results cannot be merged, such as when they
+            were validated with different settings or the same shard is
+            given twice.
+
+    Returns:
+        Returns the manifest, results and notes of the whole batch.
+
+    """
+    partials = list(partials)
+    if not partials:
+        raise ValueError("No partial results to merge")
+
+    _check_can_merge(partials)
+
+    notes: List[str] = []
+    # Either every partial result has a shard of the same count, or there is
+    # a single one without
+    found = {partial.shard for partial in partials if partial.shard}
+    if found:
+        count = next(iter(found)).count
+        missing = [
+            format_shard(Shard(index, count))
+            for index in range(1, count + 1)
+            if Shard(index, count) not in found
+        ]
+        if missing:
+            notes.append(
+                "This report is partial. No results were given for "
+                "shard {}.".format(", ".join(missing))
+            )
+
+    packages: Dict[str, PackageResult] = {}
+    for partial in partials:
+        label = "Shard {}: ".format(format_shard(partial.shard)) \
+            if partial.shard else ""
+        notes += [label + note for note in partial.notes]
+        for package_result in partial.packages:
+            if package_result.package in packages:
+                raise ValueError(
+                    "{} was validated more than once".format(
+                        package_result.package
+                    )
+                )
+            packages[package_result.package] = package_result
+
+    merged_manifest = []
+    merged_results = []
+    for pkg in sorted(packages):
+        merged_manifest.append(packages[pkg].manifest)
+        merged_results += packages[pkg].results
+    return MergedResults(merged_manifest, merged_results, notes)
+
+
+def _check_can_merge(partials: List[PartialResults]) -> None:
+    first = partials[0]
+    if first.shard is None and len(partials) > 1:
+        raise ValueError(
+            "Only partial results of a batch split into shards can be merged"
+        )
+    seen: Set[Shard] = set()
+    for partial in partials:
+        if partial.settings != first.settings:
+            raise ValueError(
+                "The partial results were validated with different settings"
+            )
+        if partial.shard is None or first.shard is None:
+            continue
+        if partial.shard.count != first.shard.count:
+            raise ValueError(
+                "The partial results were split into a different number of "
+                "shards"
+            )
+        if partial.shard in seen:
+            raise ValueError(
+                "More than one partial results file for shard {}".format(
+                    format_shard(partial.shard)
+                )
+            )
+        seen.add(partial.shard)
@@ -0,0 +1,101 @@
+"""Time spent by each validation check."""
+
+import collections
+import json
+from typing import IO, Any, Dict, Iterable, List
+
+CheckTiming = collections.namedtuple(
+    "CheckTiming",
+    ("check", "package", "seconds", "files", "bytes")
+)
+"""Time a check took on a single package, along with the files it read."""
+
+
+class TimingSummary:
+    """Collect the timings of every check run and summarize them per check."""
+
+    def __init__(self) -> None:
+        """Create a new empty TimingSummary object."""
+        self.timings: List[CheckTiming] = []
+
+    def add_timings(self, timings: Iterable[CheckTiming]) -> None:
+        """Add the timings of a package.
+
+        Args:
+            timings: Timings of the checks run on the package.
+
+        """
+        self.timings += timings
+
+    def get_breakdown(self) -> List[Dict[str, Any]]:
+        """Get the total time spent by each check.
+
+        Returns:
+            Returns a dictionary per check, slowest check first.
+
+        """
+        breakdown: Dict[str, Dict[str, Any]] = {}
+        for timing in self.timings:
+            check = breakdown.setdefault(timing.check, {
+                "check": timing.check,
+                "packages": 0,
+                "seconds": 0.0,
+                "files": 0,
+                "bytes": 0,
+                "slowest_package": None,
+                "slowest_package_seconds": 0.0,
+            })
+            check["packages"] += 1
+            check["seconds"] += timing.seconds
+            check["files"] += timing.files
+            check["bytes"] += timing.bytes
+            if timing.seconds >= check["slowest_package_seconds"]:
+                check["slowest_package"] = timing.package
+                check["slowest_package_seconds"] = timing.seconds
+        return sorted(
+            breakdown.values(), key=lambda check: check["seconds"],
+            reverse=True
+        )
+
+    def write_report(self, sink: IO[str], width: int = 80) -> None:
+        """Write the breakdown per check as a table.
+
+        Args:
+            sink: Text stream such as a file or sys.stdout
+            width: Width of the report in characters
+
+        """
+        breakdown = self.get_breakdown()
+        total_seconds = sum(check["seconds"] for check in breakdown)
+        sink.write("\n{}\n".format("=" * width))
+        sink.write("Timings\n")
+        sink.write("{}\n".format("=" * width))
+        sink.write("{:<30}{:>10}{:>8}{:>10}{:>10}{:>12}\n".format(
+            "Check", "Seconds", "%", "Files", "MB", "MB/s"))
+        for check in breakdown:
+            megabytes = check["bytes"] / 1024 ** 2
+            share = \
+                100 * check["seconds"] / total_seconds if total_seconds else 0
+            throughput = \
+                megabytes / check["seconds"] if check["seconds"] else 0
+            sink.write("{:<30}{:>10.3f}{:>8.1f}{:>10}{:>10.1f}{:>12.1f}\n"
+                       .format(check["check"], check["seconds"], share,
+                               check["files"], megabytes, throughput))
+        sink.write("{}\n".format("=" * width))
+
+    def write_json(self, sink: IO[str]) -> None:
+        """Write the breakdown per check and the timing of every package.
+
+        Args:
+            sink: Text stream such as a file
+
+        """
+        json.dump(
+            {
+                "checks": self.get_breakdown(),
+                "packages": [timing._asdict() for timing in self.timings],
+            },
+            sink,
+            indent=2
+        )
+        sink.write("\n")
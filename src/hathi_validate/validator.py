@@ -8,6 +8,8 @@ import os
 
 import re
 
+from . import fixity_cache
+from . import package
 from . import result
 from . import process
 
@@ -23,24 +25,45 @@ class AbsValidator(metaclass=abc.ABCMeta):
     def validate(self) -> None:
         """Perform validations."""
 
+    def iter_results(self) -> typing.Iterator[result.Result]:
+        """Perform validations, yielding results as they are found.
+
+        Validators that can find problems incrementally override this. By
+        default, the validation is run to completion and then the results
+        are yielded.
+
+        Yields:
+            Yields the results of the validation.
+
+        """
+        self.validate()
+        yield from self.results
+
 
 class ValidateMissingFiles(AbsValidator):
     """Validator for missing files."""
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+            self,
+            path: str,
+            inventory: typing.Optional[package.PackageInventory] = None
+    ) -> None:
         """Create new ValidateMissingFiles object.
 
         Args:
             path:
+            inventory: Content of the package.
         """
         super().__init__()
         self.path: str = path
+        self.inventory = inventory
 
     def validate(self) -> None:
         """Perform validations."""
         logger = logging.getLogger(__name__)
         logger.debug("Looking for missing files in %s", self.path)
-        for missing_file in process.find_missing_files(self.path):
+        for missing_file in process.find_missing_files(self.path,
+                                                       self.inventory):
             self.results.append(missing_file)
         # super().validate(path, *args, **kwargs)
 
@@ -48,10 +71,13 @@ class ValidateMissingFiles(AbsValidator):
 class ValidateComponents(AbsValidator):
     """Validator for components."""
 
-    def __init__(self,
-                 path: str,
-                 component_regex: str,
-                 *extensions: str) -> None:
+    def __init__(
+            self,
+            path: str,
+            component_regex: str,
+            *extensions: str,
+            inventory: typing.Optional[package.PackageInventory] = None
+    ) -> None:
         """Create a new ValidateComponents object.
 
         Args:
@@ -60,26 +86,36 @@ class ValidateComponents(AbsValidator):
                 names.
                 Note: this regex should ignore the extension
             *extensions: All the extensions to check for a given component
+            inventory: Content of the package. The path is scanned if not
+                provided.
         """
         super().__init__()
         self.path = path
+        self.inventory = inventory
         self.component_regex = component_regex
         self.extensions = extensions
         self._component_mask = re.compile(component_regex)
 
     def validate(self) -> None:
         """Perform validations."""
+        self.results = list(self.iter_results())
+
+    def iter_results(self) -> typing.Iterator[result.Result]:
+        """Perform validations, yielding missing components as found.
+
+        Yields:
+            Yields an error result for each missing component file.
+
+        """
         components = set()
         found_files = False
 
         logger = logging.getLogger(__name__)
-        report_builder = result.SummaryDirector(source=self.path)
-
-        for component_file in \
-                filter(self._component_filter, os.scandir(self.path)):
 
+        inventory = self.inventory or package.PackageInventory.scan(self.path)
+        for component_file_name in filter(self._is_component, inventory.files):
             found_files = True
-            components.add(os.path.splitext(component_file.name)[0])
+            components.add(os.path.splitext(component_file_name)[0])
 
         if not found_files:
             raise FileNotFoundError(
@@ -87,92 +123,150 @@ class ValidateComponents(AbsValidator):
             )
 
         for component in sorted(components):
-            # print(component)
             for extension in self.extensions:
                 component_file_name = f"{component}{extension}"
-                component_file_path = \
-                    os.path.join(self.path, component_file_name)
-
-                if not os.path.exists(component_file_path):
-                    report_builder.add_error(
-                        "Missing {}".format(component_file_name)
-                    )
 
+                if component_file_name not in inventory.files:
                     logger.info("Missing %s", component_file_name)
+                    yield result.create_error(
+                        self.path, "Missing {}".format(component_file_name)
+                    )
 
-        self.results = list(report_builder.construct())
-
-    def _component_filter(self, entry: os.DirEntry) -> bool:
-        if not entry.is_file():
-            return False
-
-        base, _ = os.path.splitext(entry.name)
+    def _is_component(self, file_name: str) -> bool:
+        base, _ = os.path.splitext(file_name)
         return bool(self._component_mask.fullmatch(base))
 
 
 class ValidateExtraSubdirectories(AbsValidator):
     """Validator for testing extra subdirectories in a package."""
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+            self,
+            path: str,
+            inventory: typing.Optional[package.PackageInventory] = None
+    ) -> None:
         """Create new ValidateExtraSubdirectories object.
 
         Args:
             path:
+            inventory: Content of the package.
         """
         super().__init__()
         self.path: str = path
+        self.inventory = inventory
 
     def validate(self) -> None:
         """Perform validations."""
-        for extra_subdirectory in process.find_extra_subdirectory(self.path):
+        for extra_subdirectory in process.find_extra_subdirectory(
+                self.path, self.inventory):
             self.results.append(extra_subdirectory)
 
 
 class ValidateChecksumReport(AbsValidator):
     """Validator for testing checksum report files."""
 
-    def __init__(self, path: str, checksum_report: str) -> None:
+    def __init__(
+            self,
+            path: str,
+            checksum_report: str,
+            workers: int = 1,
+            max_bytes_in_flight: typing.Optional[int] = None,
+            cache: typing.Optional[fixity_cache.FixityCache] = None,
+            inventory: typing.Optional[package.PackageInventory] = None,
+            extra_algorithms: typing.Sequence[str] = (),
+            digest_manifest_dir: typing.Optional[str] = None,
+            content_checks: typing.Sequence["process.AbsContentCheck"] = ()
+    ) -> None:
         """Create new ValidateChecksumReport object.
 
         Args:
             path:
             checksum_report:
+            workers: Number of threads used to calculate checksums.
+            max_bytes_in_flight: Limits the total size of the files being
+                hashed at the same time. Defaults to
+                process.DEFAULT_MAX_BYTES_IN_FLIGHT
+            cache: Previously calculated hash values.
+            inventory: Content of the package.
+            extra_algorithms: Other hash values to calculate while reading
+                the files, such as sha256.
+            digest_manifest_dir: Where to write the manifests of the extra
+                hash values.
+            content_checks: Checks to run on the content of the files read
+                for the checksums, so they are only read once.
         """
         super().__init__()
         self.path: str = path
         self.checksum_report = checksum_report
+        self.workers = workers
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.cache = cache
+        self.inventory = inventory
+        self.extra_algorithms = extra_algorithms
+        self.digest_manifest_dir = digest_manifest_dir
+        self.content_checks = content_checks
 
     def validate(self) -> None:
         """Perform validations."""
-        for failing_checksum in process.find_failing_checksums(
-                self.path, self.checksum_report):
+        self.results = list(self.iter_results())
+
+    def iter_results(self) -> typing.Iterator[result.Result]:
+        """Perform validations, yielding failing checksums as found.
 
-            self.results.append(failing_checksum)
+        Yields:
+            Yields an error result for each failing checksum, followed by
+                the errors of the content checks.
+
+        """
+        options: typing.Dict[str, typing.Any] = {
+            "workers": self.workers,
+            "max_bytes_in_flight": self.max_bytes_in_flight or
+            process.DEFAULT_MAX_BYTES_IN_FLIGHT,
+            "cache": self.cache,
+            "inventory": self.inventory,
+            "extra_algorithms": self.extra_algorithms,
+            "digest_manifest_dir": self.digest_manifest_dir,
+        }
+        if self.content_checks:
+            yield from process.iter_errors_single_read(
+                self.path, self.checksum_report, self.content_checks,
+                **options
+            )
+        else:
+            yield from process.iter_failing_checksums(
+                self.path, self.checksum_report, **options
+            )
 
 
 class ValidateMetaYML(AbsValidator):
     """Validator for testing meta.yml files."""
 
-    def __init__(self,
-                 yaml_file: str,
-                 path: str,
-                 required_page_data: bool) -> None:
+    def __init__(
+            self,
+            yaml_file: str,
+            path: str,
+            required_page_data: bool,
+            inventory: typing.Optional[package.PackageInventory] = None
+    ) -> None:
         """Create new ValidateMetaYML object.
 
         Args:
             yaml_file:
             path:
             required_page_data:
+            inventory: Content of the package.
         """
         super().__init__()
         self.yaml_file = yaml_file
         self.path = path
         self.require_page_data = required_page_data
+        self.inventory = inventory
 
     def validate(self) -> None:
         """Perform validations."""
         for error in process.find_errors_meta(
-                self.yaml_file, self.path, self.require_page_data):
+                self.yaml_file, self.path, self.require_page_data,
+                self.inventory):
 
             self.results.append(error)
 
@@ -200,19 +294,34 @@ class ValidateMarc(AbsValidator):
 class ValidateOCRFiles(AbsValidator):
     """Validator for testing OCR files."""
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+            self,
+            path: str,
+            inventory: typing.Optional[package.PackageInventory] = None
+    ) -> None:
         """Create new ValidateOCRFiles object.
 
         Args:
             path:
+            inventory: Content of the package.
         """
         super().__init__()
         self.path = path
+        self.inventory = inventory
 
     def validate(self) -> None:
         """Perform validations."""
-        for error in process.find_errors_ocr(path=self.path):
-            self.results.append(error)
+        self.results = list(self.iter_results())
+
+    def iter_results(self) -> typing.Iterator[result.Result]:
+        """Perform validations, yielding problems as found.
+
+        Yields:
+            Yields an error result for each problem in the OCR files.
+
+        """
+        yield from process.iter_errors_ocr(path=self.path,
+                                           inventory=self.inventory)
 
 
 class ValidateUTF8Files(AbsValidator):
@@ -231,3 +340,40 @@ class ValidateUTF8Files(AbsValidator):
         """Perform validations."""
         for error in process.find_non_utf8_characters(self.file_path):
             self.results.append(error)
+
+
+class ValidateUTF8TextFiles(AbsValidator):
+    """Validator for testing that the text files of a package are utf8."""
+
+    def __init__(
+            self,
+            path: str,
+            inventory: typing.Optional[package.PackageInventory] = None,
+            workers: int = 1
+    ) -> None:
+        """Create new ValidateUTF8TextFiles object.
+
+        Args:
+            path:
+            inventory: Content of the package.
+            workers: Number of files to check at the same time.
+        """
+        super().__init__()
+        self.path = path
+        self.inventory = inventory
+        self.workers = workers
+
+    def validate(self) -> None:
+        """Perform validations."""
+        self.results = list(self.iter_results())
+
+    def iter_results(self) -> typing.Iterator[result.Result]:
+        """Perform validations, yielding problems as found.
+
+        Yields:
+            Yields an error result for each line that is not utf8.
+
+        """
+        yield from process.iter_errors_utf8(
+            self.path, inventory=self.inventory, workers=self.workers
+        )
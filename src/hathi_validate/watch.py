@@ -0,0 +1,167 @@
+"""Find the packages added to a staging directory as they arrive.
+
+Polling is kept cheap so it can run every few seconds on a large root:
+
+* The root is only listed again when its modification time changes, which
+  happens whenever a package is added, removed or renamed.
+* A package already validated is only stat'ed. Its content is looked at
+  again only if the modification time of its directory changes, such as
+  when a file is added or replaced.
+* Only packages still waiting to be validated are scanned on every poll,
+  to tell when they stop changing.
+
+A file rewritten in place, without being replaced, does not change the
+directory and is not noticed once its package has been validated.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from hathi_validate import incremental, package
+
+DEFAULT_INTERVAL = 5.0
+"""Seconds between two polls of the root."""
+
+DEFAULT_QUIET_PERIOD = 60.0
+"""Seconds a package has to stay unchanged before it is validated."""
+
+MTIME_RESOLUTION_NS = 2 * 10 ** 9
+"""Coarsest resolution of directory modification times, such as on FAT."""
+
+
+class _WatchedPackage:
+    __slots__ = ("mtime_ns", "fingerprint", "changed_at", "validated")
+
+    def __init__(self) -> None:
+        # Modification time of the directory when the content was last
+        # scanned, if it can be trusted to change with the content
+        self.mtime_ns: Optional[int] = None
+        self.fingerprint: Optional[str] = None
+        self.changed_at = 0.0
+        # Fingerprint of the content when it was validated
+        self.validated: Optional[str] = None
+
+
+class PackageWatcher:
+    """Tell which packages in a directory are ready to be validated."""
+
+    def __init__(self,
+                 root: str,
+                 quiet_period: float = DEFAULT_QUIET_PERIOD,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Create a new PackageWatcher object.
+
+        Args:
+            root: Path to the directory the packages are added to
+            quiet_period: Seconds a package has to stay unchanged before it
+                is ready. The time is measured by this process, not taken
+                from the file system, so the clock of a file server does not
+                matter.
+            clock: Function returning the current time in seconds
+
+        """
+        self.root = root
+        self.quiet_period = quiet_period
+        self._clock = clock
+        self._root_mtime_ns: Optional[int] = None
+        self._packages: Dict[str, _WatchedPackage] = {}
+
+    @property
+    def packages(self) -> List[str]:
+        """Paths of the packages found in the root by the last poll."""
+        return sorted(self._packages)
+
+    def poll(self) -> List[str]:
+        """Look for packages that are new or changed and have stopped changing.
+
+        Returns:
+            Returns the paths of the packages to validate, in order.
+                Call set_validated() for each one once it is validated.
+
+        """
+        now = self._clock()
+        self._scan_root()
+        ready = []
+        for pkg in sorted(self._packages):
+            watched = self._packages[pkg]
+            try:
+                dir_stat = os.stat(pkg)
+            except FileNotFoundError:
+                del self._packages[pkg]
+                continue
+            if watched.validated is not None and \
+                    watched.mtime_ns == dir_stat.st_mtime_ns:
+                continue
+
+            watched.mtime_ns = _get_trusted_mtime(dir_stat)
+            fingerprint = _get_fingerprint(pkg)
+            if fingerprint is None:
+                del self._packages[pkg]
+                continue
+            if fingerprint != watched.fingerprint:
+                watched.fingerprint = fingerprint
+                watched.changed_at = now
+            if fingerprint != watched.validated and \
+                    now - watched.changed_at >= self.quiet_period:
+                ready.append(pkg)
+        return ready
+
+    def set_validated(self, pkg: str, fingerprint: Optional[str]) -> None:
+        """Record that a package was validated.
+
+        Args:
+            pkg: Path to the package, as returned by poll()
+            fingerprint: Fingerprint of the content that was validated. If
+                the package changed since it was found ready, it is ready
+                again once it is quiet.
+
+        """
+        watched = self._packages.get(pkg)
+        if watched is None:
+            return
+        watched.validated = fingerprint or watched.fingerprint
+        if watched.validated != watched.fingerprint:
+            watched.mtime_ns = None
+
+    def skip_existing(self) -> None:
+        """Treat the packages already in the root as validated.
+
+        Only packages added or changed afterwards are returned by poll().
+        """
+        self._scan_root()
+        for pkg in list(self._packages):
+            watched = self._packages[pkg]
+            try:
+                watched.mtime_ns = _get_trusted_mtime(os.stat(pkg))
+            except FileNotFoundError:
+                del self._packages[pkg]
+                continue
+            watched.fingerprint = watched.validated = _get_fingerprint(pkg)
+
+    def _scan_root(self) -> None:
+        root_stat = os.stat(self.root)
+        if self._root_mtime_ns is not None and \
+                self._root_mtime_ns == root_stat.st_mtime_ns:
+            return
+        self._root_mtime_ns = _get_trusted_mtime(root_stat)
+        found = set(package.get_dirs(self.root))
+        for pkg in found.difference(self._packages):
+            self._packages[pkg] = _WatchedPackage()
+        for pkg in set(self._packages).difference(found):
+            del self._packages[pkg]
+
+
+def _get_trusted_mtime(dir_stat: os.stat_result) -> Optional[int]:
+    # A change made in the same tick as the last one leaves the modification
+    # time as it is, so a time that recent cannot tell that nothing changed
+    if time.time_ns() - dir_stat.st_mtime_ns < MTIME_RESOLUTION_NS:
+        return None
+    return dir_stat.st_mtime_ns
+
+
+def _get_fingerprint(pkg: str) -> Optional[str]:
+    try:
+        return incremental.get_fingerprint(package.PackageInventory.scan(pkg))
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from hathi_validate import aio, cli
+
+
+@pytest.fixture()
+def sample_batch(tmpdir):
+    batch = tmpdir.mkdir("batch")
+    for package_number in range(5):
+        package_dir = batch.mkdir(str(package_number).zfill(8))
+        package_dir.join("00000001.jp2").ensure()
+    return batch.strpath
+
+
+def get_args(path):
+    return argparse.Namespace(path=path, check_ocr=False, fixity_cache=None)
+
+
+def test_iter_batch_matches_report_generator(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = get_args(sample_batch)
+
+    async def collect():
+        return [
+            package_results async for package_results in
+            aio.iter_batch(sample_batch, args=args, concurrency=2)
+        ]
+
+    async_results = asyncio.run(collect())
+    serial_results = list(
+        cli.ReportGenerator(args, logger).iter_package_results()
+    )
+
+    def messages(package_results):
+        return {
+            p.package: sorted(r.message for r in p.results)
+            for p in package_results
+        }
+
+    assert len(async_results) == 5
+    assert messages(async_results) == messages(serial_results)
+
+
+class SlowCheck(cli.AbsValidation):
+    started = threading.Event()
+    found = 0
+
+    def iter_errors(self, pkg, inventory=None):
+        SlowCheck.started.set()
+        for _ in range(1000):
+            time.sleep(0.01)
+            SlowCheck.found += 1
+            yield cli.result.create_error(pkg, "slow")
+
+
+def test_cancel_validate_package_stops_the_checks(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = get_args(sample_batch)
+
+    async def cancel_while_running():
+        task = asyncio.ensure_future(
+            aio.validate_package(sample_batch, [SlowCheck(args, logger)])
+        )
+        while not SlowCheck.started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_while_running())
+    found_at_cancel = SlowCheck.found
+    time.sleep(0.1)
+    assert SlowCheck.found <= found_at_cancel + 1
+    assert SlowCheck.found < 1000
+
+
+class CrashingCheck(cli.AbsValidation):
+    def iter_errors(self, pkg, inventory=None):
+        raise ValueError("Nope")
+
+
+def test_iter_batch_reports_crashed_packages(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = get_args(sample_batch)
+
+    async def collect():
+        return [
+            package_results async for package_results in aio.iter_batch(
+                sample_batch, [CrashingCheck(args, logger)]
+            )
+        ]
+
+    for package_results in asyncio.run(collect()):
+        assert len(package_results.results) == 1
+        assert "Unable to validate package" in \
+            package_results.results[0].message
@@ -1,11 +1,17 @@
 import argparse
+import collections
+import csv
+import json
+import os
 import logging
 import sys
+import threading
+import time
 from unittest.mock import Mock, MagicMock
 
 import pytest
 
-from hathi_validate import cli, process
+from hathi_validate import cli, configure_logging, process
 
 
 def test_version_exits_after_being_called(monkeypatch):
@@ -99,3 +105,589 @@ def test_validate_success_message(validator_type,included_message, monkeypatch):
     validator.get_errors("123")
     assert mylogger.info.called is True
     assert included_message in mylogger.info.call_args[0][0]
+
+
+class CrashingCheck(cli.AbsValidation):
+    def iter_errors(self, pkg, inventory=None):
+        if pkg.endswith("00000002"):
+            raise RuntimeError("spam")
+        yield from []
+
+
+class DyingCheck(cli.AbsValidation):
+    def iter_errors(self, pkg, inventory=None):
+        if pkg.endswith("00000002"):
+            os._exit(1)
+        yield from []
+
+
+@pytest.fixture()
+def sample_batch(tmpdir):
+    sample_dir = tmpdir / "mysample"
+    sample_dir.ensure_dir()
+    for sample_package_folder_name in [f"{str(x).zfill(8)}" for x in range(5)]:
+        sample_package_folder = (sample_dir / sample_package_folder_name).ensure_dir()
+        for f in range(4):
+            test_file = sample_package_folder / f"{str(f).zfill(8)}.jp2"
+            test_file.ensure()
+    return sample_dir.strpath
+
+
+def test_generate_report_with_workers_matches_serial(sample_batch):
+    logger = logging.getLogger(__name__)
+    reports = []
+    for workers in [1, 3]:
+        args = argparse.Namespace(
+            path=sample_batch,
+            check_ocr=False,
+            workers=workers
+        )
+        report_generator = cli.ReportGenerator(args=args, logger=logger)
+        report_generator.generate_report()
+        reports.append(
+            (report_generator.manifest_report,
+             report_generator.validation_report)
+        )
+    assert reports[0] == reports[1]
+
+
+def test_read_once_matches_separate_checks(sample_batch):
+    logger = logging.getLogger(__name__)
+    reports = []
+    for read_once in [False, True]:
+        args = argparse.Namespace(
+            path=sample_batch,
+            check_ocr=True,
+            read_once=read_once,
+            fixity_cache=None
+        )
+        report_generator = cli.ReportGenerator(args=args, logger=logger)
+        report_generator.generate_report()
+        reports.append(report_generator.validation_report)
+    assert reports[0] == reports[1]
+
+
+@pytest.mark.parametrize("check_type, workers", [
+    (CrashingCheck, 1),
+    (CrashingCheck, 2),
+    # A dying check would take the test process down without a pool
+    (DyingCheck, 2),
+])
+def test_crashed_worker_reported_against_package(sample_batch, check_type,
+                                                 workers):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(
+        path=sample_batch, check_ocr=False, workers=workers
+    )
+    report_generator = cli.ReportGenerator(
+        args=args,
+        logger=logger,
+        checks=[check_type(args, logger)]
+    )
+    package_results = list(report_generator.iter_package_results())
+    assert len(package_results) == 5
+    for package_result in package_results:
+        if package_result.package.endswith("00000002"):
+            assert len(package_result.results) == 1
+            assert "Unable to validate package" in \
+                package_result.results[0].message
+        else:
+            assert package_result.results == []
+
+
+class SlowThenDyingCheck(cli.AbsValidation):
+    def iter_errors(self, pkg, inventory=None):
+        name = os.path.basename(pkg)
+        with open(self._args.validation_log, "a") as log:
+            log.write(name + "\n")
+        if name == self._args.slow_package:
+            time.sleep(0.5)
+        elif name in self._args.dying_packages:
+            os._exit(1)
+        yield from []
+
+
+def test_dead_worker_only_reruns_packages_in_progress(sample_batch, tmpdir):
+    logger = logging.getLogger(__name__)
+    names = [
+        os.path.basename(pkg) for pkg in cli.package.get_dirs(sample_batch)
+    ]
+    validation_log = tmpdir / "validated.txt"
+    args = argparse.Namespace(
+        path=sample_batch, check_ocr=False, workers=2,
+        validation_log=validation_log.strpath,
+        slow_package=names[1],
+        dying_packages=[names[2], names[4]]
+    )
+    report_generator = cli.ReportGenerator(
+        args=args,
+        logger=logger,
+        checks=[SlowThenDyingCheck(args, logger)]
+    )
+    package_results = list(report_generator.iter_package_results())
+    assert [os.path.basename(r.package) for r in package_results] == names
+    assert [
+        os.path.basename(r.package) for r in package_results if r.results
+    ] == [names[2], names[4]]
+    # A package is run on its own at most once, if it was in progress when
+    # a worker died, and packages that finished are never run again
+    validated = collections.Counter(validation_log.read().splitlines())
+    assert max(validated.values()) <= 2
+    assert validated[names[0]] == 1
+
+
+def test_package_reporters_receive_each_package(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(path=sample_batch, check_ocr=False)
+    package_reporter = Mock()
+    report_generator = cli.ReportGenerator(
+        args=args,
+        logger=logger,
+        package_reporters=[package_reporter],
+        keep_results=False
+    )
+    report_generator.generate_report()
+    package_reporter.start.assert_called_once()
+    package_reporter.finish.assert_called_once()
+    assert package_reporter.report_package.call_count == 5
+    assert report_generator.results is None
+
+
+def test_generate_report_collects_timings(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(
+        path=sample_batch, check_ocr=False, show_timings=True
+    )
+    report_generator = cli.ReportGenerator(args=args, logger=logger)
+    report_generator.generate_report()
+    checks = {
+        check["check"]: check
+        for check in report_generator.timings.get_breakdown()
+    }
+    assert len(checks) == len(report_generator.checks)
+    assert all(check["packages"] == 5 for check in checks.values())
+
+
+def test_generate_report_timings_off_by_default(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(path=sample_batch, check_ocr=False)
+    report_generator = cli.ReportGenerator(args=args, logger=logger)
+    report_generator.generate_report()
+    assert report_generator.timings is None
+
+
+class CountingCheck(cli.AbsValidation):
+    calls = 0
+
+    def iter_errors(self, pkg, inventory=None):
+        CountingCheck.calls += 1
+        yield from process.find_missing_files(pkg, inventory)
+
+
+def test_state_file_skips_unchanged_packages(sample_batch, tmpdir):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(
+        path=sample_batch,
+        check_ocr=False,
+        state_file=tmpdir.join("state.json").strpath
+    )
+    CountingCheck.calls = 0
+    reports = []
+    for _ in range(2):
+        report_generator = cli.ReportGenerator(
+            args=args, logger=logger, checks=[CountingCheck(args, logger)]
+        )
+        report_generator.generate_report()
+        reports.append(report_generator.validation_report)
+    assert CountingCheck.calls == 5
+    assert reports[0] == reports[1]
+
+    with open(os.path.join(sample_batch, "00000003", "extra.jp2"), "w"):
+        pass
+    report_generator = cli.ReportGenerator(
+        args=args, logger=logger, checks=[CountingCheck(args, logger)]
+    )
+    report_generator.generate_report()
+    assert CountingCheck.calls == 6
+
+
+@pytest.mark.parametrize("limits,expected_errors,expected_packages", [
+    ({"fail_fast": True}, 3, 1),
+    ({"max_errors": 4}, 4, 2),
+    ({"max_errors": 4, "workers": 2}, 4, 2),
+    ({"max_errors_per_package": 1}, 5, 5),
+])
+def test_stopping_early(sample_batch, limits, expected_errors,
+                        expected_packages):
+    # Every package in the sample batch is missing the same 3 files
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(path=sample_batch, check_ocr=False, **limits)
+    report_generator = cli.ReportGenerator(
+        args=args,
+        logger=logger,
+        checks=[cli.ValidateMissingFiles(args, logger)]
+    )
+    report_generator.generate_report()
+    assert len(report_generator.results) == expected_errors
+    assert len(report_generator.manifest) == expected_packages
+    assert "Stopped" in report_generator.validation_report or \
+        "This report is partial" in report_generator.validation_report
+
+
+def test_complete_report_has_no_notes(sample_batch):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(path=sample_batch, check_ocr=False)
+    report_generator = cli.ReportGenerator(args=args, logger=logger)
+    report_generator.generate_report()
+    assert report_generator.notes == []
+
+
+@pytest.mark.parametrize("report_format", ["jsonl", "csv"])
+def test_main_streams_report_format(sample_batch, tmpdir, monkeypatch,
+                                    report_format):
+    monkeypatch.setattr(configure_logging, "configure_logger", Mock())
+    report_file = tmpdir / f"report.{report_format}"
+    cli.main([sample_batch, "--no-fixity-cache",
+              "--format", report_format,
+              "--save-report", report_file.strpath])
+    with open(report_file.strpath, newline="") as file_handle:
+        if report_format == "jsonl":
+            rows = [json.loads(line) for line in file_handle]
+        else:
+            rows = list(csv.DictReader(file_handle))
+    report_generator = cli.ReportGenerator(
+        args=cli.get_parser().parse_args([sample_batch, "--no-fixity-cache"]),
+        logger=logging.getLogger(__name__)
+    )
+    report_generator.generate_report()
+    assert [row["message"] for row in rows] == \
+        [error.message for error in report_generator.results]
+    assert set(rows[0]) == {"package", "source", "type", "message"}
+    assert {row["package"] for row in rows} == \
+        {os.path.join(sample_batch, f"{x:08d}") for x in range(5)}
+
+
+def test_merge_shards_matches_whole_batch(sample_batch, tmpdir, monkeypatch,
+                                          capsys):
+    monkeypatch.setattr(configure_logging, "configure_logger", Mock())
+    partial_files = []
+    for index in range(1, 4):
+        partial_file = (tmpdir / f"shard{index}.json").strpath
+        cli.main([sample_batch, "--no-fixity-cache",
+                  "--shard", f"{index}/3",
+                  "--partial-results", partial_file])
+        partial_files.append(partial_file)
+    whole_report = (tmpdir / "whole.txt").strpath
+    cli.main([sample_batch, "--no-fixity-cache", "--save-report", whole_report])
+    merged_report = (tmpdir / "merged.txt").strpath
+    cli.main(["merge", *partial_files, "--save-report", merged_report])
+    with open(whole_report) as whole, open(merged_report) as merged:
+        assert merged.read() == whole.read()
+
+
+def test_resume_matches_uninterrupted_run(sample_batch, tmpdir, monkeypatch):
+    monkeypatch.setattr(configure_logging, "configure_logger", Mock())
+    journal_file = (tmpdir / "journal.jsonl").strpath
+    whole_report = (tmpdir / "whole.txt").strpath
+    cli.main([sample_batch, "--no-fixity-cache", "--journal", journal_file,
+              "--save-report", whole_report])
+
+    # Interrupted while writing the fourth package
+    with open(journal_file) as journal_handle:
+        lines = journal_handle.readlines()
+    with open(journal_file, "w") as journal_handle:
+        journal_handle.writelines(lines[:4])
+        journal_handle.write(lines[4][:20])
+
+    validated = []
+    validate_package = cli.validate_package
+
+    def record_package(pkg, *args, **kwargs):
+        validated.append(os.path.basename(pkg))
+        return validate_package(pkg, *args, **kwargs)
+
+    monkeypatch.setattr(cli, "validate_package", record_package)
+    resumed_report = (tmpdir / "resumed.txt").strpath
+    cli.main([sample_batch, "--no-fixity-cache", "--resume", journal_file,
+              "--save-report", resumed_report])
+    journaled = {
+        os.path.basename(json.loads(line)["package"]) for line in lines[1:4]
+    }
+    assert len(validated) == 2
+    assert not journaled.intersection(validated)
+    with open(whole_report) as whole, open(resumed_report) as resumed:
+        assert resumed.read() == whole.read()
+
+
+def test_resume_refuses_journal_with_other_settings(sample_batch, tmpdir,
+                                                   monkeypatch):
+    monkeypatch.setattr(configure_logging, "configure_logger", Mock())
+    journal_file = (tmpdir / "journal.jsonl").strpath
+    cli.main([sample_batch, "--no-fixity-cache", "--journal", journal_file])
+    with pytest.raises(SystemExit):
+        cli.main([sample_batch, "--no-fixity-cache", "--check_ocr",
+                  "--resume", journal_file])
+
+
+def test_watch_appends_results_of_new_packages(sample_batch, tmpdir,
+                                               monkeypatch):
+    monkeypatch.setattr(configure_logging, "configure_logger", Mock())
+    stop_event = threading.Event()
+    validated = []
+    validate_package = cli.validate_package
+
+    def record_package(pkg, *args, **kwargs):
+        validated.append(pkg)
+        if len(validated) == 5:
+            stop_event.set()
+        return validate_package(pkg, *args, **kwargs)
+
+    monkeypatch.setattr(cli, "validate_package", record_package)
+    rolling_report = (tmpdir / "rolling.jsonl").strpath
+    cli.watch_main([sample_batch, "--quiet-period", "0", "--interval", "0",
+                    "--no-fixity-cache", "--report", rolling_report],
+                   stop_event=stop_event)
+
+    assert sorted(validated) == \
+        [os.path.join(sample_batch, f"{x:08d}") for x in range(5)]
+    with open(rolling_report) as report_file:
+        rows = [json.loads(line) for line in report_file]
+    assert {row["package"] for row in rows} == set(validated)
+
+
+def test_build_package_manifest_keeps_counts_and_sizes(tmpdir):
+    package_dir = tmpdir / "00000001"
+    package_dir.ensure_dir()
+    (package_dir / "00000001.jp2").write("x" * 10)
+    (package_dir / "00000002.jp2").write("x" * 20)
+    package_manifest = cli.build_package_manifest(package_dir.strpath)
+    assert package_manifest.counts_only
+    assert package_manifest.counts == {".jp2": 2}
+    assert package_manifest.sizes == {".jp2": 30}
+
+
+def test_priority_packages_are_reported_first(sample_batch):
+    logger = logging.getLogger(__name__)
+    reports = []
+    for workers in [1, 2]:
+        args = argparse.Namespace(
+            path=sample_batch,
+            check_ocr=False,
+            workers=workers,
+            priority=["00000004", "00000002"]
+        )
+        report_generator = cli.ReportGenerator(args=args, logger=logger)
+        report_generator.generate_report()
+        reports.append(report_generator.manifest_report)
+        assert [item.source for item in report_generator.manifest[:2]] == [
+            os.path.join(sample_batch, "00000004"),
+            os.path.join(sample_batch, "00000002"),
+        ]
+    assert reports[0] == reports[1]
+
+
+def test_largest_first_schedule_keeps_report_order(sample_batch,
+                                                   monkeypatch):
+    logger = logging.getLogger(__name__)
+    # Make the last package found the largest one
+    last_package = list(cli.package.get_dirs(sample_batch))[-1]
+    with open(os.path.join(last_package, "big.jp2"), "w") as big_file:
+        big_file.write("x" * 1000)
+    started = []
+    get_start_order = cli.ReportGenerator._get_start_order
+
+    def record_start_order(self, packages, costs):
+        order = get_start_order(self, packages, costs)
+        started.append(order)
+        return order
+
+    monkeypatch.setattr(cli.ReportGenerator, "_get_start_order",
+                        record_start_order)
+    reports = []
+    for schedule in ["found", "largest-first"]:
+        args = argparse.Namespace(
+            path=sample_batch,
+            check_ocr=False,
+            workers=2,
+            schedule=schedule
+        )
+        report_generator = cli.ReportGenerator(args=args, logger=logger)
+        report_generator.generate_report()
+        reports.append(
+            (report_generator.manifest_report,
+             report_generator.validation_report)
+        )
+    assert started[0][-1] == last_package
+    assert started[1][0] == last_package
+    assert reports[0] == reports[1]
+
+
+def test_fixity_cache_is_off_by_default(sample_batch, tmpdir):
+    parser = cli.get_parser()
+    assert parser.parse_args([sample_batch]).fixity_cache is None
+    cache_file = (tmpdir / "fixity.sqlite").strpath
+    assert parser.parse_args(
+        [sample_batch, "--fixity-cache", cache_file]
+    ).fixity_cache == cache_file
+
+
+def test_report_notes_checksums_taken_from_fixity_cache(tmpdir):
+    package_dir = tmpdir / "batch" / "00000001"
+    package_dir.ensure_dir()
+    (package_dir / "00000001.jp2").write("spam")
+    with open((package_dir / "checksum.md5").strpath, "w") as checksums:
+        checksums.write("{} *00000001.jp2\n".format(
+            process.calculate_md5((package_dir / "00000001.jp2").strpath)
+        ))
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(
+        path=(tmpdir / "batch").strpath,
+        check_ocr=False,
+        fixity_cache=(tmpdir / "fixity.sqlite").strpath
+    )
+    notes = []
+    for _ in range(2):
+        report_generator = cli.ReportGenerator(
+            args=args,
+            logger=logger,
+            checks=[cli.ValidateChecksums(args, logger)]
+        )
+        report_generator.generate_report()
+        notes.append(report_generator.notes)
+    assert notes[0] == []
+    assert len(notes[1]) == 1
+    assert "checksums of 1 file(s) were taken from the fixity cache" in \
+        notes[1][0]
+
+
+@pytest.mark.parametrize("batch_option", [
+    ["--workers", "2"],
+    ["--state-file", "state.json"],
+    ["--journal", "journal.jsonl"],
+    ["--save-report", "report.txt"],
+    ["--fail-fast"],
+])
+def test_watch_rejects_batch_options(sample_batch, batch_option, capsys):
+    with pytest.raises(SystemExit):
+        cli.watch_main([sample_batch, "--no-fixity-cache", *batch_option])
+    assert "{} cannot be used with watch".format(batch_option[0]) in \
+        capsys.readouterr().err
+
+
+def test_journal_skips_packages_cut_short(sample_batch, tmpdir):
+    logger = logging.getLogger(__name__)
+    journal_file = (tmpdir / "journal.jsonl").strpath
+    args = argparse.Namespace(
+        path=sample_batch,
+        check_ocr=False,
+        journal=journal_file,
+        max_errors_per_package=1
+    )
+    report_generator = cli.ReportGenerator(args=args, logger=logger)
+    report_generator.generate_report()
+    with open(journal_file) as journal_handle:
+        entries = [json.loads(line) for line in journal_handle][1:]
+    # Every package of the sample batch has more than one error
+    assert len(report_generator.notes) == 5
+    assert entries == []
+
+
+class FlakyCheck(cli.AbsValidation):
+    crash = True
+    validated = []
+
+    def iter_errors(self, pkg, inventory=None):
+        self.validated.append(os.path.basename(pkg))
+        if self.crash and pkg.endswith("00000002"):
+            raise OSError("Stale file handle")
+        yield from []
+
+
+def test_resume_validates_crashed_package_again(sample_batch, tmpdir):
+    logger = logging.getLogger(__name__)
+    journal_file = (tmpdir / "journal.jsonl").strpath
+    FlakyCheck.crash = True
+    args = argparse.Namespace(
+        path=sample_batch, check_ocr=False, journal=journal_file
+    )
+    report_generator = cli.ReportGenerator(
+        args=args, logger=logger, checks=[FlakyCheck(args, logger)]
+    )
+    report_generator.generate_report()
+    assert [r.message for r in report_generator.results] == \
+        ["Unable to validate package. Reason: Stale file handle"]
+
+    FlakyCheck.crash = False
+    FlakyCheck.validated = []
+    args = argparse.Namespace(
+        path=sample_batch, check_ocr=False, resume=journal_file
+    )
+    report_generator = cli.ReportGenerator(
+        args=args, logger=logger, checks=[FlakyCheck(args, logger)]
+    )
+    report_generator.generate_report()
+    assert FlakyCheck.validated == ["00000002"]
+    assert len(report_generator.results) == 0
+
+
+class LastPackageCheck(cli.AbsValidation):
+    last_package = None
+
+    def iter_errors(self, pkg, inventory=None):
+        if pkg == self.last_package:
+            yield from [cli.result.create_error(pkg, "Spam")] * 3
+
+
+@pytest.mark.parametrize("limits", [
+    {"fail_fast": True},
+    {"max_errors": 3},
+])
+def test_stopping_at_last_package_is_not_partial(sample_batch, limits):
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(path=sample_batch, check_ocr=False, **limits)
+    LastPackageCheck.last_package = \
+        list(cli.package.get_dirs(sample_batch))[-1]
+    report_generator = cli.ReportGenerator(
+        args=args,
+        logger=logger,
+        checks=[LastPackageCheck(args, logger)]
+    )
+    report_generator.generate_report()
+    assert len(report_generator.manifest) == 5
+    assert report_generator.notes == []
+
+
+def test_extra_digests_require_manifest_dir(sample_batch, capsys):
+    with pytest.raises(SystemExit):
+        cli.main([sample_batch, "--extra-digests", "sha256"])
+    assert "--extra-digests requires --digest-manifest-dir" in \
+        capsys.readouterr().err
+
+
+def test_state_file_rewrites_missing_digest_manifests(tmpdir):
+    package_dir = tmpdir / "batch" / "00000001"
+    package_dir.ensure_dir()
+    (package_dir / "00000001.jp2").write("spam")
+    with open((package_dir / "checksum.md5").strpath, "w") as checksums:
+        checksums.write("{} *00000001.jp2\n".format(
+            process.calculate_md5((package_dir / "00000001.jp2").strpath)
+        ))
+    manifest_dir = tmpdir.mkdir("manifests")
+    logger = logging.getLogger(__name__)
+    args = argparse.Namespace(
+        path=(tmpdir / "batch").strpath,
+        check_ocr=False,
+        extra_digests=["sha256"],
+        digest_manifest_dir=manifest_dir.strpath,
+        state_file=(tmpdir / "state.json").strpath
+    )
+    manifest = manifest_dir / "00000001.sha256"
+    for _ in range(2):
+        report_generator = cli.ReportGenerator(
+            args=args,
+            logger=logger,
+            checks=[cli.ValidateChecksums(args, logger)]
+        )
+        report_generator.generate_report()
+        assert manifest.check()
+        manifest.remove()
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+
+import pytest
+
+from hathi_validate import fixity_cache, hashing, process
+
+
+@pytest.fixture()
+def cache(tmpdir):
+    fixity = fixity_cache.FixityCache((tmpdir / "fixity.sqlite").strpath)
+    yield fixity
+    fixity.close()
+
+
+@pytest.fixture()
+def sample_file(tmpdir):
+    sample = tmpdir / "00000001.txt"
+    sample.write("spam")
+    return sample.strpath
+
+
+def test_get_returns_stored_value(cache, sample_file):
+    cache.set(sample_file, os.stat(sample_file), "abc")
+    assert cache.get(sample_file, os.stat(sample_file)) == "abc"
+
+
+def test_get_ignores_changed_file(cache, sample_file):
+    cache.set(sample_file, os.stat(sample_file), "abc")
+    with open(sample_file, "a") as file_handle:
+        file_handle.write("eggs")
+    assert cache.get(sample_file, os.stat(sample_file)) is None
+
+
+def test_get_is_per_algorithm(cache, sample_file):
+    cache.set(sample_file, os.stat(sample_file), "abc")
+    assert cache.get(sample_file, os.stat(sample_file), "sha256") is None
+
+
+def test_get_digests_needs_every_algorithm_and_counts_files(cache,
+                                                            sample_file):
+    file_stat = os.stat(sample_file)
+    cache.set(sample_file, file_stat, "abc")
+    before = fixity_cache.get_files_from_cache()
+    assert cache.get_digests(sample_file, file_stat, ["md5", "sha256"]) \
+        is None
+    assert cache.get_digests(sample_file, file_stat, ["md5"]) == \
+        {"md5": "abc"}
+    assert fixity_cache.get_files_from_cache() - before == 1
+
+
+def _set_in_other_process(database, file_path):
+    cache = fixity_cache.FixityCache(database)
+    cache.set(file_path, os.stat(file_path), "def", "sha256")
+    cache.close()
+
+
+def test_other_process_can_write_while_cache_in_use(cache, sample_file):
+    cache.set(sample_file, os.stat(sample_file), "abc")
+    cache.flush()
+    # Leave a lookup and a new value unwritten, as in the middle of a package
+    assert cache.get(sample_file, os.stat(sample_file)) == "abc"
+    cache.set(sample_file, os.stat(sample_file), "abc", "sha1")
+
+    other = multiprocessing.get_context("spawn").Process(
+        target=_set_in_other_process, args=(cache.database, sample_file)
+    )
+    other.start()
+    other.join(10)
+    if other.is_alive():
+        other.terminate()
+        other.join()
+    assert other.exitcode == 0
+    assert cache.get(sample_file, os.stat(sample_file), "sha256") == "def"
+    assert cache.get(sample_file, os.stat(sample_file), "sha1") == "abc"
+
+
+def test_evict_oldest(tmpdir, sample_file):
+    cache = fixity_cache.FixityCache(
+        (tmpdir / "fixity.sqlite").strpath, max_entries=2
+    )
+    for i in range(5):
+        cache.set(f"{sample_file}{i}", os.stat(sample_file), str(i))
+    cache.flush()
+    assert len(cache) == 2
+    assert cache.get(f"{sample_file}4", os.stat(sample_file)) == "4"
+    cache.close()
+
+
+def test_find_failing_checksums_uses_cache(tmpdir, cache, sample_file,
+                                           monkeypatch):
+    report = tmpdir / "checksum.md5"
+    report.write(f"{process.calculate_md5(sample_file)} *00000001.txt\n")
+    assert len(process.find_failing_checksums(
+        tmpdir.strpath, report.strpath, cache=cache)) == 0
+
+    def fail(*_, **__):
+        raise AssertionError("File should not have been read again")
+
+    monkeypatch.setattr(process, "calculate_md5", fail)
+    assert len(process.find_failing_checksums(
+        tmpdir.strpath, report.strpath, cache=cache)) == 0
+
+
+def test_extra_digests_come_from_cache(tmpdir, cache, sample_file,
+                                       monkeypatch):
+    report = tmpdir / "checksum.md5"
+    report.write(f"{process.calculate_md5(sample_file)} *00000001.txt\n")
+    process.find_failing_checksums(
+        tmpdir.strpath, report.strpath, cache=cache,
+        extra_algorithms=["sha256"], digest_manifest_dir=tmpdir.strpath
+    )
+
+    def fail(*_, **__):
+        raise AssertionError("File should not have been read again")
+
+    monkeypatch.setattr(hashing, "calculate_hashes", fail)
+    process.find_failing_checksums(
+        tmpdir.strpath, report.strpath, cache=cache,
+        extra_algorithms=["sha256"], digest_manifest_dir=tmpdir.strpath
+    )
+    manifest = tmpdir / f"{os.path.basename(tmpdir.strpath)}.sha256"
+    assert manifest.read().startswith(
+        fixity_cache.FixityCache.get(
+            cache, sample_file, os.stat(sample_file), "sha256"
+        )
+    )
+
+
+def test_get_cache_reused_in_same_thread(tmpdir):
+    database = (tmpdir / "fixity.sqlite").strpath
+    assert fixity_cache.get_cache(database) is \
+        fixity_cache.get_cache(database)
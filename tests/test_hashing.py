@@ -0,0 +1,51 @@
+import hashlib
+
+import pytest
+
+from hathi_validate import hashing, process
+
+strategies = [
+    hashing.ReadIntoStrategy(),
+    hashing.ReadIntoStrategy(block_size=7),
+    hashing.MmapStrategy(),
+]
+if hasattr(hashlib, "file_digest"):
+    strategies.append(hashing.FileDigestStrategy())
+
+
+@pytest.mark.parametrize("strategy", strategies)
+@pytest.mark.parametrize("data", [b"", b"spam", bytes(range(256)) * 100])
+def test_strategies_match_hashlib(tmpdir, strategy, data):
+    sample_file = tmpdir / "sample.bin"
+    sample_file.write_binary(data)
+    assert hashing.calculate_hash(sample_file.strpath, "md5", strategy) == \
+        hashlib.md5(data).hexdigest()
+
+
+@pytest.mark.parametrize("strategy", strategies)
+def test_calculate_hashes_match_hashlib(tmpdir, strategy):
+    data = bytes(range(256)) * 100
+    sample_file = tmpdir / "sample.bin"
+    sample_file.write_binary(data)
+    assert hashing.calculate_hashes(
+        sample_file.strpath, ["md5", "sha1", "sha256"], strategy
+    ) == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+@pytest.mark.parametrize("file_size, expected_strategy", [
+    (0, hashing.ReadIntoStrategy),
+    (hashing.MMAP_THRESHOLD, hashing.MmapStrategy),
+])
+def test_choose_strategy(file_size, expected_strategy):
+    assert isinstance(hashing.choose_strategy(file_size), expected_strategy)
+
+
+def test_calculate_md5_with_chunk_size(tmpdir):
+    sample_file = tmpdir / "sample.txt"
+    sample_file.write_binary(b"eggs" * 1000)
+    assert process.calculate_md5(sample_file.strpath, chunk_size=10) == \
+        hashlib.md5(b"eggs" * 1000).hexdigest()
@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+from hathi_validate import incremental, package, result
+
+
+@pytest.fixture()
+def sample_package(tmpdir):
+    package_dir = tmpdir.mkdir("00000001")
+    package_dir.join("00000001.jp2").write_binary(b"jp2")
+    package_dir.join("00000001.txt").write("text")
+    return package_dir.strpath
+
+
+def fingerprint(path):
+    return incremental.get_fingerprint(package.PackageInventory.scan(path))
+
+
+def test_fingerprint_unchanged(sample_package):
+    assert fingerprint(sample_package) == fingerprint(sample_package)
+
+
+def test_fingerprint_changes_with_size(sample_package):
+    before = fingerprint(sample_package)
+    with open(os.path.join(sample_package, "00000001.txt"), "a") as f:
+        f.write("more text")
+    assert fingerprint(sample_package) != before
+
+
+def test_fingerprint_changes_with_new_file(sample_package):
+    before = fingerprint(sample_package)
+    with open(os.path.join(sample_package, "00000002.jp2"), "wb"):
+        pass
+    assert fingerprint(sample_package) != before
+
+
+def test_state_round_trip(tmpdir):
+    state_file = tmpdir.join("state.json").strpath
+    settings = {"check_ocr": False}
+    state = incremental.ValidationState(settings)
+    state.update("pkg", "abc", [result.create_error("pkg", "Missing file")])
+    state.save(state_file)
+
+    loaded = incremental.ValidationState.load(state_file, settings)
+    package_state = loaded.get("pkg")
+    assert package_state.fingerprint == "abc"
+    assert package_state.results[0].message == "Missing file"
+
+
+def test_state_with_other_settings_ignored(tmpdir):
+    state_file = tmpdir.join("state.json").strpath
+    state = incremental.ValidationState({"check_ocr": False})
+    state.update("pkg", "abc", [])
+    state.save(state_file)
+
+    loaded = incremental.ValidationState.load(state_file, {"check_ocr": True})
+    assert loaded.get("pkg") is None
+
+
+def test_state_missing_or_corrupt_file(tmpdir):
+    state_file = tmpdir.join("state.json")
+    assert incremental.ValidationState.load(state_file.strpath, {}).packages == {}
+    state_file.write("{not json")
+    assert incremental.ValidationState.load(state_file.strpath, {}).packages == {}
@@ -0,0 +1,61 @@
+import pytest
+
+from hathi_validate import journal, manifest, result
+
+SETTINGS = {"check_ocr": False}
+
+
+def add_package(journal_writer, pkg, complete=True):
+    package_manifest = manifest.PackageManifestBuilder(pkg)
+    package_manifest.add_file("00000001.jp2")
+    journal_writer.add_package(
+        pkg, package_manifest, [result.create_error(pkg, "Missing")],
+        complete, "fingerprint"
+    )
+
+
+def test_journal_round_trip(tmpdir):
+    journal_file = tmpdir.join("journal.jsonl").strpath
+    with journal.JournalWriter(journal_file, "/batch", SETTINGS) as writer:
+        add_package(writer, "/batch/00000001")
+        add_package(writer, "/batch/00000002", complete=False)
+
+    entries = journal.load_journal(journal_file, "/batch", SETTINGS)
+    assert sorted(entries) == ["/batch/00000001", "/batch/00000002"]
+    entry = entries["/batch/00000002"]
+    assert entry.manifest.files == {".jp2": {"00000001.jp2"}}
+    assert [r.message for r in entry.results] == ["Missing"]
+    assert entry.complete is False
+    assert entry.fingerprint == "fingerprint"
+
+
+def test_missing_journal_has_no_packages(tmpdir):
+    journal_file = tmpdir.join("journal.jsonl").strpath
+    assert journal.load_journal(journal_file, "/batch", SETTINGS) == {}
+
+
+def test_resume_skips_unfinished_line_and_appends(tmpdir):
+    journal_file = tmpdir.join("journal.jsonl").strpath
+    with journal.JournalWriter(journal_file, "/batch", SETTINGS) as writer:
+        add_package(writer, "/batch/00000001")
+    with open(journal_file, "a") as journal_handle:
+        journal_handle.write('{"package": "/batch/000')
+
+    with journal.JournalWriter(journal_file, "/batch", SETTINGS,
+                               resume=True) as writer:
+        add_package(writer, "/batch/00000002")
+
+    entries = journal.load_journal(journal_file, "/batch", SETTINGS)
+    assert sorted(entries) == ["/batch/00000001", "/batch/00000002"]
+
+
+@pytest.mark.parametrize("path, settings", [
+    ("/other_batch", SETTINGS),
+    ("/batch", {"check_ocr": True}),
+])
+def test_journal_of_another_run_is_refused(tmpdir, path, settings):
+    journal_file = tmpdir.join("journal.jsonl").strpath
+    with journal.JournalWriter(journal_file, "/batch", SETTINGS) as writer:
+        add_package(writer, "/batch/00000001")
+    with pytest.raises(journal.JournalError):
+        journal.load_journal(journal_file, path, settings)
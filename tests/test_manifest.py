@@ -0,0 +1,74 @@
+import pytest
+
+from hathi_validate import manifest
+
+
+def test_counts_only_manifest_keeps_counts_and_sizes():
+    package_manifest = manifest.PackageManifestBuilder(
+        "/batch/00000001", counts_only=True
+    )
+    package_manifest.add_file("00000001.jp2", 1000)
+    package_manifest.add_file("00000002.jp2", 2000)
+    package_manifest.add_file("meta.yml", 100)
+    assert package_manifest.counts == {".jp2": 2, ".yml": 1}
+    assert package_manifest.sizes == {".jp2": 3000, ".yml": 100}
+    with pytest.raises(ValueError):
+        package_manifest.files
+
+
+def test_size_is_unknown_if_any_file_has_no_size():
+    package_manifest = manifest.PackageManifestBuilder("/batch/00000001")
+    package_manifest.add_file("00000001.txt", 10)
+    package_manifest.add_file("00000002.txt")
+    assert package_manifest.sizes == {".txt": None}
+    report = manifest.get_report_as_str([package_manifest], width=80)
+    assert " * .txt: 2 file(s)\n" in report
+
+
+def test_report_shows_known_sizes():
+    package_manifest = manifest.PackageManifestBuilder(
+        "/batch/00000001", counts_only=True
+    )
+    package_manifest.add_file("00000001.jp2", 3 * 1024 * 1024 // 2)
+    package_manifest.add_file("meta.yml", 112)
+    lines = manifest.get_report_as_str([package_manifest], width=80)\
+        .split("\n")
+    assert lines[5:7] == [
+        " * .jp2: 1 file(s), 1.5 MB",
+        " * .yml: 1 file(s), 112 bytes",
+    ]
+
+
+@pytest.mark.parametrize("counts_only", [True, False])
+def test_manifest_round_trip(counts_only):
+    package_manifest = manifest.PackageManifestBuilder(
+        "/batch/00000001", counts_only=counts_only
+    )
+    package_manifest.add_file("00000001.jp2", 1000)
+    package_manifest.add_file("00000001.txt")
+    loaded = manifest.PackageManifestBuilder.from_dict(
+        package_manifest.to_dict()
+    )
+    assert loaded.counts_only == counts_only
+    assert loaded.counts == package_manifest.counts
+    assert loaded.sizes == package_manifest.sizes
+
+
+def test_manifest_from_dict_with_only_file_names():
+    loaded = manifest.PackageManifestBuilder.from_dict({
+        "source": "/batch/00000001",
+        "files": {".jp2": ["00000001.jp2", "00000002.jp2"]},
+    })
+    assert loaded.counts == {".jp2": 2}
+    assert loaded.sizes == {".jp2": None}
+
+
+@pytest.mark.parametrize("size, expected", [
+    (0, "0 bytes"),
+    (1023, "1023 bytes"),
+    (1024, "1.0 KB"),
+    (5 * 1024 ** 3, "5.0 GB"),
+    (2 * 1024 ** 4, "2.0 TB"),
+])
+def test_format_size(size, expected):
+    assert manifest.format_size(size) == expected
@@ -139,3 +139,45 @@ def test_get_folders(sample_hathi_package_folder):
 
     for x in package.get_dirs(WINDOWS_ROOT):
         assert x in expected_paths
+
+
+@pytest.fixture()
+def package_dir(tmpdir):
+    package_path = tmpdir / "7213857"
+    package_path.ensure_dir()
+    for name in ["00000001.jp2", "00000001.txt", "00000002.jp2",
+                 "checksum.md5", "marc.xml", "meta.yml"]:
+        (package_path / name).write("spam")
+    (package_path / "extra").ensure_dir()
+    (package_path / "extra" / "notes.txt").write("eggs")
+    return package_path.strpath
+
+
+def test_inventory_scan(package_dir):
+    inventory = package.PackageInventory.scan(package_dir)
+    assert inventory.directories == ["extra"]
+    assert inventory.nested_files == ["notes.txt"]
+    assert inventory.files["00000001.jp2"].st_size == 4
+    assert inventory.exists("marc.xml")
+    assert inventory.exists("extra")
+    assert inventory.stat("00000003.jp2") is None
+    assert inventory.stat("extra/notes.txt").st_size == 4
+
+
+def test_validations_use_inventory_only(package_dir, monkeypatch):
+    from hathi_validate import process, validator
+    inventory = package.PackageInventory.scan(package_dir)
+
+    def no_file_system(*_):
+        raise AssertionError("The file system should not be used")
+
+    monkeypatch.setattr(os, "scandir", no_file_system)
+    monkeypatch.setattr(os.path, "exists", no_file_system)
+
+    assert len(process.find_missing_files(package_dir, inventory)) == 0
+    assert len(process.find_extra_subdirectory(package_dir, inventory)) == 1
+    components = validator.ValidateComponents(
+        package_dir, r"^\d{8}$", ".jp2", ".txt", inventory=inventory
+    )
+    components.validate()
+    assert [r.message for r in components.results] == ["Missing 00000002.txt"]
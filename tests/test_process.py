@@ -1,7 +1,10 @@
+import hashlib
 import os
+import time
 from unittest.mock import Mock, MagicMock, mock_open, patch
 
 import pytest
+from lxml import etree
 import shutil
 from hathi_validate import process
 
@@ -271,6 +274,109 @@ def test_find_failing_checksums(checksum_file):
     # TODO: FINISH test_find_failing_checksums
 
 
+@pytest.fixture()
+def package_with_bad_checksums(tmpdir):
+    package_dir = tmpdir.mkdir("package")
+    checksum_lines = []
+    for i in range(20):
+        name = f"{str(i + 1).zfill(8)}.txt"
+        package_dir.join(name).write(f"page {i}")
+        md5_hash = process.calculate_md5(package_dir.join(name).strpath)
+        if i % 7 == 0:
+            md5_hash = "0" * 32
+        checksum_lines.append(f"{md5_hash} *{name}")
+    checksum_lines.insert(5, f"{'1' * 32} *00000099.txt")
+    package_dir.join("checksum.md5").write("\n".join(checksum_lines))
+    return package_dir.strpath
+
+
+@pytest.mark.parametrize("workers,max_bytes_in_flight", [(4, 1024), (4, 1)])
+def test_find_failing_checksums_concurrent_matches_serial(
+        package_with_bad_checksums, workers, max_bytes_in_flight):
+    report = os.path.join(package_with_bad_checksums, "checksum.md5")
+    serial = process.find_failing_checksums(package_with_bad_checksums, report)
+    concurrent = process.find_failing_checksums(
+        package_with_bad_checksums, report,
+        workers=workers,
+        max_bytes_in_flight=max_bytes_in_flight
+    )
+    assert len(serial) == 4
+    assert [r.message for r in concurrent] == [r.message for r in serial]
+    assert "missing file, 00000099.txt" in serial.results[1].message
+
+
+def test_find_failing_checksums_writes_extra_digests(
+        package_with_bad_checksums, tmpdir):
+    report = os.path.join(package_with_bad_checksums, "checksum.md5")
+    manifest_dir = tmpdir.mkdir("manifests")
+    errors = process.find_failing_checksums(
+        package_with_bad_checksums, report,
+        extra_algorithms=["sha256"],
+        digest_manifest_dir=manifest_dir.strpath
+    )
+    assert len(errors) == 4
+    lines = manifest_dir.join("package.sha256").read().splitlines()
+    # Only the 17 files that exist and match are included
+    assert len(lines) == 17
+    digest, file_name = lines[0].split(" *")
+    with open(os.path.join(package_with_bad_checksums, file_name), "rb") as f:
+        assert digest == hashlib.sha256(f.read()).hexdigest()
+
+
+def test_find_failing_checksums_reports_unwritable_manifest(
+        package_with_bad_checksums, tmpdir):
+    report = os.path.join(package_with_bad_checksums, "checksum.md5")
+    errors = process.find_failing_checksums(
+        package_with_bad_checksums, report,
+        extra_algorithms=["sha256"],
+        digest_manifest_dir=tmpdir.join("missing").strpath
+    )
+    assert len(errors) == 5
+    assert errors.results[-1].message.startswith(
+        "Unable to write the sha256 manifest"
+    )
+
+
+def test_single_read_matches_separate_checks(
+        package_with_bad_checksums, marc_file, monkeypatch):
+    shutil.copy(marc_file.strpath, package_with_bad_checksums)
+    with open(os.path.join(package_with_bad_checksums, "checksum.md5"),
+              "a") as report_file:
+        report_file.write(
+            "\n{} *marc.xml".format(process.calculate_md5(marc_file.strpath))
+        )
+    report = os.path.join(package_with_bad_checksums, "checksum.md5")
+    checks = [
+        process.MarcContentCheck(package_with_bad_checksums),
+        process.MetadataContentCheck(package_with_bad_checksums),
+    ]
+    separate = list(
+        process.iter_failing_checksums(package_with_bad_checksums, report)
+    )
+    for check in checks:
+        for file_name in check.get_files():
+            separate += check.check_file(file_name)
+
+    opened = []
+    real_open = open
+
+    def counting_open(file, *args, **kwargs):
+        opened.append(os.path.basename(file))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    single_read = list(
+        process.iter_errors_single_read(
+            package_with_bad_checksums, report, checks, workers=2
+        )
+    )
+    assert [r.message for r in single_read] == [r.message for r in separate]
+    # meta.yml is missing, so it is only reported, not read
+    assert any("meta.yml" in r.message for r in single_read)
+    assert opened.count("marc.xml") == 1
+    assert opened.count("00000001.txt") == 1
+
+
 def test_parse_checksum():
     md5_hash, file_name = process.parse_checksum("61d005c4c34772f5d57566e6ca5f6a8e *00000045.tif")
     assert md5_hash == "61d005c4c34772f5d57566e6ca5f6a8e"
@@ -290,6 +396,35 @@ def test_validate_marc(marc_file):
     pass
 
 
+def test_validate_marc_with_xml_declaration(tmpdir):
+    marc_file = tmpdir.join("marc.xml")
+    marc_file.write('<?xml version="1.0" encoding="UTF-8"?>\n' + dummy_marc)
+    assert list(process.find_errors_marc(marc_file.strpath)) == []
+
+
+def test_parse_xml_resolves_internal_entities_as_before(tmpdir):
+    document = (
+        b'<?xml version="1.0"?>\n'
+        b'<!DOCTYPE doc [<!ENTITY title "Spam and eggs">]>\n'
+        b'<doc><title>&title;</title></doc>'
+    )
+    xml_file = tmpdir.join("00000001.xml")
+    xml_file.write_binary(document)
+    # The same as the default parser, used by etree.fromstring()
+    expected = etree.fromstring(document).findtext("title")
+    assert expected == "Spam and eggs"
+    assert process.parse_xml_file(xml_file.strpath).findtext("title") == \
+        expected
+    assert process.parse_xml_content(
+        document, xml_file.strpath
+    ).findtext("title") == expected
+
+
+def test_validate_marc_missing_file(tmpdir):
+    errors = list(process.find_errors_marc(tmpdir.join("marc.xml").strpath))
+    assert [error.message for error in errors] == ["File missing"]
+
+
 class Test_is_same_hash():
     def test_exact_same(self):
         assert process.is_same_hash("D4AB65AE47A6E57194D6847B22DCB14C", "D4AB65AE47A6E57194D6847B22DCB14C") is True
@@ -362,6 +497,65 @@ def test_utf_check_invalid(file_with_utf8_and_non_utf8):
     result = process.find_non_utf8_characters(file_with_utf8_and_non_utf8)
     assert len(result.results) == 1
 
+
+@pytest.mark.parametrize("block_size", [1, 2, 1024])
+def test_is_utf8_file_with_characters_split_between_blocks(
+        file_with_only_utf8, block_size):
+    assert process.is_utf8_file(file_with_only_utf8.strpath, block_size)
+
+
+@pytest.mark.parametrize("block_size", [1, 1024])
+def test_is_utf8_file_invalid(file_with_utf8_and_non_utf8, block_size):
+    assert not process.is_utf8_file(
+        file_with_utf8_and_non_utf8.strpath, block_size
+    )
+
+
+def test_non_utf8_characters_found_in_content(file_with_utf8_and_non_utf8):
+    from_file = process.find_non_utf8_characters(
+        file_with_utf8_and_non_utf8.strpath
+    )
+    from_content = process.find_non_utf8_characters(
+        file_with_utf8_and_non_utf8.strpath,
+        file_with_utf8_and_non_utf8.read_binary()
+    )
+    assert [r.message for r in from_content] == \
+        [r.message for r in from_file]
+    assert from_file.results[0].message.startswith("Line 4 ")
+
+
+def test_iter_errors_utf8_concurrent_matches_serial(tmpdir):
+    for i in range(10):
+        text_file = tmpdir.join(f"{str(i + 1).zfill(8)}.txt")
+        text_file.write_binary(b"page\n\xff\n" if i % 3 == 0 else b"page\n")
+    tmpdir.join("00000001.jp2").write_binary(b"\xff")
+    serial = list(process.iter_errors_utf8(tmpdir.strpath))
+    concurrent = list(process.iter_errors_utf8(tmpdir.strpath, workers=4))
+    assert len(serial) == 4
+    assert [(r.source, r.message) for r in concurrent] == \
+        [(r.source, r.message) for r in serial]
+
+
+def test_iter_errors_utf8_limits_files_queued(tmpdir, monkeypatch):
+    for i in range(20):
+        tmpdir.join(f"{str(i + 1).zfill(8)}.txt").write_binary(b"\xff\n")
+    checked = []
+    original = process.find_non_utf8_characters
+
+    def find_non_utf8_characters(file_path):
+        checked.append(file_path)
+        return original(file_path)
+
+    monkeypatch.setattr(process, "find_non_utf8_characters",
+                        find_non_utf8_characters)
+    errors = process.iter_errors_utf8(tmpdir.strpath, workers=2)
+    next(errors)
+    time.sleep(0.1)
+    assert len(checked) <= 4
+    assert len(list(errors)) == 19
+    assert len(checked) == 20
+
+
 def test_find_errors_ocr_valid_no_errors(monkeypatch):
     valid_xml = """<?xml version="1.0" encoding="UTF-8"?>
 <alto xmlns="http://www.loc.gov/standards/alto/ns-v2#">
@@ -419,3 +613,11 @@ def test_find_errors_ocr_invalid_errors(monkeypatch):
     assert len(summary.results) == 1
     assert "does not validate" in summary.results[0].message
 
+
+def test_run_validation_is_lazy():
+    def iter_results():
+        yield "first"
+        raise AssertionError("Only the first result should be requested")
+
+    validator = Mock(iter_results=iter_results)
+    assert next(process.run_validation(validator)) == "first"
@@ -1,4 +1,6 @@
+import csv
 import io
+import json
 from unittest.mock import Mock
 
 from hathi_validate import report, result
@@ -28,4 +30,126 @@ class TestReporter:
         reporter_strategy = Mock(spec=report.AbsReporter)
         reporter = report.Reporter(reporter_strategy=reporter_strategy)
         reporter.report("spam")
-        reporter_strategy.report.assert_called_once_with("spam")
\ No newline at end of file
+        reporter_strategy.report.assert_called_once_with("spam")
+
+
+def create_result(source, message):
+    new_result = result.Result("error")
+    new_result.source = source
+    new_result.message = message
+    return new_result
+
+
+def test_report_format_with_groups():
+    results = [
+        create_result("eggs", "Missing 00000002.txt"),
+        create_result("bacon", "spam " * 5),
+        create_result("eggs", "Extra subdirectory sub"),
+    ]
+    assert report.get_report_as_str(results, width=20) == \
+        "====================\n" \
+        "Validation Results\n" \
+        "====================\n" \
+        "bacon\n" \
+        "\n" \
+        "* spam spam spam\n" \
+        "  spam spam\n" \
+        "\n" \
+        "--------------------\n" \
+        "eggs\n" \
+        "\n" \
+        "* Missing\n" \
+        "  00000002.txt\n" \
+        "* Extra subdirectory\n" \
+        "  sub\n" \
+        "===================="
+
+
+def test_report_format_without_results():
+    assert report.get_report_as_str([], width=10) == \
+        "==========\n" \
+        "Validation Results\n" \
+        "==========\n" \
+        "No validation errors detected.\n" \
+        "=========="
+
+
+def test_report_format_with_notes():
+    builder = report.ReportStringBuilder(
+        [create_result("eggs", "Missing file")],
+        notes=["This report is partial."]
+    )
+    assert builder.build_string(width=20) == \
+        "====================\n" \
+        "Validation Results\n" \
+        "====================\n" \
+        "* This report is\n" \
+        "  partial.\n" \
+        "\n" \
+        "--------------------\n" \
+        "eggs\n" \
+        "\n" \
+        "* Missing file\n" \
+        "===================="
+
+
+class TestStreaming:
+    def test_console_stream_matches_string_report(self):
+        builder = report.ReportStringBuilder(
+            [create_result("eggs", "Missing 00000002.txt")]
+        )
+        from_string = io.StringIO()
+        report.ConsoleReporter(from_string).report(builder.build_string())
+
+        streamed = io.StringIO()
+        report.ConsoleReporter(streamed).report_stream(builder.write)
+        assert streamed.getvalue() == from_string.getvalue()
+
+    def test_file_stream_matches_string_report(self, tmpdir):
+        builder = report.ReportStringBuilder(
+            [create_result("eggs", "Missing 00000002.txt")]
+        )
+        from_string = tmpdir / "from_string.txt"
+        report.FileOutputReporter(from_string.strpath).report(
+            builder.build_string()
+        )
+        streamed = tmpdir / "streamed.txt"
+        report.FileOutputReporter(streamed.strpath).report_stream(
+            builder.write
+        )
+        assert streamed.read_binary() == from_string.read_binary()
+
+    def test_default_stream_renders_string(self):
+        reporter_strategy = Mock(spec=report.AbsReporter)
+        report.AbsReporter.report_stream(
+            reporter_strategy, lambda sink: sink.write("spam")
+        )
+        reporter_strategy.report.assert_called_once_with("spam")
+
+
+def test_json_lines_reporter_writes_a_line_per_result():
+    stream = io.StringIO()
+    reporter = report.JsonLinesReporter(stream)
+    reporter.start()
+    reporter.report_package("spam", [create_result("spam", "Missing")])
+    reporter.report_package("eggs", [])
+    reporter.finish()
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"package": "spam", "source": "spam", "type": "error",
+         "message": "Missing"}
+    ]
+
+
+def test_csv_reporter_quotes_messages():
+    stream = io.StringIO(newline="")
+    reporter = report.CsvReporter(stream)
+    reporter.start()
+    reporter.report_package(
+        "spam", [create_result("spam/marc.xml", 'Syntax error: "a, b"')]
+    )
+    reporter.finish()
+    stream.seek(0)
+    assert list(csv.DictReader(stream)) == [
+        {"package": "spam", "source": "spam/marc.xml", "type": "error",
+         "message": 'Syntax error: "a, b"'}
+    ]
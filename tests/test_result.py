@@ -1,3 +1,5 @@
+import pickle
+
 from hathi_validate import result
 import pytest
 
@@ -49,4 +51,92 @@ class TestResult:
     def test_str_with_source(self):
         my_result = result.Result("dummy")
         my_result.source = "spam"
-        assert str(my_result) =='Result[dummy]spam: ""'
\ No newline at end of file
+        assert str(my_result) =='Result[dummy]spam: ""'
+
+
+def test_result_dict_round_trip():
+    original = result.create_error("spam_source", "Not valid")
+    restored = result.Result.from_dict(original.to_dict())
+    assert restored.result_type == original.result_type
+    assert restored.source == original.source
+    assert restored.message == original.message
+
+
+def test_result_is_compact():
+    error = result.create_error("spam_source", "Not valid")
+    assert not hasattr(error, "__dict__")
+    assert error.type is result.ResultType.ERROR
+    assert error.result_type == "error"
+
+
+def test_result_source_is_interned():
+    source = "".join(["spam", "_source"])
+    first = result.create_error(source, "Not valid")
+    second = result.create_error("spam_source", "Not valid")
+    assert first.source is second.source
+
+
+def test_result_pickle_round_trip():
+    original = result.create_error("spam_source", "Not valid")
+    restored = pickle.loads(pickle.dumps(original))
+    assert str(restored) == str(original)
+    assert restored.source is original.source
+
+
+def test_summary_contains_added_results():
+    summary_builder = result.SummaryDirector(source="eggs_source")
+    summary_builder.add_error("Some Error")
+    summary = summary_builder.construct()
+    first = summary.results[0]
+    assert first in summary
+    second = result.create_error("eggs_source", "Some Error")
+    assert second not in summary
+    summary += second
+    assert second in summary
+
+
+def test_summary_contains_follows_replaced_and_removed_results():
+    summary = result.ResultSummary()
+    first = result.create_error("eggs_source", "First")
+    second = result.create_error("eggs_source", "Second")
+    summary += first
+    summary += second
+    assert first in summary
+
+    replacement = result.create_error("eggs_source", "Replacement")
+    summary.results[0] = replacement
+    assert replacement in summary
+    assert first not in summary
+
+    summary.results.remove(second)
+    assert second not in summary
+    del summary.results[0]
+    assert replacement not in summary
+
+    summary.results.extend([first, first])
+    summary.results.pop()
+    assert first in summary
+    summary.results[:] = [second]
+    assert first not in summary
+    assert second in summary
+
+    summary.results = [replacement]
+    assert replacement in summary
+    assert second not in summary
+
+
+def test_summary_contains_removed_result_with_reused_id():
+    summary = result.ResultSummary()
+    summary += result.create_error("eggs_source", "Removed")
+    summary.results.clear()
+    # The id of the removed result is free to be given to a new object
+    for _ in range(100):
+        assert result.create_error("eggs_source", "New") not in summary
+
+
+def test_summary_pickle_keeps_contains():
+    summary = result.ResultSummary()
+    summary += result.create_error("eggs_source", "Some Error")
+    restored = pickle.loads(pickle.dumps(summary))
+    assert restored.results[0] in restored
+    assert len(restored) == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from hathi_validate import scheduling
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("00000002", True),
+    ("/batch/00000002/", True),
+    ("/other/00000002", False),
+    ("0000000", False),
+])
+def test_is_named(name, expected):
+    assert scheduling.is_named("/batch/00000002", [name]) is expected
+
+
+def test_prioritize_keeps_order_of_names_then_packages():
+    packages = [f"/batch/{x:08d}" for x in range(5)]
+    assert scheduling.prioritize(packages, ["00000003", "00000001"]) == [
+        "/batch/00000003", "/batch/00000001",
+        "/batch/00000000", "/batch/00000002", "/batch/00000004",
+    ]
+
+
+def test_estimate_cost_counts_bytes_and_xml_files(tmpdir):
+    package_dir = tmpdir / "00000001"
+    package_dir.ensure_dir()
+    (package_dir / "00000001.jp2").write("x" * 100)
+    (package_dir / "00000001.xml").write("x" * 10)
+    (package_dir / "sub").ensure_dir()
+    assert scheduling.estimate_cost(package_dir.strpath) == \
+        110 + scheduling.XML_FILE_COST
+
+
+def test_missing_package_costs_nothing(tmpdir):
+    assert scheduling.estimate_cost((tmpdir / "missing").strpath) == 0
+
+
+def test_order_largest_first():
+    packages = ["a", "b", "c", "d"]
+    costs = {"a": 10, "b": 30, "c": 10, "d": 20}
+    assert scheduling.order_largest_first(packages, costs) == \
+        ["b", "d", "a", "c"]
+    assert scheduling.order_largest_first(packages, costs, first=["c"]) == \
+        ["c", "b", "d", "a"]
+
+
+def test_estimate_costs(tmpdir):
+    packages = []
+    for size in [10, 30, 20]:
+        package_dir = tmpdir / f"{size:08d}"
+        package_dir.ensure_dir()
+        (package_dir / "00000001.jp2").write("x" * size)
+        packages.append(package_dir.strpath)
+    costs = scheduling.estimate_costs(packages, threads=2)
+    assert [costs[pkg] for pkg in packages] == [10, 30, 20]
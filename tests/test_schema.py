@@ -0,0 +1,72 @@
+import os
+import threading
+
+from lxml import etree
+import pytest
+
+from hathi_validate import schema
+
+
+@pytest.mark.parametrize("name", [schema.MARC_SCHEMA, schema.ALTO_SCHEMA])
+def test_get_schema_compiles(name):
+    assert isinstance(schema.get_schema(name), etree.XMLSchema)
+
+
+def test_schema_reused_within_thread():
+    registry = schema.SchemaRegistry()
+    assert registry.get_schema(schema.MARC_SCHEMA) is \
+        registry.get_schema(schema.MARC_SCHEMA)
+
+
+def test_schema_not_shared_between_threads():
+    registry = schema.SchemaRegistry()
+    main_thread_schema = registry.get_schema(schema.MARC_SCHEMA)
+    other_thread_schemas = []
+    thread = threading.Thread(
+        target=lambda: other_thread_schemas.append(
+            registry.get_schema(schema.MARC_SCHEMA)
+        )
+    )
+    thread.start()
+    thread.join()
+    assert other_thread_schemas[0] is not main_thread_schema
+
+
+def test_resolver_serves_bundled_xlink():
+    data = schema.BundledSchemaResolver.read_bundled_xsd("xlink.xsd")
+    assert data is not None and b"schema" in data
+
+
+def test_resolver_ignores_unknown_files():
+    assert schema.BundledSchemaResolver.read_bundled_xsd("spam.xsd") is None
+
+
+def test_compile_alto_does_not_set_xml_catalog(monkeypatch):
+    monkeypatch.delenv("XML_CATALOG_FILES", raising=False)
+    schema.SchemaRegistry.compile_schema(schema.ALTO_SCHEMA)
+    assert "XML_CATALOG_FILES" not in os.environ
+
+
+def test_compile_schemas_in_many_threads():
+    names = [schema.ALTO_SCHEMA, schema.MARC_SCHEMA] * 8
+    start = threading.Barrier(len(names))
+    compiled = []
+    errors = []
+
+    def compile_schema(name):
+        start.wait()
+        try:
+            compiled.append(schema.SchemaRegistry.compile_schema(name))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [
+        threading.Thread(target=compile_schema, args=(name,))
+        for name in names
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(compiled) == len(names)
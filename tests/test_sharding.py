@@ -0,0 +1,74 @@
+import pytest
+
+from hathi_validate import manifest, result, sharding
+
+
+def test_every_package_is_in_exactly_one_shard():
+    packages = [f"/batch/{x:08d}" for x in range(100)]
+    shards = [sharding.Shard(index, 4) for index in range(1, 5)]
+    counts = [
+        len([pkg for pkg in packages if sharding.is_in_shard(pkg, shard)])
+        for shard in shards
+    ]
+    assert sum(counts) == 100
+    assert all(count > 0 for count in counts)
+
+
+def test_shard_only_depends_on_package_name():
+    assert sharding.get_shard_index("/mnt/a/batch/00000001", 7) == \
+        sharding.get_shard_index("/other/batch/00000001/", 7)
+
+
+def create_partial(shard, packages, settings=None):
+    partial = sharding.PartialResults(shard, settings or {"check_ocr": False})
+    for pkg in packages:
+        package_manifest = manifest.PackageManifestBuilder(pkg)
+        package_manifest.add_file("00000001.jp2")
+        partial.add_package(
+            pkg, package_manifest, [result.create_error(pkg, "Missing")]
+        )
+    return partial
+
+
+def test_partial_results_round_trip(tmpdir):
+    partial_file = tmpdir.join("partial.json").strpath
+    partial = create_partial(sharding.Shard(2, 3), ["/batch/00000001"])
+    partial.notes = ["Stopped checking /batch/00000001 after 1 errors."]
+    partial.save(partial_file)
+
+    loaded = sharding.PartialResults.load(partial_file)
+    assert loaded.shard == sharding.Shard(2, 3)
+    assert loaded.notes == partial.notes
+    assert loaded.settings == partial.settings
+    package_result = loaded.packages[0]
+    assert package_result.manifest.files == {".jp2": {"00000001.jp2"}}
+    assert [str(r) for r in package_result.results] == \
+        [str(r) for r in partial.packages[0].results]
+
+
+def test_merge_orders_packages_and_notes_missing_shards():
+    merged = sharding.merge([
+        create_partial(sharding.Shard(3, 3), ["/batch/00000002"]),
+        create_partial(sharding.Shard(1, 3), ["/batch/00000001"]),
+    ])
+    assert [item.source for item in merged.manifest] == \
+        ["/batch/00000001", "/batch/00000002"]
+    assert len(merged.results) == 2
+    assert merged.notes == [
+        "This report is partial. No results were given for shard 2/3."
+    ]
+
+
+@pytest.mark.parametrize("partials", [
+    [create_partial(sharding.Shard(1, 2), []),
+     create_partial(sharding.Shard(2, 2), [], {"check_ocr": True})],
+    [create_partial(sharding.Shard(1, 2), []),
+     create_partial(sharding.Shard(1, 3), [])],
+    [create_partial(sharding.Shard(1, 2), []),
+     create_partial(sharding.Shard(1, 2), [])],
+    [create_partial(sharding.Shard(1, 2), ["/batch/00000001"]),
+     create_partial(sharding.Shard(2, 2), ["/batch/00000001"])],
+])
+def test_merge_rejects_mismatched_partials(partials):
+    with pytest.raises(ValueError):
+        sharding.merge(partials)
@@ -0,0 +1,31 @@
+import io
+import json
+
+from hathi_validate import timing
+
+
+def test_breakdown_sums_per_check_slowest_first():
+    summary = timing.TimingSummary()
+    summary.add_timings([
+        timing.CheckTiming("ValidateMarc", "pkg1", 1.0, 1, 10),
+        timing.CheckTiming("ValidateChecksums", "pkg1", 2.0, 3, 300),
+    ])
+    summary.add_timings([
+        timing.CheckTiming("ValidateMarc", "pkg2", 4.0, 1, 20),
+    ])
+    breakdown = summary.get_breakdown()
+    assert [check["check"] for check in breakdown] == \
+        ["ValidateMarc", "ValidateChecksums"]
+    assert breakdown[0]["seconds"] == 5.0
+    assert breakdown[0]["bytes"] == 30
+    assert breakdown[0]["slowest_package"] == "pkg2"
+
+
+def test_write_json():
+    summary = timing.TimingSummary()
+    summary.add_timings([timing.CheckTiming("ValidateMarc", "pkg1", 1.0, 1, 10)])
+    sink = io.StringIO()
+    summary.write_json(sink)
+    data = json.loads(sink.getvalue())
+    assert data["checks"][0]["check"] == "ValidateMarc"
+    assert data["packages"][0]["package"] == "pkg1"
@@ -0,0 +1,98 @@
+import os
+
+from hathi_validate import incremental, package, watch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def add_package(root, name, files=2):
+    package_dir = root / name
+    package_dir.ensure_dir()
+    for x in range(files):
+        (package_dir / f"{x:08d}.jp2").ensure()
+    return package_dir.strpath
+
+
+def validate(watcher, pkg):
+    watcher.set_validated(
+        pkg,
+        incremental.get_fingerprint(package.PackageInventory.scan(pkg))
+    )
+
+
+def test_package_is_ready_once_quiet(tmpdir):
+    clock = FakeClock()
+    watcher = watch.PackageWatcher(tmpdir.strpath, quiet_period=30,
+                                   clock=clock)
+    pkg = add_package(tmpdir, "00000001")
+    assert watcher.poll() == []
+
+    clock.now = 20
+    (tmpdir / "00000001" / "00000002.jp2").write("still copying")
+    assert watcher.poll() == []
+
+    clock.now = 40
+    assert watcher.poll() == []
+
+    clock.now = 50
+    assert watcher.poll() == [pkg]
+
+
+def test_validated_package_is_not_scanned_again(tmpdir, monkeypatch):
+    clock = FakeClock()
+    watcher = watch.PackageWatcher(tmpdir.strpath, quiet_period=0,
+                                   clock=clock)
+    pkg = add_package(tmpdir, "00000001")
+    old_time = 1_000_000_000
+    os.utime(pkg, ns=(old_time, old_time))
+    assert watcher.poll() == [pkg]
+    validate(watcher, pkg)
+
+    scanned = []
+    scan = package.PackageInventory.scan
+
+    def record_scan(path):
+        scanned.append(path)
+        return scan(path)
+
+    monkeypatch.setattr(package.PackageInventory, "scan", record_scan)
+    assert watcher.poll() == []
+    assert scanned == []
+
+
+def test_changed_package_is_ready_again(tmpdir):
+    clock = FakeClock()
+    watcher = watch.PackageWatcher(tmpdir.strpath, quiet_period=0,
+                                   clock=clock)
+    pkg = add_package(tmpdir, "00000001")
+    assert watcher.poll() == [pkg]
+    validate(watcher, pkg)
+    assert watcher.poll() == []
+
+    (tmpdir / "00000001" / "00000003.jp2").ensure()
+    assert watcher.poll() == [pkg]
+
+
+def test_removed_package_is_forgotten(tmpdir):
+    watcher = watch.PackageWatcher(tmpdir.strpath, quiet_period=0)
+    add_package(tmpdir, "00000001")
+    watcher.poll()
+    (tmpdir / "00000001").remove()
+    assert watcher.poll() == []
+    assert watcher.packages == []
+
+
+def test_skip_existing(tmpdir):
+    watcher = watch.PackageWatcher(tmpdir.strpath, quiet_period=0)
+    add_package(tmpdir, "00000001")
+    watcher.skip_existing()
+    assert watcher.poll() == []
+
+    new_package = add_package(tmpdir, "00000002")
+    assert watcher.poll() == [new_package]